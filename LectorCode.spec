@@ -5,7 +5,7 @@ a = Analysis(
     ['c:\\Users\\juanc\\Documents\\NUVU\\LectorCode\\main.py'],
     pathex=[],
     binaries=[('c:\\Users\\juanc\\Documents\\NUVU\\LectorCode\\temp_dlls\\libiconv.dll', '.'), ('c:\\Users\\juanc\\Documents\\NUVU\\LectorCode\\temp_dlls\\libzbar-64.dll', '.')],
-    datas=[('c:\\Users\\juanc\\Documents\\NUVU\\LectorCode\\src\\ui\\ui_files', 'src/ui/ui_files')],
+    datas=[('c:\\Users\\juanc\\Documents\\NUVU\\LectorCode\\src\\ui\\ui_files', 'src/ui/ui_files'), ('c:\\Users\\juanc\\Documents\\NUVU\\LectorCode\\src\\ui\\assets\\iconos.rcc', 'src/ui/assets')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,232 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmarks de extracción y renombrado sobre escaneos sintéticos.
+
+Mide, sobre el conjunto de synthetic_scans.py:
+- extract_barcode y extract_text_ocr por imagen (incluida la decodificación),
+- process_single_file_auto por imagen (extracción + renombrado de una copia),
+- process_batch_auto sobre todas las imágenes.
+
+Cada medida por imagen es la mediana de --repeat repeticiones y registra
+también si se obtuvo el número de guía esperado. Los resultados se guardan
+en JSON y pueden compararse con una ejecución anterior:
+
+    python benchmarks/run_benchmarks.py --out actual.json
+    python benchmarks/run_benchmarks.py --out nuevo.json --baseline actual.json
+
+Con --baseline, el código de salida es 1 si alguna medida empeora más que
+--threshold o si alguna imagen deja de reconocerse. La caché de resultados
+se desactiva para que siempre se mida el pipeline completo.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Medir siempre el pipeline completo, nunca la caché de resultados
+os.environ["LECTORCODE_CACHE"] = "0"
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import synthetic_scans  # noqa: E402
+from src.core import image_processor, ocr_engine, processing_handler  # noqa: E402
+
+# Empeoramiento relativo tolerado antes de marcar una regresión
+UMBRAL_POR_DEFECTO = 0.10
+# Diferencias absolutas menores que esta no cuentan como regresión (s)
+RUIDO_ABSOLUTO = 0.005
+
+
+def _median_time(func: Callable[[], object], repeat: int,
+                 setup: Optional[Callable[[], None]] = None) -> Dict:
+    """Ejecuta `func` `repeat` veces y devuelve la mediana, el mínimo y el último resultado."""
+    tiempos = []
+    resultado = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        inicio = time.perf_counter()
+        resultado = func()
+        tiempos.append(time.perf_counter() - inicio)
+    return {"median_s": statistics.median(tiempos), "min_s": min(tiempos), "result": resultado}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+def run(data_dir: str, repeat: int, workers: Optional[int], quick: bool) -> Dict:
+    """
+    Genera el conjunto de imágenes y ejecuta todas las medidas.
+
+    Returns:
+        Diccionario {"meta": {...}, "results": {clave: medida}}.
+    """
+    entradas = synthetic_scans.generate_dataset(data_dir, quick=quick)
+    resultados: Dict[str, Dict] = {}
+    medidas = []
+    if image_processor.pyzbar:
+        medidas.append(("extract_barcode", image_processor.extract_barcode))
+    else:
+        print("Aviso: pyzbar/ZBar no disponible; se omite extract_barcode.", file=sys.stderr)
+    if ocr_engine.is_available():
+        medidas.append(("extract_text_ocr", image_processor.extract_text_ocr))
+    else:
+        print("Aviso: ningún motor de OCR disponible; se omite extract_text_ocr.", file=sys.stderr)
+
+    for entrada in entradas:
+        ruta = os.path.join(data_dir, entrada["file"])
+        for nombre, funcion in medidas:
+            medida = _median_time(lambda: funcion(ruta), repeat)
+            medida["correct"] = medida.pop("result") == entrada["guide"]
+            resultados[f"{nombre}/{entrada['file']}"] = medida
+
+    # process_single_file_auto renombra: se trabaja sobre una copia nueva cada vez
+    with tempfile.TemporaryDirectory(prefix="lectorcode-bench-") as trabajo:
+        for entrada in entradas:
+            origen = os.path.join(data_dir, entrada["file"])
+            copia = os.path.join(trabajo, entrada["file"])
+
+            def preparar() -> None:
+                for nombre in os.listdir(trabajo):
+                    os.remove(os.path.join(trabajo, nombre))
+                shutil.copyfile(origen, copia)
+
+            medida = _median_time(lambda: processing_handler.process_single_file_auto(copia),
+                                  repeat, setup=preparar)
+            resultado = medida.pop("result")
+            medida["correct"] = resultado.get("guide_number") == entrada["guide"]
+            resultados[f"process_single_file_auto/{entrada['file']}"] = medida
+
+    # Lote completo con el pool de procesos
+    with tempfile.TemporaryDirectory(prefix="lectorcode-bench-") as trabajo:
+        rutas = []
+        for entrada in entradas:
+            rutas.append(os.path.join(trabajo, entrada["file"]))
+            shutil.copyfile(os.path.join(data_dir, entrada["file"]), rutas[-1])
+        inicio = time.perf_counter()
+        lote = list(processing_handler.process_batch_auto(rutas, max_workers=workers))
+        transcurrido = time.perf_counter() - inicio
+        correctos = sum(1 for index, r in lote if r.get("guide_number") == entradas[index]["guide"])
+        resultados["process_batch_auto/todas"] = {
+            "median_s": transcurrido, "min_s": transcurrido,
+            "files": len(rutas), "files_per_s": len(rutas) / transcurrido if transcurrido else None,
+            "correct": correctos == len(rutas), "correct_count": correctos,
+        }
+
+    meta = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pipeline": image_processor.pipeline_signature(),
+        "repeat": repeat,
+        "workers": workers,
+        "quick": quick,
+    }
+    return {"meta": meta, "results": resultados}
+
+
+def compare(actual: Dict, base: Dict, threshold: float) -> List[str]:
+    """
+    Imprime la comparación con la línea base y devuelve las regresiones.
+
+    Returns:
+        Descripción de cada medida más lenta que lo tolerado o que dejó de
+        reconocer su imagen.
+    """
+    regresiones = []
+    print(f"\n{'medida':<60} {'base':>9} {'actual':>9} {'cambio':>8}")
+    for clave, medida in sorted(actual["results"].items()):
+        anterior = base["results"].get(clave)
+        if not anterior:
+            print(f"{clave:<60} {'-':>9} {medida['median_s']:>9.3f} {'nueva':>8}")
+            continue
+        t0, t1 = anterior["median_s"], medida["median_s"]
+        cambio = (t1 - t0) / t0 if t0 else 0.0
+        marca = ""
+        if cambio > threshold and t1 - t0 > RUIDO_ABSOLUTO:
+            marca = "  <-- más lento"
+            regresiones.append(f"{clave}: {t0:.3f}s -> {t1:.3f}s ({cambio:+.0%})")
+        if anterior.get("correct") and not medida.get("correct"):
+            marca += "  <-- ya no reconoce la guía"
+            regresiones.append(f"{clave}: dejó de reconocer la guía")
+        print(f"{clave:<60} {t0:>9.3f} {t1:>9.3f} {cambio:>+8.0%}{marca}")
+    return regresiones
+
+
+def _print_summary(informe: Dict) -> None:
+    totales: Dict[str, List[float]] = {}
+    aciertos: Dict[str, List[bool]] = {}
+    for clave, medida in informe["results"].items():
+        grupo = clave.split("/", 1)[0]
+        totales.setdefault(grupo, []).append(medida["median_s"])
+        aciertos.setdefault(grupo, []).append(bool(medida.get("correct")))
+    for grupo in totales:
+        print(f"{grupo:<28} total {sum(totales[grupo]):8.3f}s   "
+              f"aciertos {sum(aciertos[grupo])}/{len(aciertos[grupo])}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de LectorCode sobre escaneos sintéticos.")
+    parser.add_argument("--out", default=None,
+                        help="Archivo JSON de resultados (por defecto, benchmarks/results/<fecha>.json).")
+    parser.add_argument("--baseline", default=None, help="Resultados anteriores con los que comparar.")
+    parser.add_argument("--threshold", type=float, default=UMBRAL_POR_DEFECTO,
+                        help="Empeoramiento relativo tolerado (por defecto 0.10 = 10%%).")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medida (mediana).")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos del lote (por defecto, núcleos).")
+    parser.add_argument("--data-dir", default=None,
+                        help="Carpeta para las imágenes generadas (por defecto, una temporal).")
+    parser.add_argument("--quick", action="store_true", help="Conjunto reducido para una comprobación rápida.")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat debe ser mayor o igual que 1")
+    logging.basicConfig(level=logging.WARNING, format='%(name)s - %(levelname)s - %(message)s')
+
+    if args.data_dir:
+        informe = run(args.data_dir, args.repeat, args.workers, args.quick)
+    else:
+        with tempfile.TemporaryDirectory(prefix="lectorcode-scans-") as carpeta:
+            informe = run(carpeta, args.repeat, args.workers, args.quick)
+
+    salida = args.out or str(RAIZ / "benchmarks" / "results" / f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2)
+    _print_summary(informe)
+    print(f"\nResultados guardados en '{salida}'.")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    if base.get("meta", {}).get("pipeline") != informe["meta"]["pipeline"]:
+        print("Aviso: la línea base se midió con otra configuración del pipeline.")
+    regresiones = compare(informe, base, args.threshold)
+    if regresiones:
+        print(f"\n{len(regresiones)} regresiones:")
+        for linea in regresiones:
+            print(f"  - {linea}")
+        return 1
+    print("\nSin regresiones respecto a la línea base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
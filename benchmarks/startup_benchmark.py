@@ -0,0 +1,234 @@
+# benchmarks/startup_benchmark.py
+"""
+Benchmark del arranque de la interfaz, en frío y en caliente.
+
+Lanza la aplicación varias veces con LECTORCODE_STARTUP_PROFILE (informe
+JSON de src/utils/startup_profiler.py) y LECTORCODE_STARTUP_EXIT (se cierra
+en cuanto la ventana está pintada), y mide:
+- el tiempo de pared del proceso completo (intérprete, imports, ventana y salida),
+- el arranque según el perfilador y la duración de cada fase,
+- las importaciones más lentas (tiempo propio).
+
+Modos:
+- caliente: ejecuciones repetidas, descartando la primera.
+- frío: en la versión de código fuente, cada ejecución usa una caché de
+  bytecode vacía (PYTHONPYCACHEPREFIX), como la primera ejecución tras
+  instalar o actualizar. Con --drop-caches (Linux, root) además se vacía la
+  caché de páginas del sistema antes de cada ejecución; es la única forma
+  de medir en frío el ejecutable empaquetado.
+
+    python benchmarks/startup_benchmark.py --out arranque.json
+    python benchmarks/startup_benchmark.py --frozen dist/LectorCode/LectorCode --drop-caches
+    python benchmarks/startup_benchmark.py --baseline arranque.json
+
+Con --baseline, el código de salida es 1 si el tiempo de pared o el
+arranque perfilado de algún modo empeora más que --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Empeoramiento relativo tolerado antes de marcar una regresión
+UMBRAL_POR_DEFECTO = 0.10
+# Diferencias absolutas menores que esta no cuentan como regresión (s)
+RUIDO_ABSOLUTO = 0.005
+# Límite por ejecución: una ventana que no llega a pintarse no bloquea el benchmark
+TIMEOUT_S = 120
+# Importaciones que se guardan en el informe
+MAX_IMPORTACIONES = 25
+
+
+def _drop_page_cache() -> bool:
+    """Vacía la caché de páginas de Linux (requiere root). Devuelve False si no es posible."""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def _launch(comando: List[str], entorno: Dict[str, str]) -> Dict:
+    """
+    Ejecuta la aplicación una vez y devuelve el tiempo de pared y el perfil.
+
+    Raises:
+        RuntimeError: Si el proceso falla o no escribe el informe.
+    """
+    with tempfile.TemporaryDirectory(prefix="lectorcode-arranque-") as temporal:
+        informe_path = os.path.join(temporal, "perfil.json")
+        entorno = dict(entorno, LECTORCODE_STARTUP_PROFILE=informe_path, LECTORCODE_STARTUP_EXIT="1")
+        inicio = time.perf_counter()
+        proceso = subprocess.run(comando, env=entorno, cwd=RAIZ, capture_output=True,
+                                 text=True, timeout=TIMEOUT_S)
+        pared = time.perf_counter() - inicio
+        if proceso.returncode != 0 or not os.path.exists(informe_path):
+            raise RuntimeError(f"La aplicación terminó con código {proceso.returncode} "
+                               f"sin informe de arranque:\n{proceso.stderr[-2000:]}")
+        with open(informe_path, encoding="utf-8") as f:
+            perfil = json.load(f)
+    return {"wall_s": pared, "profile": perfil}
+
+
+def _summarize(ejecuciones: List[Dict]) -> Dict:
+    """Medianas de tiempo de pared, arranque, fases e importaciones de un modo."""
+    paredes = [e["wall_s"] for e in ejecuciones]
+    totales = [e["profile"]["total_s"] for e in ejecuciones]
+    fases: Dict[str, List[float]] = {}
+    importaciones: Dict[str, List[float]] = {}
+    for ejecucion in ejecuciones:
+        for fase in ejecucion["profile"]["phases"]:
+            fases.setdefault(fase["name"], []).append(fase["delta_s"])
+        for modulo in ejecucion["profile"]["imports"]:
+            importaciones.setdefault(modulo["module"], []).append(modulo["self_s"])
+    mas_lentas = sorted(((statistics.median(t), m) for m, t in importaciones.items()), reverse=True)
+    return {
+        "runs": len(ejecuciones),
+        "wall_median_s": statistics.median(paredes),
+        "wall_min_s": min(paredes),
+        "startup_median_s": statistics.median(totales),
+        "startup_min_s": min(totales),
+        "phases_median_s": {nombre: statistics.median(t) for nombre, t in fases.items()},
+        "slowest_imports_self_s": {m: t for t, m in mas_lentas[:MAX_IMPORTACIONES]},
+        "modules_imported": statistics.median(len(e["profile"]["imports"]) for e in ejecuciones),
+    }
+
+
+def run(frozen: Optional[str], runs: int, cold_runs: int, drop_caches: bool) -> Dict:
+    """
+    Ejecuta las medidas en caliente y en frío.
+
+    Returns:
+        Diccionario {"meta": {...}, "results": {modo: resumen}}.
+    """
+    comando = [os.path.abspath(frozen)] if frozen else [sys.executable, str(RAIZ / "main.py")]
+    entorno = dict(os.environ)
+    if sys.platform.startswith("linux") and not (entorno.get("DISPLAY") or entorno.get("WAYLAND_DISPLAY")):
+        entorno.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    resultados: Dict[str, Dict] = {}
+    if cold_runs:
+        if drop_caches and not _drop_page_cache():
+            print("Aviso: no se pudo vaciar la caché de páginas (requiere root en Linux).", file=sys.stderr)
+            drop_caches = False
+        if frozen and not drop_caches:
+            print("Aviso: el arranque en frío del ejecutable requiere --drop-caches; se omite.",
+                  file=sys.stderr)
+        else:
+            frias = []
+            for _ in range(cold_runs):
+                with tempfile.TemporaryDirectory(prefix="lectorcode-pycache-") as pycache:
+                    entorno_frio = dict(entorno)
+                    if not frozen:
+                        entorno_frio["PYTHONPYCACHEPREFIX"] = pycache
+                    if drop_caches:
+                        _drop_page_cache()
+                    frias.append(_launch(comando, entorno_frio))
+            resultados["cold"] = _summarize(frias)
+
+    # La primera ejecución en caliente solo calienta cachés y no cuenta
+    _launch(comando, entorno)
+    resultados["warm"] = _summarize([_launch(comando, entorno) for _ in range(runs)])
+
+    meta = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "build": "frozen" if frozen else "source",
+        "command": comando,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qt_platform": entorno.get("QT_QPA_PLATFORM"),
+        "drop_caches": drop_caches,
+    }
+    return {"meta": meta, "results": resultados}
+
+
+def compare(actual: Dict, base: Dict, threshold: float) -> List[str]:
+    """Imprime la comparación con la línea base y devuelve las regresiones."""
+    regresiones = []
+    print(f"\n{'medida':<32} {'base':>9} {'actual':>9} {'cambio':>8}")
+    for modo, resumen in sorted(actual["results"].items()):
+        anterior = base["results"].get(modo)
+        if not anterior:
+            continue
+        for clave in ("wall_median_s", "startup_median_s"):
+            t0, t1 = anterior[clave], resumen[clave]
+            cambio = (t1 - t0) / t0 if t0 else 0.0
+            marca = ""
+            if cambio > threshold and t1 - t0 > RUIDO_ABSOLUTO:
+                marca = "  <-- más lento"
+                regresiones.append(f"{modo}/{clave}: {t0:.3f}s -> {t1:.3f}s ({cambio:+.0%})")
+            print(f"{modo + '/' + clave:<32} {t0:>9.3f} {t1:>9.3f} {cambio:>+8.0%}{marca}")
+    return regresiones
+
+
+def _print_summary(informe: Dict) -> None:
+    for modo, resumen in informe["results"].items():
+        print(f"\n[{modo}] {resumen['runs']} ejecuciones: pared {resumen['wall_median_s'] * 1000:.1f} ms, "
+              f"arranque {resumen['startup_median_s'] * 1000:.1f} ms (medianas), "
+              f"{resumen['modules_imported']:.0f} módulos importados")
+        for nombre, segundos in resumen["phases_median_s"].items():
+            print(f"  {segundos * 1000:8.1f} ms  {nombre}")
+        print("  Importaciones más lentas (tiempo propio):")
+        for modulo, segundos in list(resumen["slowest_imports_self_s"].items())[:10]:
+            print(f"  {segundos * 1000:8.1f} ms  {modulo}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del arranque de LectorCode.")
+    parser.add_argument("--frozen", default=None, metavar="EJECUTABLE",
+                        help="Medir el ejecutable empaquetado en lugar de main.py.")
+    parser.add_argument("--runs", type=int, default=10, help="Ejecuciones en caliente (mediana).")
+    parser.add_argument("--cold-runs", type=int, default=3, help="Ejecuciones en frío (0 = ninguna).")
+    parser.add_argument("--drop-caches", action="store_true",
+                        help="Vaciar la caché de páginas antes de cada ejecución en frío (Linux, root).")
+    parser.add_argument("--out", default=None,
+                        help="Archivo JSON de resultados (por defecto, benchmarks/results/arranque-<fecha>.json).")
+    parser.add_argument("--baseline", default=None, help="Resultados anteriores con los que comparar.")
+    parser.add_argument("--threshold", type=float, default=UMBRAL_POR_DEFECTO,
+                        help="Empeoramiento relativo tolerado (por defecto 0.10 = 10%%).")
+    args = parser.parse_args(argv)
+    if args.runs < 1 or args.cold_runs < 0:
+        parser.error("--runs debe ser mayor o igual que 1 y --cold-runs no puede ser negativo")
+
+    try:
+        informe = run(args.frozen, args.runs, args.cold_runs, args.drop_caches)
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    salida = args.out or str(RAIZ / "benchmarks" / "results" / f"arranque-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2)
+    _print_summary(informe)
+    print(f"\nResultados guardados en '{salida}'.")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    if base.get("meta", {}).get("build") != informe["meta"]["build"]:
+        print("Aviso: la línea base se midió con otro tipo de build.")
+    regresiones = compare(informe, base, args.threshold)
+    if regresiones:
+        print(f"\n{len(regresiones)} regresiones:")
+        for linea in regresiones:
+            print(f"  - {linea}")
+        return 1
+    print("\nSin regresiones respecto a la línea base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
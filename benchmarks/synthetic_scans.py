@@ -0,0 +1,209 @@
+# benchmarks/synthetic_scans.py
+"""
+Generador determinista de escaneos sintéticos de guías.
+
+Dibuja con Pillow una guía de envío de 6 x 4 pulgadas con un código Code128
+del número de guía, el número impreso debajo y texto de relleno, a la
+resolución pedida. Las variantes añaden ruido (motas y grano), rotación y
+compresión JPEG, y también hay un TIFF de dos páginas con la guía en la
+segunda. Con la misma semilla se obtienen siempre los mismos píxeles, de
+modo que los tiempos de distintas ejecuciones son comparables.
+
+Uso directo (escribe las imágenes y un manifest.json):
+    python benchmarks/synthetic_scans.py CARPETA [--quick]
+"""
+import argparse
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+# Resoluciones de escaneo habituales
+DPIS = (200, 300, 600)
+# Variantes de cada resolución: (nombre, ruido, rotación en grados)
+VARIANTES = (("limpia", 0.0, 0.0), ("ruido", 0.04, 0.0), ("rotada", 0.0, 2.5))
+# Formatos de archivo de cada imagen
+FORMATOS = ("jpg", "tif")
+# Tamaño de la guía en pulgadas (ancho, alto)
+TAMANO_GUIA = (6.0, 4.0)
+# Ancho del módulo más estrecho del código de barras (0,33 mm) en pulgadas
+MODULO_PULGADAS = 0.013
+
+# Anchos de barra/espacio de los símbolos Code128 (valores 0 a 106)
+_CODE128 = (
+    "212222", "222122", "222221", "121223", "121322", "131222", "122213", "122312", "132212", "221213",
+    "221312", "231212", "112232", "122132", "122231", "113222", "123122", "123221", "223211", "221132",
+    "221231", "213212", "223112", "312131", "311222", "321122", "321221", "312212", "322112", "322211",
+    "212123", "212321", "232121", "111323", "131123", "131321", "112313", "132113", "132311", "211313",
+    "231113", "231311", "112133", "112331", "132131", "113123", "113321", "133121", "313121", "211331",
+    "231131", "213113", "213311", "213131", "311123", "311321", "331121", "312113", "312311", "332111",
+    "314111", "221411", "431111", "111224", "111422", "121124", "121421", "141122", "141221", "112214",
+    "112412", "122114", "122411", "142112", "142211", "241211", "221114", "413111", "241112", "134111",
+    "111242", "121142", "121241", "114212", "124112", "124211", "411212", "421112", "421211", "212141",
+    "214121", "412121", "111143", "111341", "131141", "114113", "114311", "411113", "411311", "113141",
+    "114131", "311141", "411131", "211412", "211214", "211232", "2331112",
+)
+_INICIO_B = 104
+_PARADA = 106
+
+
+def code128_modules(text: str) -> List[int]:
+    """
+    Codifica un texto en Code128 (juego B) como anchos de módulo alternos.
+
+    Returns:
+        Anchos, empezando por una barra, incluido el símbolo de parada.
+    """
+    valores = [_INICIO_B] + [ord(c) - 32 for c in text]
+    if any(not 0 <= v < 95 for v in valores[1:]):
+        raise ValueError(f"Carácter no codificable en Code128-B: '{text}'")
+    control = (valores[0] + sum(i * v for i, v in enumerate(valores[1:], start=1))) % 103
+    anchos: List[int] = []
+    for valor in valores + [control, _PARADA]:
+        anchos.extend(int(c) for c in _CODE128[valor])
+    return anchos
+
+
+def _font(size: int) -> ImageFont.ImageFont:
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+def guide_number(seed: int) -> str:
+    """Número de guía determinista de 13 dígitos con el prefijo 770."""
+    return "770" + f"{random.Random(seed).randrange(10 ** 10):010d}"
+
+
+def render_scan(guide: str, dpi: int, noise: float = 0.0, rotation: float = 0.0,
+                seed: int = 0) -> Image.Image:
+    """
+    Dibuja una guía escaneada en escala de grises.
+
+    Args:
+        guide: Número de guía del código de barras y del texto.
+        dpi: Resolución simulada del escáner.
+        noise: Fracción de píxeles con mota oscura (0 = sin ruido).
+        rotation: Inclinación de la hoja en grados.
+        seed: Semilla del texto de relleno y del ruido.
+
+    Returns:
+        Imagen en modo 'L'.
+    """
+    rng = random.Random(seed)
+    ancho, alto = int(TAMANO_GUIA[0] * dpi), int(TAMANO_GUIA[1] * dpi)
+    img = Image.new("L", (ancho, alto), 255)
+    draw = ImageDraw.Draw(img)
+    margen = int(0.25 * dpi)
+
+    # Texto de relleno: remitente, destinatario y condiciones
+    fuente = _font(int(0.11 * dpi))
+    y = margen
+    for etiqueta in ("REMITENTE", "DESTINATARIO", "CIUDAD", "OBSERVACIONES"):
+        relleno = " ".join(rng.choice(("CALLE", "CARRERA", "No", "BOGOTA", "MEDELLIN", "CALI",
+                                       "PAQUETE", "FRAGIL", str(rng.randrange(10, 999))))
+                           for _ in range(6))
+        draw.text((margen, y), f"{etiqueta}: {relleno}", fill=0, font=fuente)
+        y += int(0.2 * dpi)
+
+    # Código de barras centrado en la mitad inferior
+    modulo = max(1, round(MODULO_PULGADAS * dpi))
+    anchos = code128_modules(guide)
+    ancho_codigo = sum(anchos) * modulo
+    x = (ancho - ancho_codigo) // 2
+    y_codigo = int(alto * 0.5)
+    alto_codigo = int(0.6 * dpi)
+    for i, w in enumerate(anchos):
+        if i % 2 == 0:  # Las posiciones pares son barras
+            draw.rectangle((x, y_codigo, x + w * modulo - 1, y_codigo + alto_codigo), fill=0)
+        x += w * modulo
+
+    # Número impreso bajo el código
+    fuente_numero = _font(int(0.16 * dpi))
+    caja = draw.textbbox((0, 0), guide, font=fuente_numero)
+    draw.text(((ancho - (caja[2] - caja[0])) // 2, y_codigo + alto_codigo + int(0.08 * dpi)),
+              guide, fill=0, font=fuente_numero)
+
+    if noise > 0:
+        img = _add_noise(img, noise, rng)
+    if rotation:
+        img = img.rotate(rotation, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    return img
+
+
+def _add_noise(img: Image.Image, amount: float, rng: random.Random) -> Image.Image:
+    """Añade motas oscuras y grano de papel de forma reproducible."""
+    bruto = Image.frombytes("L", img.size, rng.randbytes(img.width * img.height))
+    umbral = int(255 * amount)
+    motas = bruto.point(lambda v: 0 if v < umbral else 255)
+    grano = bruto.point(lambda v: 255 - v // 8)
+    return ImageChops.darker(ImageChops.multiply(img, grano), motas)
+
+
+def _save(img: Image.Image, path: str, dpi: int) -> None:
+    if path.endswith(".jpg"):
+        img.save(path, quality=75, dpi=(dpi, dpi))
+    else:
+        img.save(path, compression="tiff_lzw", dpi=(dpi, dpi))
+
+
+def generate_dataset(folder: str, quick: bool = False, seed: int = 1) -> List[Dict]:
+    """
+    Escribe el conjunto de escaneos sintéticos y su manifest.json.
+
+    Args:
+        folder: Carpeta de destino (se crea si no existe).
+        quick: Solo la variante limpia a 300 dpi y el TIFF de dos páginas.
+        seed: Semilla base; cada imagen usa una derivada de ella.
+
+    Returns:
+        Lista de entradas {"file", "guide", "dpi", "variant", "format", "pages"}.
+    """
+    os.makedirs(folder, exist_ok=True)
+    dpis = (300,) if quick else DPIS
+    variantes = VARIANTES[:1] if quick else VARIANTES
+    entradas: List[Dict] = []
+    n = 0
+    for dpi in dpis:
+        for nombre_variante, ruido, rotacion in variantes:
+            n += 1
+            guia = guide_number(seed * 1000 + n)
+            img = render_scan(guia, dpi, ruido, rotacion, seed=seed * 1000 + n)
+            for formato in FORMATOS:
+                nombre = f"{dpi}dpi-{nombre_variante}.{formato}"
+                _save(img, os.path.join(folder, nombre), dpi)
+                entradas.append({"file": nombre, "guide": guia, "dpi": dpi,
+                                 "variant": nombre_variante, "format": formato, "pages": 1})
+
+    # TIFF de dos páginas: portada sin código y la guía en la página 2
+    n += 1
+    guia = guide_number(seed * 1000 + n)
+    portada = Image.new("L", (int(TAMANO_GUIA[0] * 300), int(TAMANO_GUIA[1] * 300)), 255)
+    ImageDraw.Draw(portada).text((75, 75), "HOJA DE CONTROL", fill=0, font=_font(33))
+    pagina = render_scan(guia, 300, seed=seed * 1000 + n)
+    nombre = "300dpi-multipagina.tif"
+    portada.save(os.path.join(folder, nombre), compression="tiff_lzw", dpi=(300, 300),
+                 save_all=True, append_images=[pagina])
+    entradas.append({"file": nombre, "guide": guia, "dpi": 300,
+                     "variant": "multipagina", "format": "tif", "pages": 2})
+
+    with open(os.path.join(folder, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(entradas, f, indent=2)
+    return entradas
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Genera escaneos sintéticos de guías.")
+    parser.add_argument("folder", help="Carpeta de destino.")
+    parser.add_argument("--quick", action="store_true", help="Conjunto reducido.")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla base (por defecto 1).")
+    args = parser.parse_args(argv)
+    entradas = generate_dataset(args.folder, args.quick, args.seed)
+    print(f"{len(entradas)} imágenes escritas en '{args.folder}'.")
+
+
+if __name__ == "__main__":
+    main()
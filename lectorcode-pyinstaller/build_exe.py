@@ -6,6 +6,8 @@ import shutil
 import site
 from pathlib import Path
 
+from scripts.build_helpers import compile_icon_resources, compile_ui
+
 def ensure_pyinstaller_installed():
     """Verifica que PyInstaller esté instalado, o lo instala si es necesario."""
     try:
@@ -67,8 +69,18 @@ def build_executable():
     print("Copiando DLLs necesarias...")
     found_dlls = copy_dlls_to_directory(dll_temp_dir)
     
+    # Regenerar la clase de la UI y los iconos compilados
+    original_dir = os.getcwd()
+    os.chdir(project_root)
+    try:
+        compile_ui()
+        compile_icon_resources()
+    finally:
+        os.chdir(original_dir)
+
     # Verificar qué directorios realmente existen
     ui_files_dir = project_root / "src" / "ui" / "ui_files"
+    rcc_file = project_root / "src" / "ui" / "assets" / "iconos.rcc"
     
     print(f"Verificando directorios de recursos:")
     print(f"  UI Files: {ui_files_dir} - {'Existe' if ui_files_dir.exists() else 'No existe'}")
@@ -85,6 +97,8 @@ def build_executable():
     # Agregar UI files si existen
     if ui_files_dir.exists():
         cmd.append(f"--add-data={ui_files_dir}{os.pathsep}src/ui/ui_files")
+    if rcc_file.exists():
+        cmd.append(f"--add-data={rcc_file}{os.pathsep}src/ui/assets")
     
     # Agregar cada DLL encontrada
     for dll_name, dll_path in found_dlls.items():
@@ -100,7 +114,6 @@ def build_executable():
     cmd.append(str(project_root / "main.py"))
     
     # Cambiar al directorio raíz del proyecto
-    original_dir = os.getcwd()
     os.chdir(project_root)
     
     try:
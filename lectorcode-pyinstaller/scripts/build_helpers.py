@@ -1 +1,98 @@
-pip install pyinstaller
\ No newline at end of file
+#!/usr/bin/env python3
+"""
+Generación de los archivos derivados de la interfaz que se versionan.
+
+- src/ui/ui_main_window.py: clase Ui_MainWindow compilada desde
+  src/ui/ui_files/Main_Window.ui (evita interpretar el XML con uic.loadUi
+  en cada arranque).
+- src/ui/assets/iconos.rcc: recursos de iconos en formato binario de Qt,
+  que se registran con QResource.registerResource sin cargar un módulo
+  Python con todos los PNG.
+
+Ejecutar tras modificar el .ui o iconos.qrc:
+    python lectorcode-pyinstaller/scripts/build_helpers.py
+"""
+import importlib.util
+import io
+import os
+import struct
+import subprocess
+import tempfile
+import zlib
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+UI_FILE = PROJECT_ROOT / "src" / "ui" / "ui_files" / "Main_Window.ui"
+UI_MODULE = PROJECT_ROOT / "src" / "ui" / "ui_main_window.py"
+QRC_FILE = PROJECT_ROOT / "src" / "ui" / "assets" / "iconos.qrc"
+RCC_FILE = PROJECT_ROOT / "src" / "ui" / "assets" / "iconos.rcc"
+
+# Versión del formato binario .rcc (la de qt_resource_struct_v2, Qt >= 5.8)
+RCC_FORMAT_VERSION = 2
+RCC_HEADER_SIZE = 20
+
+
+def ui_file_digest(path=UI_FILE):
+    """
+    CRC-32 del .ui; el módulo generado lo guarda para detectar si quedó desactualizado.
+
+    Se usa zlib.crc32 y no hashlib porque la ventana lo recalcula al
+    arrancar y hashlib tarda milisegundos en importarse.
+    """
+    with open(path, "rb") as f:
+        return zlib.crc32(f.read())
+
+
+def compile_ui():
+    """Compila Main_Window.ui a src/ui/ui_main_window.py."""
+    from PyQt5 import uic
+
+    salida = io.StringIO()
+    # Ruta relativa para que la cabecera generada no dependa de la máquina
+    with open(os.path.relpath(UI_FILE, PROJECT_ROOT), encoding="utf-8") as f:
+        uic.compileUi(f, salida)
+    # Los iconos los registra src/ui/icon_resources.py antes de setupUi:
+    # se omite el "import iconos_rc" que añade pyuic
+    lineas = [linea for linea in salida.getvalue().splitlines()
+              if linea.strip() != "import iconos_rc"]
+    contenido = "\n".join(lineas).rstrip() + "\n"
+    contenido += f"\n\n# CRC-32 de Main_Window.ui al generar este módulo\nUI_CRC32 = 0x{ui_file_digest():08x}\n"
+    with open(UI_MODULE, "w", encoding="utf-8", newline="\n") as f:
+        f.write(contenido)
+    print(f"Generado: {UI_MODULE}")
+
+
+def compile_icon_resources():
+    """
+    Compila iconos.qrc a src/ui/assets/iconos.rcc.
+
+    pyrcc5 solo genera código Python, así que se toman de su salida el árbol,
+    los nombres y los datos y se escriben con la cabecera del formato
+    binario de rcc ("qres", versión y desplazamientos de cada bloque).
+    """
+    with tempfile.TemporaryDirectory() as temporal:
+        modulo_py = os.path.join(temporal, "iconos_rc.py")
+        subprocess.run(["pyrcc5", "-o", modulo_py, str(QRC_FILE)], check=True)
+        spec = importlib.util.spec_from_file_location("iconos_rc", modulo_py)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        # Importarlo registra los recursos; no deben quedar registrados aquí
+        modulo.qCleanupResources()
+
+    datos = modulo.qt_resource_data
+    nombres = modulo.qt_resource_name
+    arbol = modulo.qt_resource_struct_v2
+    desplazamiento_datos = RCC_HEADER_SIZE
+    desplazamiento_nombres = desplazamiento_datos + len(datos)
+    desplazamiento_arbol = desplazamiento_nombres + len(nombres)
+    cabecera = b"qres" + struct.pack(">iiii", RCC_FORMAT_VERSION, desplazamiento_arbol,
+                                     desplazamiento_datos, desplazamiento_nombres)
+    with open(RCC_FILE, "wb") as f:
+        f.write(cabecera + datos + nombres + arbol)
+    print(f"Generado: {RCC_FILE}")
+
+
+if __name__ == "__main__":
+    os.chdir(PROJECT_ROOT)
+    compile_ui()
+    compile_icon_resources()
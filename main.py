@@ -7,30 +7,66 @@ This module initializes the PyQt5 application and main window.
 
 import sys
 import logging
+import multiprocessing
 from pathlib import Path
 
 # Ensure the src directory is in the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-# PyQt5 imports
-from PyQt5 import QtWidgets
-    
-# Application imports
-from src.ui.main_window import MainWindow
+# Startup profiler first, so its import breakdown covers everything below
+# (no-op unless LECTORCODE_STARTUP_PROFILE is set)
+from src.utils import startup_profiler
+startup_profiler.mark("python + imports básicos")
 
 
 def setup_logging():
-    """Configure application logging."""
+    """
+    Configure application logging.
+
+    The level comes from LECTORCODE_LOG_LEVEL; DEBUG adds the per-file
+    details of barcode/OCR extraction. An unknown level name is ignored
+    with a warning. In a windowed executable there is no
+    console, so only warnings and errors are kept, in a rotating file in the
+    local data folder.
+    """
+    import os
+    handlers = None
+    nivel = "INFO"
+    if sys.stderr is None:
+        from logging.handlers import RotatingFileHandler
+        from src.core.app_dirs import default_cache_dir
+        nivel = "WARNING"
+        try:
+            os.makedirs(default_cache_dir(), exist_ok=True)
+            handlers = [RotatingFileHandler(os.path.join(default_cache_dir(), "lectorcode.log"),
+                                            maxBytes=1024 * 1024, backupCount=3, encoding="utf-8")]
+        except OSError:
+            handlers = [logging.NullHandler()]
+    pedido = os.environ.get("LECTORCODE_LOG_LEVEL", "").strip().upper()
+    invalido = bool(pedido) and not isinstance(logging.getLevelName(pedido), int)
     logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        level=nivel if invalido or not pedido else pedido,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=handlers
     )
+    if invalido:
+        logging.getLogger(__name__).warning(
+            "LECTORCODE_LOG_LEVEL=%r no es un nivel válido; se usa %s.", pedido, nivel)
 
 
 def main():
     """Initialize and run the application."""
+    # PyQt5 and the UI are imported here, not at module level, so the
+    # processes of the batch pool (which re-import this module when they
+    # are spawned) never load them
+    from PyQt5 import QtWidgets, QtCore
+    startup_profiler.mark("import PyQt5")
+    from src.ui.main_window import MainWindow
+    startup_profiler.mark("import main_window")
+
     # Setup logging
     setup_logging()
+    startup_profiler.mark("logging configurado")
     
     # Suprimir warnings de fuentes no encontradas
     import os
@@ -38,14 +74,29 @@ def main():
     
     # Create application
     app = QtWidgets.QApplication(sys.argv)
+    startup_profiler.mark("QApplication creada")
     
     # Create and show main window
     window = MainWindow()
+    startup_profiler.mark("MainWindow creada")
     window.show()
+    startup_profiler.mark("ventana mostrada")
+
+    # Fin del arranque: la primera vuelta del bucle de eventos (ventana pintada).
+    # Con LECTORCODE_STARTUP_EXIT la aplicación se cierra ahí (benchmarks).
+    def arranque_completo():
+        startup_profiler.mark("primer ciclo de eventos")
+        if os.environ.get("LECTORCODE_STARTUP_EXIT"):
+            startup_profiler.finish()
+            app.quit()
+    QtCore.QTimer.singleShot(0, arranque_completo)
     
     # Run event loop
     return app.exec_()
 
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos en el ejecutable de PyInstaller;
+    # va antes de importar Qt para que los procesos hijos no lo carguen
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,257 @@
+# src/cli.py
+"""
+Procesamiento por lotes desde la línea de comandos, sin interfaz gráfica.
+
+Uso:
+    python -m src.cli [opciones] RUTA [RUTA ...]
+    python -m src.cli --watch [opciones] CARPETA [CARPETA ...]
+    python -m src.cli --undo DIARIO
+
+Cada RUTA puede ser un archivo de imagen o una carpeta. Por cada archivo se
+escribe una línea JSON con el resultado (JSON Lines), en el orden en que
+terminan. Con --watch las carpetas se vigilan y cada escaneo nuevo se
+renombra en cuanto termina de escribirse, hasta pulsar Ctrl+C.
+
+Este módulo no importa PyQt5: arranca rápido y puede ejecutarse desde cron
+o tareas programadas en servidores sin entorno gráfico.
+
+Con --journal los renombrados se anotan en un diario antes de aplicarse, y
+--undo devuelve a su nombre original los archivos de un diario (el de la
+interfaz o el de --journal), por ejemplo tras un lote con guías mal leídas.
+
+Códigos de salida: 0 si todos los archivos quedaron con su número de guía,
+1 si alguno falló, 2 si los argumentos no son válidos y 130 si se interrumpió.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Iterator, List, Optional, TextIO
+
+from src.core import file_scanner, result_log
+
+# Estados que cuentan como éxito
+ESTADOS_OK = ("success", "no_rename_needed")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Renombra imágenes escaneadas de guías con el número de guía "
+                    "leído por código de barras u OCR.",
+    )
+    parser.add_argument("paths", nargs="*", metavar="RUTA",
+                        help="Archivos de imagen o carpetas a procesar.")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Número de procesos de extracción (por defecto, núcleos de CPU; "
+                             "1 = sin pool de procesos).")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="Recorrer también las subcarpetas de las carpetas indicadas.")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Archivo JSON Lines de resultados ('-' = salida estándar, por defecto).")
+    parser.add_argument("--log", default=None, metavar="ARCHIVO",
+                        help="Añadir a ARCHIVO un registro por archivo con el método y los tiempos "
+                             "de cada etapa (CSV si termina en .csv; si no, JSON Lines).")
+    parser.add_argument("--journal", default=None, metavar="DIARIO",
+                        help="Anotar cada renombrado en DIARIO antes de aplicarlo, para poder deshacerlo.")
+    parser.add_argument("--undo", default=None, metavar="DIARIO",
+                        help="Deshacer los renombrados anotados en DIARIO y salir.")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Mostrar en la salida de error el detalle de cada archivo (nivel DEBUG).")
+    parser.add_argument("--watch", action="store_true",
+                        help="Vigilar las carpetas y procesar los escaneos a medida que llegan.")
+    parser.add_argument("--stable-seconds", type=float, default=None, metavar="S",
+                        help="Con --watch: segundos sin cambios para considerar completo un archivo.")
+    parser.add_argument("--poll", action="store_true",
+                        help="Con --watch: sondear la carpeta en lugar de usar inotify.")
+    return parser
+
+
+def _open_output(destino: str) -> TextIO:
+    """
+    Abre el destino de los resultados.
+
+    Con la salida estándar, el descriptor 1 se redirige a stderr para que los
+    mensajes de diagnóstico (también los de procesos worker y librerías
+    nativas) no se mezclen con las líneas JSON.
+    """
+    if destino != "-":
+        return open(destino, "w", encoding="utf-8", buffering=1)
+    sys.stdout.flush()
+    salida = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+    os.dup2(2, 1)
+    return salida
+
+
+def _record(path: str, result: dict) -> dict:
+    """Registro JSON de un archivo procesado."""
+    registro = {"path": path, "status": result.get("status", "error")}
+    for campo in ("guide_number", "method", "new_name", "new_path", "target_name", "message"):
+        if result.get(campo):
+            registro[campo] = result[campo]
+    return registro
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argv: Argumentos (sin el nombre del programa); None para usar sys.argv.
+
+    Returns:
+        Código de salida.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if not args.paths and not args.undo:
+        parser.print_usage(sys.stderr)
+        print("Error: indica al menos una RUTA (o --undo DIARIO).", file=sys.stderr)
+        return 2
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers debe ser mayor o igual que 1.", file=sys.stderr)
+        return 2
+
+    try:
+        salida = _open_output(args.output)
+    except OSError as e:
+        print(f"Error: No se pudo abrir '{args.output}': {e}", file=sys.stderr)
+        return 2
+
+    # Los mensajes de diagnóstico van siempre a la salida de error
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.verbose:
+        logging.getLogger("src").setLevel(logging.DEBUG)
+
+    if args.undo:
+        try:
+            return _undo(args.undo, salida)
+        finally:
+            salida.close()
+
+    log = None
+    if args.log:
+        try:
+            log = result_log.ResultLogWriter(args.log)
+        except OSError as e:
+            salida.close()
+            print(f"Error: No se pudo abrir el registro '{args.log}': {e}", file=sys.stderr)
+            return 2
+
+    journal = None
+    if args.journal:
+        from src.core import rename_journal
+        journal = rename_journal.RenameJournal(args.journal)
+
+    try:
+        if args.watch:
+            return _watch(args, salida, log, journal)
+        return _run_batch(args, salida, log, journal)
+    finally:
+        salida.close()
+        if log:
+            log.close()
+        if journal:
+            journal.close()
+
+
+def _run_batch(args: argparse.Namespace, salida: TextIO,
+               log: Optional[result_log.ResultLogWriter], journal=None) -> int:
+    """Procesa una sola vez los archivos indicados."""
+    # Importar después de redirigir la salida: los motores avisan al cargarse
+    from src.core import processing_handler
+
+    rutas: List[str] = []
+
+    def registrar_rutas() -> Iterator[str]:
+        # Las rutas se descubren a medida que el lote las consume
+        for path in file_scanner.iter_image_paths(args.paths, args.recursive):
+            rutas.append(path)
+            yield path
+
+    contadores = {}
+    inicio = time.perf_counter()
+    try:
+        for index, result in processing_handler.process_batch_auto(registrar_rutas(), args.workers,
+                                                                      journal=journal):
+            registro = _record(rutas[index], result)
+            salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            if log:
+                log.write(rutas[index], result)
+            contadores[registro["status"]] = contadores.get(registro["status"], 0) + 1
+    except KeyboardInterrupt:
+        print("Proceso interrumpido por el usuario.", file=sys.stderr)
+        return 130
+
+    total = sum(contadores.values())
+    resumen = ", ".join(f"{estado}={n}" for estado, n in sorted(contadores.items()))
+    print(f"Procesados {total} archivos en {time.perf_counter() - inicio:.1f}s ({resumen or 'ninguno'}).",
+          file=sys.stderr)
+    return 0 if all(estado in ESTADOS_OK for estado in contadores) else 1
+
+
+def _watch(args: argparse.Namespace, salida: TextIO,
+           log: Optional[result_log.ResultLogWriter], journal=None) -> int:
+    """Modo carpeta vigilada: procesa los escaneos nuevos hasta Ctrl+C."""
+    from src.core import hot_folder
+
+    carpetas = [os.path.abspath(p) for p in args.paths]
+    for carpeta in carpetas:
+        if not os.path.isdir(carpeta):
+            print(f"Error: '{carpeta}' no es una carpeta.", file=sys.stderr)
+            return 2
+
+    lock_salida = threading.Lock()
+
+    def escribir(path: str, result: dict) -> None:
+        linea = json.dumps(_record(path, result), ensure_ascii=False) + "\n"
+        with lock_salida:
+            salida.write(linea)
+            if log:
+                log.write(path, result)
+
+    opciones = {"recursive": args.recursive, "workers": args.workers or os.cpu_count() or 1,
+                "use_inotify": not args.poll, "journal": journal}
+    if args.stable_seconds is not None:
+        opciones["stable_seconds"] = args.stable_seconds
+    vigilantes = [hot_folder.HotFolderWatcher(c, escribir, **opciones) for c in carpetas]
+    for vigilante in vigilantes:
+        vigilante.start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        print("Deteniendo la vigilancia...", file=sys.stderr)
+    finally:
+        for vigilante in vigilantes:
+            vigilante.stop()
+    return 0
+
+
+def _undo(journal_path: str, salida: TextIO) -> int:
+    """Deshace los renombrados de un diario; una línea JSON por archivo."""
+    from src.core import processing_handler
+
+    try:
+        resultado = processing_handler.undo_batch(journal_path)
+    except OSError as e:
+        print(f"Error: No se pudo leer el diario '{journal_path}': {e}", file=sys.stderr)
+        return 2
+    for renombrado in resultado["restored"]:
+        salida.write(json.dumps({"path": renombrado["new"], "status": "restored",
+                                 "new_path": renombrado["old"]}, ensure_ascii=False) + "\n")
+    for renombrado in resultado["skipped"]:
+        salida.write(json.dumps({"path": renombrado["new"], "status": "skipped",
+                                 "target_name": os.path.basename(renombrado["old"]),
+                                 "message": renombrado["message"]}, ensure_ascii=False) + "\n")
+    print(f"Restaurados {len(resultado['restored'])} archivos; omitidos {len(resultado['skipped'])}.",
+          file=sys.stderr)
+    return 0 if not resultado["skipped"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+# src/core/app_dirs.py
+"""
+Carpetas de datos locales de la aplicación.
+
+Sin dependencias fuera de la biblioteca estándar básica: lo importan
+módulos que se cargan al abrir la ventana (registro y diario de lotes), y
+no debe arrastrar sqlite3 ni hashlib al arranque.
+"""
+import os
+import sys
+
+
+def default_cache_dir() -> str:
+    """
+    Carpeta de datos locales de la aplicación.
+
+    Se puede cambiar con la variable de entorno LECTORCODE_CACHE_DIR.
+    """
+    carpeta = os.environ.get("LECTORCODE_CACHE_DIR")
+    if carpeta:
+        return carpeta
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "LectorCode")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "lectorcode")
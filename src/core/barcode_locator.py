@@ -0,0 +1,150 @@
+# src/core/barcode_locator.py
+"""
+Localización rápida de códigos de barras en una página escaneada.
+
+Los códigos de barras 1D son zonas con mucho gradiente en una dirección
+(perpendicular a las barras) y muy poco en la otra. Sobre una copia reducida
+de la página se calcula esa diferencia de gradientes, se suaviza con un
+filtro de caja hasta fundir las barras en una banda y se extraen las
+regiones rectangulares con más energía. Todo el cálculo es vectorizado con
+NumPy; la página completa nunca pasa por pyzbar salvo como último recurso.
+"""
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    logger.warning("La librería numpy no está instalada (pip install numpy). "
+                   "La localización de códigos de barras se desactivará y se analizará la página completa.")
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Ancho aproximado (px) de la copia reducida sobre la que se buscan regiones
+ANCHO_ANALISIS = 1024
+# Número máximo de regiones candidatas devueltas
+MAX_REGIONES = 4
+# Energía media mínima de una región: el texto impreso queda por debajo (~10-20)
+# y un código de barras legible por encima (~30-80)
+ENERGIA_MINIMA = 24.0
+
+Caja = Tuple[int, int, int, int]  # (izquierda, arriba, derecha, abajo)
+
+
+def uniform_filter_1d(a: "np.ndarray", size: int, axis: int) -> "np.ndarray":
+    """Media móvil de tamaño `size` a lo largo de `axis` usando sumas acumuladas."""
+    if size <= 1:
+        return a
+    a = np.moveaxis(a, axis, -1)
+    pad_before = size // 2
+    pad_after = size - 1 - pad_before
+    padding = [(0, 0)] * (a.ndim - 1) + [(pad_before + 1, pad_after)]
+    acumulado = np.cumsum(np.pad(a, padding, mode='edge'), axis=-1, dtype=np.float32)
+    out = (acumulado[..., size:] - acumulado[..., :-size]) / size
+    return np.moveaxis(out, -1, axis)
+
+
+def true_runs(mask_1d: "np.ndarray") -> List[Tuple[int, int]]:
+    """Devuelve los tramos [inicio, fin) consecutivos en True de un vector booleano."""
+    bordes = np.diff(np.concatenate(([0], mask_1d.view(np.int8), [0])))
+    inicios = np.flatnonzero(bordes == 1)
+    fines = np.flatnonzero(bordes == -1)
+    return list(zip(inicios.tolist(), fines.tolist()))
+
+
+def _locate_vertical_bars(a: "np.ndarray") -> List[Tuple[float, Caja]]:
+    """
+    Busca bandas de barras verticales en una matriz de grises.
+
+    Args:
+        a: Imagen reducida como matriz int16 (alto, ancho).
+
+    Returns:
+        Lista de (puntuación, caja) en coordenadas de `a`.
+    """
+    alto, ancho = a.shape
+    if alto < 8 or ancho < 8:
+        return []
+
+    gx = np.abs(np.diff(a, axis=1))[:-1, :]
+    gy = np.abs(np.diff(a, axis=0))[:, :-1]
+    energia = np.clip(gx - gy, 0, None).astype(np.float32)
+
+    # Suavizar: más ancho que alto para fundir barras y espacios en una banda
+    energia = uniform_filter_1d(energia, max(3, ancho // 40), axis=1)
+    energia = uniform_filter_1d(energia, max(3, alto // 100), axis=0)
+
+    maximo = float(energia.max())
+    if maximo <= 0:
+        return []
+    umbral = max(float(energia.mean() + 2 * energia.std()), 0.35 * maximo)
+    mascara = energia > umbral
+
+    candidatas = []
+    for fila_ini, fila_fin in true_runs(mascara.any(axis=1)):
+        if fila_fin - fila_ini < max(2, alto // 200):
+            continue
+        banda = mascara[fila_ini:fila_fin]
+        for col_ini, col_fin in true_runs(banda.any(axis=0)):
+            ancho_region = col_fin - col_ini
+            alto_region = fila_fin - fila_ini
+            # Un código 1D es más ancho que alto y no minúsculo
+            if ancho_region < max(8, ancho // 30) or ancho_region < alto_region * 0.5:
+                continue
+            puntuacion = float(energia[fila_ini:fila_fin, col_ini:col_fin].sum())
+            if puntuacion < ENERGIA_MINIMA * ancho_region * alto_region:
+                continue
+            candidatas.append((puntuacion, (col_ini, fila_ini, col_fin, fila_fin)))
+    return candidatas
+
+
+def locate_barcode_regions(gray: "Image.Image", max_regions: int = MAX_REGIONES) -> List[Caja]:
+    """
+    Devuelve las regiones de la página con más probabilidad de contener un código de barras.
+
+    Las cajas incluyen un margen (zona de silencio) suficiente para que
+    pyzbar pueda decodificar el recorte, y están en coordenadas de la imagen
+    original, listas para `gray.crop(caja)`.
+
+    Args:
+        gray: Página en escala de grises (modo 'L') a resolución completa.
+        max_regions: Número máximo de regiones a devolver.
+
+    Returns:
+        Lista de cajas (izquierda, arriba, derecha, abajo) ordenadas de mayor
+        a menor probabilidad. Lista vacía si numpy no está disponible o no se
+        encontró ninguna candidata.
+    """
+    if np is None or Image is None:
+        return []
+
+    ancho, alto = gray.size
+    factor = max(1, ancho // ANCHO_ANALISIS)
+    reducida = gray.reduce(factor) if factor > 1 else gray
+    a = np.asarray(reducida, dtype=np.int16)
+
+    candidatas = _locate_vertical_bars(a)
+    # Códigos girados 90°: mismas bandas sobre la matriz transpuesta
+    for puntuacion, (x0, y0, x1, y1) in _locate_vertical_bars(np.ascontiguousarray(a.T)):
+        candidatas.append((puntuacion, (y0, x0, y1, x1)))
+
+    candidatas.sort(key=lambda c: c[0], reverse=True)
+
+    cajas = []
+    for _, (x0, y0, x1, y1) in candidatas[:max_regions]:
+        # Margen generoso: zbar necesita la zona de silencio a ambos lados
+        margen_x = max((x1 - x0) // 8, (y1 - y0) // 2, 4)
+        margen_y = max((y1 - y0) // 3, 4)
+        cajas.append((
+            max(0, (x0 - margen_x) * factor),
+            max(0, (y0 - margen_y) * factor),
+            min(ancho, (x1 + margen_x + 1) * factor),
+            min(alto, (y1 + margen_y + 1) * factor),
+        ))
+    return cajas
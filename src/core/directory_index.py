@@ -0,0 +1,86 @@
+# src/core/directory_index.py
+"""
+Índice en memoria de los nombres de archivo de las carpetas de un lote.
+
+Cada carpeta se lista una sola vez con os.scandir, la primera vez que se
+pregunta por ella, y el índice se actualiza con cada renombrado del lote.
+Así "¿existe este destino?" y "¿otro archivo del lote ya tomó este número
+de guía?" se responden sin un stat por archivo, que en una carpeta
+compartida por SMB es un viaje de ida y vuelta por la red.
+
+El índice puede quedar desfasado si otro programa cambia la carpeta durante
+el lote: quien renombra debe volver a comprobar el destino en disco justo
+antes de renombrar (lo hace processing_handler).
+"""
+import logging
+import os
+import threading
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryIndex:
+    """Nombres de archivo por carpeta, válido durante un lote."""
+
+    def __init__(self):
+        # carpeta normalizada -> nombres (normcase); None si no se pudo listar
+        self._carpetas: Dict[str, Optional[Set[str]]] = {}
+        # destino normalizado -> archivo original que lo obtuvo en este lote
+        self._asignados: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split(path: str):
+        ruta = os.path.normcase(os.path.abspath(path))
+        return os.path.dirname(ruta), os.path.basename(ruta)
+
+    def _names(self, carpeta: str) -> Optional[Set[str]]:
+        """Nombres de una carpeta, listándola la primera vez (con el lock tomado)."""
+        if carpeta not in self._carpetas:
+            try:
+                with os.scandir(carpeta) as entradas:
+                    self._carpetas[carpeta] = {os.path.normcase(e.name) for e in entradas}
+            except OSError as e:
+                logger.debug("No se pudo listar '%s' (%s); se consultará el disco.", carpeta, e)
+                self._carpetas[carpeta] = None
+        return self._carpetas[carpeta]
+
+    def exists(self, path: str) -> bool:
+        """Indica si `path` existe según el índice (o el disco, si la carpeta no se pudo listar)."""
+        carpeta, nombre = self._split(path)
+        with self._lock:
+            nombres = self._names(carpeta)
+            if nombres is not None:
+                return nombre in nombres
+        return os.path.exists(path)
+
+    def claimed_by(self, path: str) -> Optional[str]:
+        """Archivo original que se renombró a `path` en este lote, o None."""
+        carpeta, nombre = self._split(path)
+        with self._lock:
+            return self._asignados.get(os.path.join(carpeta, nombre))
+
+    def add(self, path: str) -> None:
+        """Anota un archivo que existe (p. ej. descubierto en la comprobación final)."""
+        carpeta, nombre = self._split(path)
+        with self._lock:
+            nombres = self._names(carpeta)
+            if nombres is not None:
+                nombres.add(nombre)
+
+    def discard(self, path: str) -> None:
+        """Anota que un archivo ya no existe."""
+        carpeta, nombre = self._split(path)
+        with self._lock:
+            nombres = self._carpetas.get(carpeta)
+            if nombres is not None:
+                nombres.discard(nombre)
+
+    def record_rename(self, old_path: str, new_path: str) -> None:
+        """Actualiza el índice tras renombrar `old_path` a `new_path`."""
+        self.discard(old_path)
+        self.add(new_path)
+        carpeta, nombre = self._split(new_path)
+        with self._lock:
+            self._asignados[os.path.join(carpeta, nombre)] = old_path
@@ -1,57 +1,107 @@
 # src/core/file_operations.py
+import errno
+import logging
 import os
 import shutil
-from pathlib import Path
+import threading
 from typing import Tuple, Optional
 
-def validar_ruta_archivo(ruta_archivo: str) -> Tuple[bool, Optional[str]]:
-    """
-    Valida si existe una ruta de archivo.
-    
-    Args:
-        ruta_archivo: Ruta completa del archivo
-        
-    Returns:
-        Tuple[bool, Optional[str]]: (éxito, mensaje_error)
-    """
-    ruta = Path(ruta_archivo)
-    if not ruta.exists():
-        return False, f"El archivo no existe: {ruta.name}"
-    return True, None
+logger = logging.getLogger(__name__)
+
+# Carpetas de destino que ya se sabe que existen (evita un mkdir por archivo)
+_directorios_existentes = set()
+_directorios_lock = threading.Lock()
+
+def _ensure_directory(directorio: str) -> None:
+    """Crea una carpeta de destino si hace falta, consultando el disco una vez por carpeta."""
+    if directorio in _directorios_existentes:
+        return
+    os.makedirs(directorio, exist_ok=True)
+    with _directorios_lock:
+        _directorios_existentes.add(directorio)
 
-def rename_scan(old_path: str, new_path: str) -> Tuple[bool, Optional[str]]:
+def rename_scan(old_path: str, new_path: str, journal=None) -> Tuple[bool, Optional[str]]:
     """
     Renombra o mueve un archivo de escaneo.
 
+    Dentro de un mismo sistema de archivos (el caso habitual: renombrar en
+    la misma carpeta) se usa os.rename, que es atómico y no copia datos.
+    Solo si el destino está en otro disco (EXDEV) se recurre a shutil.move,
+    que copia y borra.
+
+    La existencia del origen no se comprueba por separado: si falta,
+    os.rename falla y se devuelve el mismo error de validación. El destino
+    lo comprueba quien llama (os.rename lo sobrescribiría en Linux/macOS).
+
     Args:
         old_path: Ruta completa del archivo original.
         new_path: Nueva ruta completa deseada para el archivo.
+        journal: RenameJournal opcional del lote; se anota la intención
+            antes de renombrar y el resultado después.
 
     Returns:
         Tuple[bool, Optional[str]]: (éxito, mensaje_error)
     """
-    ruta_original = Path(old_path)
-    ruta_nueva = Path(new_path)
-    
-    # Validar ruta original
-    valido, error = validar_ruta_archivo(old_path)
-    if not valido:
-        print(f"Error de validación: {error}")
-        return False, error
-    
-    # Crear directorio padre para la nueva ruta si no existe
-    ruta_nueva.parent.mkdir(parents=True, exist_ok=True)
-    
+    nombre_original = os.path.basename(old_path)
+    directorio_nuevo = os.path.dirname(os.path.abspath(new_path))
+    if directorio_nuevo != os.path.dirname(os.path.abspath(old_path)):
+        # Crear directorio padre para la nueva ruta si no existe
+        try:
+            _ensure_directory(directorio_nuevo)
+        except OSError as e:
+            logger.error("Error de OS al crear la carpeta '%s': %s", directorio_nuevo, e)
+            return False, str(e)
+
+    id_diario = None
+    if journal:
+        try:
+            id_diario = journal.begin(old_path, new_path)
+        except OSError as e:
+            # Sin la intención en el diario el renombrado no podría deshacerse
+            logger.error("No se pudo escribir el diario de renombrados: %s", e)
+            return False, f"No se pudo escribir el diario de renombrados: {e}"
     try:
-        # Usar shutil.move es más robusto que os.rename, funciona entre discos
-        shutil.move(str(ruta_original), str(ruta_nueva))
-        print(f"Archivo renombrado/movido: '{ruta_original.name}' -> '{ruta_nueva.name}'")
-        return True, None
+        try:
+            os.rename(old_path, new_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Otro sistema de archivos: copiar y borrar
+            shutil.move(old_path, new_path)
+    except FileNotFoundError:
+        if not os.path.exists(old_path):
+            error = f"El archivo no existe: {nombre_original}"
+            logger.warning("Error de validación: %s", error)
+        else:
+            # Falta la carpeta de destino (p. ej. se borró después de cachearla)
+            with _directorios_lock:
+                _directorios_existentes.discard(directorio_nuevo)
+            error = f"No existe la carpeta de destino: {directorio_nuevo}"
+            logger.error("Error de OS al renombrar '%s': %s", nombre_original, error)
+        _journal_outcome(journal, id_diario, error)
+        return False, error
     except OSError as e:
-        error_msg = f"Error de OS al renombrar '{ruta_original.name}': {e}"
-        print(error_msg)
+        logger.error("Error de OS al renombrar '%s': %s", nombre_original, e)
+        _journal_outcome(journal, id_diario, str(e))
         return False, str(e)
     except Exception as e:
-        error_msg = f"Error inesperado al renombrar '{ruta_original.name}': {e}"
-        print(error_msg)
-        return False, str(e)
\ No newline at end of file
+        logger.error("Error inesperado al renombrar '%s': %s", nombre_original, e)
+        _journal_outcome(journal, id_diario, str(e))
+        return False, str(e)
+
+    _journal_outcome(journal, id_diario)
+    logger.debug("Archivo renombrado/movido: '%s' -> '%s'", nombre_original, os.path.basename(new_path))
+    return True, None
+
+def _journal_outcome(journal, rename_id: Optional[int], error: Optional[str] = None) -> None:
+    """Anota en el diario el resultado de un renombrado (sin diario, no hace nada)."""
+    if not journal:
+        return
+    try:
+        if error is None:
+            journal.commit(rename_id)
+        else:
+            journal.abort(rename_id, error)
+    except OSError as e:
+        # La intención ya está escrita: al deshacer se decide mirando el disco
+        logger.warning("No se pudo anotar el resultado en el diario de renombrados: %s", e)
@@ -0,0 +1,95 @@
+# src/core/file_scanner.py
+"""
+Enumeración rápida de imágenes escaneadas en árboles de carpetas.
+
+Los escáneres guardan en árboles por fecha sobre recursos compartidos de
+red, donde cada llamada a stat es un viaje de ida y vuelta al servidor. Se
+recorre el árbol con os.scandir y se reutiliza el tipo que ya viene en cada
+entrada del directorio (d_type en Linux, datos de FindNextFile en Windows),
+de modo que clasificar un archivo no cuesta llamadas extra al sistema de
+archivos. Los resultados se generan sobre la marcha para poder mostrarlos
+mientras el recorrido continúa.
+"""
+import logging
+import os
+from typing import Callable, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Extensiones de imagen que se importan (en minúsculas)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+
+def is_image_name(name: str) -> bool:
+    """Indica si un nombre de archivo tiene una extensión de imagen soportada."""
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def iter_image_files(root: str, recursive: bool = True,
+                     should_cancel: Optional[Callable[[], bool]] = None) -> Iterator[str]:
+    """
+    Genera las rutas de las imágenes de una carpeta.
+
+    Dentro de cada carpeta los archivos salen ordenados por nombre y antes
+    que las subcarpetas. Los enlaces simbólicos a carpetas no se siguen
+    (evita ciclos); las carpetas ilegibles se omiten con una advertencia.
+
+    Args:
+        root: Carpeta a recorrer.
+        recursive: Si es False solo se lista la carpeta indicada.
+        should_cancel: Función opcional; si devuelve True se detiene el recorrido.
+
+    Yields:
+        Rutas completas de los archivos de imagen.
+    """
+    pendientes = [root]
+    while pendientes:
+        if should_cancel and should_cancel():
+            return
+        carpeta = pendientes.pop()
+        archivos: List[str] = []
+        subcarpetas: List[str] = []
+        try:
+            with os.scandir(carpeta) as entradas:
+                for entrada in entradas:
+                    try:
+                        if entrada.is_dir(follow_symlinks=False):
+                            if recursive:
+                                subcarpetas.append(entrada.path)
+                        elif is_image_name(entrada.name) and entrada.is_file():
+                            archivos.append(entrada.path)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning("No se pudo leer la carpeta '%s': %s", carpeta, e)
+            continue
+
+        archivos.sort()
+        yield from archivos
+        # Pila: invertir para visitar las subcarpetas en orden alfabético
+        subcarpetas.sort(reverse=True)
+        pendientes.extend(subcarpetas)
+
+
+def iter_image_paths(paths: Iterable[str], recursive: bool = True,
+                     should_cancel: Optional[Callable[[], bool]] = None) -> Iterator[str]:
+    """
+    Genera las imágenes de una mezcla de archivos y carpetas (p. ej. arrastrados).
+
+    Args:
+        paths: Rutas de archivos y/o carpetas.
+        recursive: Recorrer las subcarpetas de las carpetas indicadas.
+        should_cancel: Función opcional; si devuelve True se detiene el recorrido.
+
+    Yields:
+        Rutas completas de los archivos de imagen.
+    """
+    for path in paths:
+        if should_cancel and should_cancel():
+            return
+        if os.path.isdir(path):
+            yield from iter_image_files(path, recursive, should_cancel)
+        elif is_image_name(path) and os.path.isfile(path):
+            yield path
+        else:
+            logger.warning("'%s' no es una imagen ni una carpeta, omitido.", path)
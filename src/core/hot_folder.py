@@ -0,0 +1,395 @@
+# src/core/hot_folder.py
+"""
+Carpeta vigilada: procesa los escaneos a medida que llegan.
+
+Un hilo vigilante recibe los archivos nuevos (inotify en Linux; en otros
+sistemas, o si inotify no está disponible, recorridos periódicos de la
+carpeta) y los anota como candidatos. Un archivo pasa a la cola de trabajo
+cuando su tamaño y su fecha de modificación no cambian durante unos
+segundos, es decir, cuando el escáner terminó de escribirlo (con inotify,
+además, cuando el escritor lo cerró). Varios hilos worker toman archivos de
+la cola y llaman a process_single_file_auto.
+
+La memoria está acotada aunque lleguen miles de archivos de golpe: la cola
+y la tabla de candidatos tienen un tamaño máximo. Si se llenan (o el kernel
+descarta eventos de inotify), los eventos sobrantes se ignoran y, cuando
+hay sitio, se vuelve a recorrer la carpeta para recoger lo que falte. Los
+archivos que ya tienen nombre de guía (incluidos los que renombra el propio
+servicio) no se vuelven a procesar, ni los ya procesados mientras no
+cambien.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import queue
+import re
+import select
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import file_scanner
+from . import image_processor
+from . import processing_handler
+
+logger = logging.getLogger(__name__)
+
+# Segundos sin cambios de tamaño/fecha antes de considerar completo un archivo
+SEGUNDOS_ESTABLE = 2.0
+# Con inotify, un archivo que sigue abierto para escritura se espera hasta que
+# se cierre o pase este tiempo sin cambios
+SEGUNDOS_ESTABLE_ABIERTO = 60.0
+# Cada cuánto se comprueban los candidatos (s)
+INTERVALO_COMPROBACION = 0.5
+# Cada cuánto se recorre la carpeta cuando no hay inotify (s)
+INTERVALO_SONDEO = 2.0
+# Archivos esperando en la cola de trabajo
+MAX_COLA = 256
+# Archivos esperando a que termine su escritura
+MAX_CANDIDATOS = 4096
+# Archivos ya procesados recordados para no repetirlos en cada recorrido
+MAX_PROCESADOS = 50000
+
+# Nombre que ya es un número de guía: no hay nada que hacer
+PATRON_YA_RENOMBRADO = re.compile(image_processor.PATRON_NUMERO_GUIA)
+
+# Constantes de inotify (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_MASCARA = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_CABECERA_EVENTO = struct.Struct('iIII')
+
+# (ruta, resultado de process_single_file_auto)
+ResultCallback = Callable[[str, dict], None]
+
+
+def is_already_named(path: str) -> bool:
+    """Indica si el nombre del archivo ya es un número de guía."""
+    base, _ = os.path.splitext(os.path.basename(path))
+    return PATRON_YA_RENOMBRADO.fullmatch(base) is not None
+
+
+class _Inotify:
+    """Acceso mínimo a inotify mediante ctypes (solo Linux)."""
+
+    def __init__(self):
+        """
+        Raises:
+            OSError: Si inotify no está disponible.
+        """
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify solo está disponible en Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._carpetas: Dict[int, str] = {}
+
+    def add_watch(self, carpeta: str) -> None:
+        """Vigila una carpeta (no sus subcarpetas)."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(carpeta), _MASCARA)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), carpeta)
+        self._carpetas[wd] = carpeta
+
+    def read_events(self, timeout: float) -> List[Tuple[int, Optional[str]]]:
+        """
+        Espera eventos hasta `timeout` segundos.
+
+        Returns:
+            Lista de (máscara, ruta); la ruta es None en el desbordamiento de cola.
+        """
+        listos, _, _ = select.select([self.fd], [], [], timeout)
+        if not listos:
+            return []
+        try:
+            datos = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        eventos = []
+        desplazamiento = 0
+        while desplazamiento + _CABECERA_EVENTO.size <= len(datos):
+            wd, mascara, _, longitud = _CABECERA_EVENTO.unpack_from(datos, desplazamiento)
+            desplazamiento += _CABECERA_EVENTO.size
+            nombre = datos[desplazamiento:desplazamiento + longitud].rstrip(b'\0')
+            desplazamiento += longitud
+            carpeta = self._carpetas.get(wd)
+            if mascara & _IN_Q_OVERFLOW:
+                eventos.append((mascara, None))
+            elif carpeta is not None and nombre:
+                eventos.append((mascara, os.path.join(carpeta, os.fsdecode(nombre))))
+        return eventos
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class HotFolderWatcher:
+    """Vigila una carpeta y renombra cada escaneo en cuanto termina de escribirse."""
+
+    def __init__(self, root: str, on_result: Optional[ResultCallback] = None,
+                 recursive: bool = False, workers: int = 1,
+                 stable_seconds: float = SEGUNDOS_ESTABLE,
+                 queue_size: int = MAX_COLA, use_inotify: bool = True,
+                 journal=None):
+        """
+        Args:
+            root: Carpeta a vigilar.
+            on_result: Función llamada (desde un hilo worker) con la ruta y el
+                resultado de cada archivo procesado.
+            recursive: Vigilar también las subcarpetas (y las que se creen).
+            workers: Número de hilos que procesan archivos en paralelo.
+            stable_seconds: Segundos sin cambios para considerar completo un archivo.
+            queue_size: Tamaño máximo de la cola de trabajo.
+            use_inotify: Usar inotify si está disponible; si es False, sondeo.
+            journal: RenameJournal opcional donde anotar los renombrados.
+        """
+        self.root = os.path.abspath(root)
+        self.on_result = on_result
+        self.recursive = recursive
+        self.workers = max(1, workers)
+        self.stable_seconds = stable_seconds
+        self.use_inotify = use_inotify
+        self.journal = journal
+
+        self._cola: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        # ruta -> (tamaño, mtime_ns, instante del último cambio, abierto para escritura)
+        self._candidatos: Dict[str, Tuple[int, int, float, bool]] = {}
+        # Rutas en la cola o procesándose
+        self._en_curso = set()
+        # ruta final -> (tamaño, mtime_ns) de los ya procesados; se repiten si cambian
+        self._procesados: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._recorrer = True  # El primer recorrido recoge lo que ya estaba
+        self._stop = threading.Event()
+        self._hilos: List[threading.Thread] = []
+        self._inotify: Optional[_Inotify] = None
+
+    # ----- Ciclo de vida -----
+
+    def start(self) -> None:
+        """Arranca el hilo vigilante y los workers."""
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify()
+                self._watch_tree(self.root)
+                logger.info("Vigilando '%s' con inotify.", self.root)
+            except OSError as e:
+                logger.warning("inotify no disponible (%s). Se sondeará la carpeta cada %.0fs.",
+                               e, INTERVALO_SONDEO)
+                if self._inotify:
+                    self._inotify.close()
+                self._inotify = None
+        if self._inotify is None:
+            logger.info("Vigilando '%s' por sondeo.", self.root)
+
+        self._hilos = [threading.Thread(target=self._watch_loop, name="hotfolder-watch", daemon=True)]
+        self._hilos += [
+            threading.Thread(target=self._worker_loop, name=f"hotfolder-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Detiene el servicio; los archivos en proceso terminan antes."""
+        self._stop.set()
+        for _ in range(self.workers):
+            # Despertar a los workers aunque la cola esté llena
+            while True:
+                try:
+                    self._cola.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    try:
+                        self._cola.get_nowait()
+                    except queue.Empty:
+                        pass
+        for hilo in self._hilos:
+            hilo.join(timeout)
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+    def run_forever(self) -> None:
+        """Arranca el servicio y bloquea hasta Ctrl+C."""
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            logger.info("Deteniendo...")
+        finally:
+            self.stop()
+
+    # ----- Hilo vigilante -----
+
+    def _watch_tree(self, carpeta: str) -> None:
+        """Añade vigilancia a una carpeta y, si es recursivo, a sus subcarpetas."""
+        pendientes = [carpeta]
+        while pendientes:
+            actual = pendientes.pop()
+            try:
+                self._inotify.add_watch(actual)
+            except OSError as e:
+                if actual == carpeta == self.root:
+                    raise
+                logger.warning("No se pudo vigilar '%s': %s", actual, e)
+                continue
+            if self.recursive:
+                try:
+                    with os.scandir(actual) as entradas:
+                        pendientes.extend(e.path for e in entradas if e.is_dir(follow_symlinks=False))
+                except OSError:
+                    pass
+
+    def _watch_loop(self) -> None:
+        ultima_comprobacion = 0.0
+        ultimo_sondeo = 0.0
+        while not self._stop.is_set():
+            if self._inotify:
+                for mascara, path in self._inotify.read_events(INTERVALO_COMPROBACION):
+                    self._handle_event(mascara, path)
+            else:
+                self._stop.wait(INTERVALO_COMPROBACION)
+
+            ahora = time.monotonic()
+            if self._inotify is None and ahora - ultimo_sondeo >= INTERVALO_SONDEO:
+                self._recorrer = True
+                ultimo_sondeo = ahora
+            if ahora - ultima_comprobacion >= INTERVALO_COMPROBACION:
+                self._check_candidates(ahora)
+                ultima_comprobacion = ahora
+            if self._recorrer and len(self._candidatos) < MAX_CANDIDATOS // 2:
+                self._rescan()
+
+    def _handle_event(self, mascara: int, path: Optional[str]) -> None:
+        """Traduce un evento de inotify en candidatos o en un recorrido."""
+        if path is None:
+            logger.warning("Cola de eventos de inotify desbordada; se recorrerá la carpeta.")
+            self._recorrer = True
+            return
+        if mascara & _IN_ISDIR:
+            if self.recursive and mascara & (_IN_CREATE | _IN_MOVED_TO):
+                # La carpeta puede haberse llenado antes de empezar a vigilarla
+                self._watch_tree(path)
+                self._recorrer = True
+            return
+        cerrado = bool(mascara & (_IN_CLOSE_WRITE | _IN_MOVED_TO))
+        self._add_candidate(path, abierto=not cerrado)
+
+    def _add_candidate(self, path: str, abierto: Optional[bool] = None) -> bool:
+        """
+        Anota un archivo como candidato si merece procesarse.
+
+        Args:
+            path: Ruta del archivo.
+            abierto: El evento indica si el archivo se sigue escribiendo;
+                None (recorridos) conserva lo que dijo el último evento.
+
+        Returns:
+            False si la tabla de candidatos está llena.
+        """
+        if not file_scanner.is_image_name(path) or is_already_named(path):
+            return True
+        with self._lock:
+            if path in self._en_curso:
+                return True
+            if path in self._candidatos:
+                if abierto is not None:
+                    tamano, mtime, desde, _ = self._candidatos[path]
+                    self._candidatos[path] = (tamano, mtime, desde, abierto)
+                return True
+            if len(self._candidatos) >= MAX_CANDIDATOS:
+                # Se recogerá en el siguiente recorrido
+                self._recorrer = True
+                return False
+            self._candidatos[path] = (-1, -1, time.monotonic(), bool(abierto))
+        return True
+
+    def _check_candidates(self, ahora: float) -> None:
+        """Pasa a la cola los candidatos cuyo tamaño ya no cambia."""
+        for path, (tamano, mtime, desde, abierto) in list(self._candidatos.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._candidatos[path]  # Borrado o movido
+                continue
+            if self._procesados.get(path) == (st.st_size, st.st_mtime_ns):
+                # Ya se procesó con este mismo contenido
+                del self._candidatos[path]
+                continue
+            if (st.st_size, st.st_mtime_ns) != (tamano, mtime):
+                self._candidatos[path] = (st.st_size, st.st_mtime_ns, ahora, abierto)
+                continue
+            espera = max(self.stable_seconds, SEGUNDOS_ESTABLE_ABIERTO) if abierto else self.stable_seconds
+            if st.st_size == 0 or ahora - desde < espera:
+                continue
+            with self._lock:
+                try:
+                    self._cola.put_nowait(path)
+                except queue.Full:
+                    return  # Cola llena: se reintenta en la próxima comprobación
+                del self._candidatos[path]
+                self._en_curso.add(path)
+
+    def _rescan(self) -> None:
+        """Recorre la carpeta para recoger archivos sin evento (arranque, desbordes, sondeo)."""
+        self._recorrer = False
+        for path in file_scanner.iter_image_files(self.root, self.recursive, self._stop.is_set):
+            if not self._add_candidate(path):
+                return  # Sin sitio: _add_candidate pidió otro recorrido
+
+    # ----- Workers -----
+
+    def _worker_loop(self) -> None:
+        while True:
+            path = self._cola.get()
+            if path is None or self._stop.is_set():
+                return
+            try:
+                result = processing_handler.process_single_file_auto(path, journal=self.journal)
+            except Exception as e:
+                result = {"status": "error", "message": f"Error inesperado: {e}",
+                          "current_name": os.path.basename(path)}
+            self._record_result(path, result)
+            if self.on_result:
+                try:
+                    self.on_result(path, result)
+                except Exception as e:
+                    logger.warning("Error al notificar el resultado de '%s': %s", path, e)
+
+    def _record_result(self, path: str, result: dict) -> None:
+        """
+        Recuerda el archivo ya procesado para no repetirlo mientras no cambie.
+
+        Vale para cualquier resultado final (también éxito o sin cambios: un
+        archivo con nombre de código no-guía se repetiría en cada recorrido);
+        se anota con su ruta final por si se renombró.
+        """
+        with self._lock:
+            self._en_curso.discard(path)
+            if result.get("status") == "cancelled":
+                return
+            final = result.get("new_path") or path
+            if final != path:
+                self._procesados.pop(path, None)
+            try:
+                st = os.stat(final)
+            except OSError:
+                self._procesados.pop(final, None)
+                return
+            self._procesados[final] = (st.st_size, st.st_mtime_ns)
+            self._procesados.move_to_end(final)
+            while len(self._procesados) > MAX_PROCESADOS:
+                self._procesados.popitem(last=False)
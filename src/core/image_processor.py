@@ -1,85 +1,104 @@
 # src/core/image_processor.py
+import contextlib
+import hashlib
+import io
+import logging
 import os
+import re
 import sys
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
 # Importar librerías de procesamiento. Añadir manejo de errores por si no están instaladas.
 try:
-    from PIL import Image
+    from PIL import Image, ImageSequence
 except ImportError:
-    print("Error Crítico: La librería Pillow no está instalada. Ejecuta: pip install Pillow")
+    logger.critical("La librería Pillow no está instalada. Ejecuta: pip install Pillow")
     sys.exit("Error Crítico: Falta la librería Pillow.")
 
 try:
     # Para códigos de barras
     from pyzbar import pyzbar
 except ImportError:
-    print("Advertencia: La librería pyzbar no está instalada (pip install pyzbar). "
-          "La lectura de códigos de barras no funcionará. "
-          "Además, requiere que la librería ZBar esté instalada (o sus DLLs incluidas).")
+    logger.warning("La librería pyzbar no está instalada (pip install pyzbar). "
+                   "La lectura de códigos de barras no funcionará. "
+                   "Además, requiere que la librería ZBar esté instalada (o sus DLLs incluidas).")
     pyzbar = None # Establecer a None para poder verificar su disponibilidad
 
 try:
     # Para OCR
     import pytesseract
 except ImportError:
-    print("Advertencia: La librería pytesseract no está instalada (pip install pytesseract). "
-          "El OCR no funcionará. "
-          "Además, requiere que el motor Tesseract OCR esté instalado (o incluido).")
+    logger.warning("La librería pytesseract no está instalada (pip install pytesseract). "
+                   "El OCR no funcionará. "
+                   "Además, requiere que el motor Tesseract OCR esté instalado (o incluido).")
     pytesseract = None
     tessdata_config = ''
 except Exception as e_tess_init:
-     print(f"Error al inicializar Pytesseract: {e_tess_init}. El OCR podría no funcionar.")
+     logger.error("Error al inicializar Pytesseract: %s. El OCR podría no funcionar.", e_tess_init)
      tessdata_config = ''
 
+from . import barcode_locator
+from . import ocr_engine
+from . import text_locator
+
+# Excepción de pytesseract si está disponible (tupla vacía = no captura nada)
+_TesseractNotFoundError = pytesseract.TesseractNotFoundError if pytesseract else ()
+
 
 # --- Configuración de Rutas para PyInstaller ---
 tessdata_config = '' # Inicializar config global para tessdata
+tessdata_dir = None # Carpeta tessdata para el motor persistente (None = la del sistema)
 # No necesitamos tesseract_cmd_path global si lo establecemos directamente abajo
 
 # Determinar si la aplicación está 'congelada' (empaquetada por PyInstaller)
 if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
     # Estamos ejecutando desde el .exe empaquetado
-    print("Modo congelado (ejecutable) detectado.")
+    logger.info("Modo congelado (ejecutable) detectado.")
     # _MEIPASS es la ruta al directorio temporal (modo --onefile)
     # o la ruta a la carpeta de la app (modo --onedir)
     bundle_dir = sys._MEIPASS
-    print(f"Directorio del bundle (_MEIPASS): {bundle_dir}")
+    logger.debug("Directorio del bundle (_MEIPASS): %s", bundle_dir)
 
     # --- Configurar TESSDATA ---
     # Asume que 'tessdata' se copia a la raíz del bundle con --add-data "...;tessdata"
     tessdata_dir_bundle = os.path.join(bundle_dir, 'tessdata')
-    print(f"Buscando tessdata empaquetado en: {tessdata_dir_bundle}")
+    logger.debug("Buscando tessdata empaquetado en: %s", tessdata_dir_bundle)
 
     if os.path.isdir(tessdata_dir_bundle):
         # Crear la opción de configuración para pytesseract
         tessdata_config = f'--tessdata-dir "{tessdata_dir_bundle}"'
-        print(f"Configuración de TESSDATA para pytesseract: {tessdata_config}")
+        tessdata_dir = tessdata_dir_bundle
+        logger.info("Configuración de TESSDATA para pytesseract: %s", tessdata_config)
     else:
-        print("ADVERTENCIA CRÍTICA: Carpeta 'tessdata' no encontrada en el bundle. El OCR fallará.")
+        logger.critical("Carpeta 'tessdata' no encontrada en el bundle. El OCR fallará.")
         # Considerar mostrar error al usuario o desactivar OCR en la app principal
 
     # --- Configurar RUTA A TESSERACT.EXE (Opción B - ACTIVADA) ---
     # Asume que la carpeta de Tesseract se copia a una subcarpeta 'tesseract' en el bundle
     # usando --add-data "C:/Program Files/Tesseract-OCR;tesseract"
     tesseract_exe_bundle_path = os.path.join(bundle_dir, 'tesseract', 'tesseract.exe')
-    print(f"Buscando tesseract.exe empaquetado en: {tesseract_exe_bundle_path}")
+    logger.debug("Buscando tesseract.exe empaquetado en: %s", tesseract_exe_bundle_path)
 
     # ===> ESTA ES LA PARTE MODIFICADA Y ACTIVADA <===
     if os.path.exists(tesseract_exe_bundle_path):
         if pytesseract: # Solo si pytesseract se importó correctamente
             # Establecer la ruta al ejecutable que pytesseract debe usar
             pytesseract.pytesseract.tesseract_cmd = tesseract_exe_bundle_path
-            print(f"Ruta de tesseract_cmd establecida a (empaquetado): {tesseract_exe_bundle_path}")
+            logger.info("Ruta de tesseract_cmd establecida a (empaquetado): %s", tesseract_exe_bundle_path)
     else:
         # Si no se encuentra el ejecutable empaquetado, el OCR no funcionará.
-        print(f"ERROR CRÍTICO: tesseract.exe no encontrado en {tesseract_exe_bundle_path}. "
-              "Asegúrate de incluirlo correctamente con --add-data 'RUTA/TESSERACT;tesseract'. El OCR no funcionará.")
+        logger.critical("tesseract.exe no encontrado en %s. Asegúrate de incluirlo correctamente con "
+                        "--add-data 'RUTA/TESSERACT;tesseract'. El OCR no funcionará.", tesseract_exe_bundle_path)
         # Podrías establecer pytesseract a None aquí para desactivarlo completamente si falla
         # pytesseract = None
     # ===> FIN DE LA PARTE MODIFICADA Y ACTIVADA <===
 
 elif pytesseract:
     # Modo Script Python (ejecutando .py directamente)
-    print("Modo script Python detectado.")
+    logger.debug("Modo script Python detectado.")
     # Aquí puedes mantener tu configuración local si es necesaria (opcional)
     # tesseract_local_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
     # if os.path.exists(tesseract_local_path):
@@ -89,115 +108,492 @@ elif pytesseract:
     #     print(f"Tesseract no encontrado en ruta local: {tesseract_local_path}. Usando PATH.")
     # tessdata_config sigue vacío, usará la configuración por defecto de Tesseract
 
+# --- Patrones y configuración del OCR ---
+# AJUSTA ESTE PATRÓN SEGÚN TUS GUÍAS: prefijo y mínimo de dígitos tras él
+PREFIJO_GUIA = "770"
+MIN_DIGITOS_TRAS_PREFIJO = 10
+# Número de guía completo (sin anclas); lo comparten el OCR, la caché y la carpeta vigilada
+PATRON_NUMERO_GUIA = rf'{PREFIJO_GUIA}\d{{{MIN_DIGITOS_TRAS_PREFIJO},}}'
+PATRON_GUIA = re.compile(rf'\b({PATRON_NUMERO_GUIA})\b')
+# Mismo patrón en la sintaxis de user-patterns de Tesseract (\d = un dígito)
+PATRONES_TESSERACT = [PREFIJO_GUIA + "\\d" * n
+                      for n in range(MIN_DIGITOS_TRAS_PREFIJO, MIN_DIGITOS_TRAS_PREFIJO + 3)]
+
+# OCR dirigido: reconocer solo recortes candidatos antes que la página completa
+OCR_DIRIGIDO = True
+OCR_DIRIGIDO_PSM = 7  # Tesseract PSM 7: una sola línea de texto
+OCR_DIRIGIDO_VARIABLES = {"tessedit_char_whitelist": "0123456789"}
+# Sin motor persistente (pytesseract) cada llamada arranca un proceso
+# `tesseract`: los recortes se apilan en una sola imagen y se reconocen de
+# una vez como bloque de texto (PSM 6)
+OCR_DIRIGIDO_PSM_APILADO = 6
+# Separación vertical entre recortes apilados (px)
+OCR_DIRIGIDO_SEPARACION = 24
+
+# Versión del pipeline de extracción: incrementar al cambiar la lógica de
+# barcode/OCR para invalidar los resultados guardados en result_cache
+PIPELINE_VERSION = 2
+
+_ruta_patrones_guia = None
+
+
+def pipeline_signature() -> str:
+    """
+    Firma de la configuración actual del pipeline de extracción.
+
+    Cambia si cambia la versión, el patrón de guía, la configuración del OCR
+    dirigido o los motores disponibles, de modo que la caché de resultados
+    no devuelva números obtenidos con otra configuración.
+    """
+    partes = [
+        f"v{PIPELINE_VERSION}",
+        PATRON_GUIA.pattern,
+        f"dirigido={OCR_DIRIGIDO}:{OCR_DIRIGIDO_PSM}:{OCR_DIRIGIDO_PSM_APILADO}:"
+        f"{sorted(OCR_DIRIGIDO_VARIABLES.items())}",
+        f"pyzbar={bool(pyzbar)}",
+        f"numpy={barcode_locator.np is not None}",
+        f"ocr={'tesserocr' if ocr_engine.tesserocr else ''}+{'pytesseract' if pytesseract else ''}",
+    ]
+    return hashlib.sha1("|".join(partes).encode('utf-8')).hexdigest()[:16]
+
+
+def _guide_patterns_file() -> str:
+    """Escribe (una vez por proceso) el archivo de user-patterns de Tesseract."""
+    global _ruta_patrones_guia
+    if _ruta_patrones_guia is None:
+        ruta = os.path.join(tempfile.gettempdir(), "lectorcode_guias.patterns")
+        # Escritura atómica: varios procesos del pool pueden llegar a la vez
+        ruta_tmp = f"{ruta}.{os.getpid()}.tmp"
+        with open(ruta_tmp, 'w', encoding='utf-8') as f:
+            f.write("\n".join(PATRONES_TESSERACT) + "\n")
+        os.replace(ruta_tmp, ruta)
+        _ruta_patrones_guia = ruta
+    return _ruta_patrones_guia
+
+
+def _find_guide_number(text: str) -> str | None:
+    """Busca el número de guía en un texto reconocido por OCR."""
+    matches = PATRON_GUIA.findall(text)
+    if not matches:
+        # El OCR de una línea de dígitos puede partir el número con espacios
+        matches = PATRON_GUIA.findall(re.sub(r'[ \t]+', '', text))
+    if matches:
+        return "".join(filter(str.isalnum, matches[0]))
+    return None
+
+
+# ==========================================
+# ===== Imagen decodificada compartida =====
+# ==========================================
+
+class ScanPage:
+    """Una página del escaneo en escala de grises, con sus regiones de código de barras."""
+
+    def __init__(self, number: int, gray: "Image.Image"):
+        self.number = number  # Empezando en 1
+        self.gray = gray
+        self._barcode_regions = None
+
+    @property
+    def barcode_regions(self) -> list:
+        """Regiones candidatas a código de barras (calculadas una sola vez)."""
+        if self._barcode_regions is None:
+            self._barcode_regions = barcode_locator.locate_barcode_regions(self.gray)
+        return self._barcode_regions
+
+    def close(self) -> None:
+        self.gray.close()
+
+
+class DecodedScan:
+    """
+    Escaneo decodificado una sola vez y compartido por barcode y OCR.
+
+    Los TIFF de varias páginas se recorren de forma perezosa con
+    ImageSequence: cada página se decodifica (y se pasa a escala de grises)
+    la primera vez que `pages()` llega a ella y se guarda para las pasadas
+    siguientes, de modo que si el número aparece en la página 2 la página 3
+    nunca se decodifica. Usar como context manager para liberar el archivo y
+    la memoria al terminar:
+
+        with DecodedScan(ruta) as scan:
+            extract_barcode(ruta, scan)
+            extract_text_ocr(ruta, scan)
+
+    Si se pasan los bytes del archivo ya leídos (p. ej. por io_prefetch),
+    se decodifican desde memoria y el archivo no se vuelve a abrir.
+    """
+
+    def __init__(self, image_path: str, data: bytes | None = None):
+        self.image_path = image_path
+        self.data = data
+        self._source = None
+        self._frames = None
+        self._pages: list[ScanPage] = []
+        # Tiempo acumulado leyendo y decodificando páginas (s)
+        self.decode_seconds = 0.0
+
+    def __enter__(self) -> "DecodedScan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def pages(self):
+        """
+        Genera las páginas en orden, decodificando cada una solo al llegar a ella.
+
+        Un error al decodificar la primera página se propaga; en las
+        siguientes se avisa y se da el recorrido por terminado.
+        """
+        yield from self._pages
+        while True:
+            if self._frames is None and self._source is not None:
+                return  # Ya se llegó a la última página (o la anterior falló)
+            numero = len(self._pages) + 1
+            inicio = time.perf_counter()
+            try:
+                if self._source is None:
+                    self._source = Image.open(io.BytesIO(self.data) if self.data is not None
+                                              else self.image_path)
+                    self._frames = ImageSequence.Iterator(self._source)
+                frame = next(self._frames)
+                # convert() decodifica el fotograma y devuelve una copia
+                # independiente del archivo, que puede seguir avanzando
+                gray = frame.convert('L') if frame.mode != 'L' else frame.copy()
+            except StopIteration:
+                self._frames = None
+                return
+            except Exception as e:
+                self._frames = None
+                if numero == 1:
+                    raise
+                logger.warning("No se pudo decodificar la página %d de %s: %s",
+                               numero, os.path.basename(self.image_path), e)
+                return
+            finally:
+                self.decode_seconds += time.perf_counter() - inicio
+            page = ScanPage(numero, gray)
+            self._pages.append(page)
+            yield page
+
+    def close(self) -> None:
+        """Cierra el archivo y libera las páginas decodificadas."""
+        for page in self._pages:
+            page.close()
+        self._pages = []
+        self._frames = None
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+        self.data = None
+
+
+def _scan_context(image_path: str, scan: "DecodedScan | None"):
+    """Reutiliza `scan` si se proporcionó; si no, abre uno propio que se cerrará al salir."""
+    if scan is not None:
+        return contextlib.nullcontext(scan)
+    return DecodedScan(image_path)
+
+
 # ==========================================
 # ===== Funciones de Procesamiento =====
 # ==========================================
 
-def extract_barcode(image_path: str) -> str | None:
-    """Intenta leer un código de barras desde un archivo de imagen."""
+def _first_guide_barcode(barcodes: list) -> tuple[str | None, str | None]:
+    """
+    Separa, entre los códigos leídos por pyzbar, el primero con forma de guía.
+
+    Returns:
+        (código con forma de número de guía o None, primer código leído o None)
+    """
+    primero = None
+    for barcode in barcodes:
+        texto = barcode.data.decode('utf-8', errors='replace')
+        if PATRON_GUIA.search(texto):
+            return texto, primero or texto
+        primero = primero or texto
+    return None, primero
+
+
+def _decode_page_barcodes(page: ScanPage) -> tuple[str | None, str | None]:
+    """
+    Lee los códigos de barras de una página.
+
+    Primero se decodifican solo los recortes donde barcode_locator detecta
+    un código; si ninguno tiene forma de número de guía se analiza la
+    página completa como último recurso.
+
+    Args:
+        page: Página decodificada.
+
+    Returns:
+        (código con forma de número de guía o None, primer código leído o None)
+    """
+    gray = page.gray
+    primero = None
+    for caja in page.barcode_regions:
+        with gray.crop(caja) as recorte:
+            guia, otro = _first_guide_barcode(pyzbar.decode(recorte))
+        if guia:
+            logger.debug("Código de barras localizado en la región %s.", caja)
+            return guia, primero or guia
+        primero = primero or otro
+
+    logger.debug("Sin número de guía en las regiones candidatas, analizando página completa.")
+    guia, otro = _first_guide_barcode(pyzbar.decode(gray))
+    return guia, primero or otro
+
+
+def extract_barcode(image_path: str, scan: DecodedScan | None = None) -> str | None:
+    """
+    Intenta leer un código de barras desde un archivo de imagen.
+
+    En archivos de varias páginas se recorren las páginas en orden y se
+    para en la primera con un código con forma de número de guía. Si
+    ninguna lo tiene, se devuelve el primer código leído (como con una
+    sola página).
+
+    Si se pasa `scan`, se reutiliza la imagen ya decodificada en lugar de
+    volver a abrir el archivo.
+    """
     if not pyzbar:
-        print("Intento de usar extract_barcode, pero pyzbar no está disponible.")
+        logger.warning("Intento de usar extract_barcode, pero pyzbar no está disponible.")
         return None
     try:
-        print(f"Intentando leer código de barras de: {os.path.basename(image_path)}")
-        img = Image.open(image_path)
-        barcodes = pyzbar.decode(img)
-        if barcodes:
-            barcode_data = barcodes[0].data
-            barcode_string = barcode_data.decode('utf-8')
-            print(f"  Código de barras encontrado: {barcode_string}")
-            return barcode_string
+        logger.debug("Intentando leer código de barras de: %s", image_path)
+        primero = None
+        with _scan_context(image_path, scan) as scan_actual:
+            for page in scan_actual.pages():
+                guia, otro = _decode_page_barcodes(page)
+                if guia:
+                    logger.debug("Código de barras encontrado en la página %d: %s", page.number, guia)
+                    return guia
+                primero = primero or otro
+        if primero:
+            logger.debug("Código de barras encontrado: %s", primero)
+            return primero
         else:
-            print("  No se encontraron códigos de barras.")
+            logger.debug("No se encontraron códigos de barras.")
             return None
     except FileNotFoundError:
-         print(f"Error en extract_barcode: Archivo no encontrado - {image_path}")
+         logger.error("Error en extract_barcode: Archivo no encontrado - %s", image_path)
          return None
     except Exception as e:
-        print(f"Error inesperado en extract_barcode para {os.path.basename(image_path)}: {e}")
+        logger.error("Error inesperado en extract_barcode para %s: %s", os.path.basename(image_path), e)
+        return None
+
+
+def _targeted_crop(gray: "Image.Image", caja) -> "Image.Image":
+    """Recorte de una región candidata, ampliado si sus caracteres son pequeños."""
+    recorte = gray.crop(caja)
+    # Tesseract rinde mejor con caracteres de ~30 px de alto
+    if recorte.height < 40:
+        with recorte:
+            return recorte.resize((recorte.width * 2, recorte.height * 2), Image.BICUBIC)
+    return recorte
+
+
+def _stack_crops(gray: "Image.Image", candidatas) -> "Image.Image":
+    """Apila los recortes candidatos, uno debajo de otro, sobre fondo blanco."""
+    recortes = [_targeted_crop(gray, caja) for caja in candidatas]
+    try:
+        ancho = max(r.width for r in recortes) + 2 * OCR_DIRIGIDO_SEPARACION
+        alto = sum(r.height for r in recortes) + (len(recortes) + 1) * OCR_DIRIGIDO_SEPARACION
+        apilada = Image.new('L', (ancho, alto), 255)
+        y = OCR_DIRIGIDO_SEPARACION
+        for recorte in recortes:
+            apilada.paste(recorte, (OCR_DIRIGIDO_SEPARACION, y))
+            y += recorte.height + OCR_DIRIGIDO_SEPARACION
+        return apilada
+    finally:
+        for recorte in recortes:
+            recorte.close()
+
+
+def _extract_text_ocr_targeted(page: ScanPage) -> str | None:
+    """
+    OCR de una sola línea, solo dígitos, sobre las regiones candidatas.
+
+    Se prueban primero las bandas contiguas a los códigos de barras detectados
+    (donde suele imprimirse el número) y después las líneas de texto cercanas.
+    Con un motor no persistente (pytesseract) los recortes se reconocen en
+    una única llamada, apilados, en lugar de un proceso por recorte.
+
+    Args:
+        page: Página decodificada.
+
+    Returns:
+        Número de guía encontrado o None.
+    """
+    gray = page.gray
+    regiones_bc = page.barcode_regions
+    candidatas = text_locator.regions_near_barcodes(regiones_bc, gray.size)
+    candidatas += text_locator.locate_text_lines(gray, near=regiones_bc)
+    if not candidatas:
         return None
 
+    engine = ocr_engine.get_engine(
+        'spa', tessdata_dir, tessdata_config,
+        init_variables={"user_patterns_file": _guide_patterns_file()},
+    )
+    logger.debug("OCR dirigido con motor '%s' sobre %d regiones", engine.name, len(candidatas))
+    if not engine.persistent:
+        with _stack_crops(gray, candidatas) as apilada:
+            text = engine.image_to_string(apilada, OCR_DIRIGIDO_PSM_APILADO, OCR_DIRIGIDO_VARIABLES)
+        return _find_guide_number(text)
+    for caja in candidatas:
+        with _targeted_crop(gray, caja) as recorte:
+            text = engine.image_to_string(recorte, OCR_DIRIGIDO_PSM, OCR_DIRIGIDO_VARIABLES)
+        numero = _find_guide_number(text)
+        if numero:
+            return numero
+    return None
 
-def extract_text_ocr(image_path: str) -> str | None:
-    """Intenta extraer texto usando Tesseract OCR."""
-    global tessdata_config # Usar la configuración global para tessdata
 
-    if not pytesseract:
-        print("Intento de usar extract_text_ocr, pero pytesseract no está disponible.")
+def extract_text_ocr(image_path: str, scan: DecodedScan | None = None) -> str | None:
+    """
+    Intenta extraer texto usando Tesseract OCR.
+
+    Primero reconoce solo recortes candidatos (cerca del código de barras o
+    líneas de texto) con una sola línea y lista blanca de dígitos; si no
+    encuentra el número, hace OCR de la página completa. En archivos de
+    varias páginas cada pasada recorre las páginas en orden y se detiene en
+    la primera que da un número de guía.
+
+    Si se pasa `scan`, se reutiliza la imagen ya decodificada en lugar de
+    volver a abrir el archivo.
+    """
+    global tessdata_config, tessdata_dir # Usar la configuración global para tessdata
+
+    if not ocr_engine.is_available():
+        logger.warning("Intento de usar extract_text_ocr, pero ni tesserocr ni pytesseract están disponibles.")
         return None
 
     # Verificar si el comando tesseract se pudo establecer (útil para debug)
-    tesseract_command = getattr(pytesseract.pytesseract, 'tesseract_cmd', 'No establecido (usará PATH)')
-    print(f"  Usando tesseract_cmd: {tesseract_command}")
+    tesseract_command = 'No establecido (usará PATH)'
+    if pytesseract:
+        tesseract_command = getattr(pytesseract.pytesseract, 'tesseract_cmd', tesseract_command)
 
     try:
-        print(f"Intentando OCR en: {os.path.basename(image_path)}")
-        img = Image.open(image_path)
-
-        # --- Ejecutar Tesseract OCR ---
-        print(f"  Ejecutando image_to_string con config: '{tessdata_config}'")
-        # La ruta a tesseract.exe la toma de pytesseract.tesseract_cmd si fue establecida
-        text = pytesseract.image_to_string(img, lang='spa', config=tessdata_config)
-
-        # --- Buscar el Número de Guía en el Texto ---
-        import re
-        # AJUSTA ESTE PATRÓN SEGÚN TUS GUÍAS
-        patron_guia = re.compile(r'\b(770\d{10,})\b')
-        matches = patron_guia.findall(text)
-
-        if matches:
-            numero_encontrado = matches[0]
-            numero_encontrado_limpio = "".join(filter(str.isalnum, numero_encontrado))
-            print(f"  Patrón de número de guía encontrado: {numero_encontrado_limpio}")
-            return numero_encontrado_limpio
-        else:
-            print("  No se encontró un patrón de número de guía en el texto OCR.")
-            return None
+        logger.debug("Intentando OCR en: %s", image_path)
+        with _scan_context(image_path, scan) as scan_actual:
+            # --- 1. OCR dirigido sobre recortes candidatos ---
+            if OCR_DIRIGIDO:
+                for page in scan_actual.pages():
+                    numero_encontrado = _extract_text_ocr_targeted(page)
+                    if numero_encontrado:
+                        logger.debug("Patrón de número de guía encontrado (OCR dirigido, página %d): %s",
+                                     page.number, numero_encontrado)
+                        return numero_encontrado
+                logger.debug("OCR dirigido sin resultado, escalando a página completa.")
+
+            # --- 2. Ejecutar Tesseract OCR sobre la página completa ---
+            # Motor persistente del hilo/proceso actual (tesserocr o pytesseract)
+            engine = ocr_engine.get_engine('spa', tessdata_dir, tessdata_config)
+            logger.debug("Ejecutando OCR con motor '%s'", engine.name)
+            for page in scan_actual.pages():
+                text = engine.image_to_string(page.gray)
+
+                # --- Buscar el Número de Guía en el Texto ---
+                numero_encontrado = _find_guide_number(text)
+                if numero_encontrado:
+                    logger.debug("Patrón de número de guía encontrado (página %d): %s",
+                                 page.number, numero_encontrado)
+                    return numero_encontrado
+
+        logger.debug("No se encontró un patrón de número de guía en el texto OCR.")
+        return None
 
     except FileNotFoundError:
-         print(f"Error en extract_text_ocr: Archivo no encontrado - {image_path}")
+         logger.error("Error en extract_text_ocr: Archivo no encontrado - %s", image_path)
          return None
-    except pytesseract.TesseractNotFoundError as tess_error:
+    except _TesseractNotFoundError as tess_error:
         # Este error es común si tesseract_cmd no es correcto o tesseract no está accesible
-        print(f"Error Crítico en extract_text_ocr: TesseractNotFoundError - {tess_error}. "
-              f"Verifica la ruta establecida para tesseract_cmd ('{tesseract_command}') y "
-              "asegúrate que el ejecutable y sus dependencias fueron incluidos correctamente.")
+        logger.critical("Error en extract_text_ocr: TesseractNotFoundError - %s. "
+                        "Verifica la ruta establecida para tesseract_cmd ('%s') y asegúrate que el "
+                        "ejecutable y sus dependencias fueron incluidos correctamente.",
+                        tess_error, tesseract_command)
         return None
     except Exception as e:
         # Capturar otros errores inesperados durante el OCR
-        print(f"Error inesperado durante OCR en {os.path.basename(image_path)}: {e}")
-        # import traceback; traceback.print_exc() # Útil para depuración avanzada
+        logger.error("Error inesperado durante OCR en %s: %s", os.path.basename(image_path), e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         return None
 
 
-def get_guide_number(image_path: str) -> str | None:
-    """Función principal: Intenta barcode y luego OCR."""
-    print(f"Obteniendo número de guía para: {os.path.basename(image_path)}")
-
-    # 1. Intentar Código de Barras
-    if pyzbar:
-        numero_guia_bc = extract_barcode(image_path)
-        if numero_guia_bc:
-            print("--> Número obtenido por Código de Barras.")
-            return numero_guia_bc
-        else:
-            print("  Código de barras no encontrado o ilegible.")
-    else:
-        print("  Librería pyzbar no disponible.")
+@contextlib.contextmanager
+def _timed_stage(scan: DecodedScan, timings: dict, stage: str):
+    """Suma a `timings[stage]` el tiempo del bloque, sin contar la decodificación."""
+    inicio = time.perf_counter()
+    decodificado = scan.decode_seconds
+    try:
+        yield
+    finally:
+        transcurrido = time.perf_counter() - inicio
+        timings[stage] += transcurrido - (scan.decode_seconds - decodificado)
 
-    # 2. Intentar OCR
-    if pytesseract:
-        print("  Intentando con OCR...")
-        numero_guia_ocr = extract_text_ocr(image_path)
-        if numero_guia_ocr:
-            print("--> Número obtenido por OCR.")
-            return numero_guia_ocr
-        else:
-            print("  OCR falló o no encontró el patrón.")
-    else:
-        print("  Librería pytesseract no disponible.")
 
-    print("==> No se pudo obtener el número de guía por ningún método.")
-    return None
+def get_guide_number_detailed(image_path: str, data: bytes | None = None) -> dict:
+    """
+    Función principal: Intenta barcode y luego OCR, midiendo cada etapa.
+
+    La imagen se lee y decodifica una sola vez y se comparte entre ambos
+    métodos; el archivo se cierra al terminar, haya resultado o no. En un
+    TIFF de varias páginas se busca el código de barras en todas las páginas
+    antes de recurrir al OCR.
+
+    Args:
+        image_path: Ruta del archivo (para los mensajes y si no hay `data`).
+        data: Contenido del archivo ya leído; si se indica, se decodifica
+            desde memoria sin abrir el archivo.
+
+    Returns:
+        Diccionario con:
+        - "guide_number": número encontrado o None.
+        - "method": "barcode", "ocr" o None.
+        - "timings": segundos de las etapas "decode", "barcode" y "ocr"
+          (la decodificación se descuenta de las otras dos).
+    """
+    logger.debug("Obteniendo número de guía para: %s", image_path)
+    tiempos = {"decode": 0.0, "barcode": 0.0, "ocr": 0.0}
+    detalle = {"guide_number": None, "method": None, "timings": tiempos}
 
-# --- Fin del archivo src/core/image_processor.py ---
\ No newline at end of file
+    with DecodedScan(image_path, data) as scan:
+        try:
+            # 1. Intentar Código de Barras
+            if pyzbar:
+                with _timed_stage(scan, tiempos, "barcode"):
+                    numero_guia_bc = extract_barcode(image_path, scan)
+                if numero_guia_bc:
+                    logger.debug("--> Número obtenido por Código de Barras.")
+                    detalle.update(guide_number=numero_guia_bc, method="barcode")
+                    return detalle
+                else:
+                    logger.debug("Código de barras no encontrado o ilegible.")
+            else:
+                logger.debug("Librería pyzbar no disponible.")
+
+            # 2. Intentar OCR
+            if ocr_engine.is_available():
+                logger.debug("Intentando con OCR...")
+                with _timed_stage(scan, tiempos, "ocr"):
+                    numero_guia_ocr = extract_text_ocr(image_path, scan)
+                if numero_guia_ocr:
+                    logger.debug("--> Número obtenido por OCR.")
+                    detalle.update(guide_number=numero_guia_ocr, method="ocr")
+                    return detalle
+                else:
+                    logger.debug("OCR falló o no encontró el patrón.")
+            else:
+                logger.debug("Ningún motor de OCR disponible (tesserocr/pytesseract).")
+        finally:
+            tiempos["decode"] = scan.decode_seconds
+
+    logger.debug("==> No se pudo obtener el número de guía por ningún método.")
+    return detalle
+
+
+def get_guide_number(image_path: str) -> str | None:
+    """Función principal: Intenta barcode y luego OCR. Devuelve solo el número."""
+    return get_guide_number_detailed(image_path)["guide_number"]
@@ -0,0 +1,212 @@
+# src/core/io_prefetch.py
+"""
+Lectura anticipada de archivos para lotes en carpetas de red.
+
+En una carpeta compartida (SMB/NFS) leer un escaneo cuesta varios viajes
+por la red, y mientras tanto la decodificación y el OCR esperan. Este
+módulo lee con un pool de hilos los bytes de los próximos archivos del
+lote mientras se procesan los anteriores, de modo que la extracción
+encuentra los datos ya en memoria y la latencia de red se solapa con el
+tiempo de Tesseract.
+
+La memoria está acotada: no se inicia una lectura nueva mientras los bytes
+leídos y aún no consumidos alcancen `max_bytes` (el exceso se limita a las
+lecturas ya en curso, como mucho `workers` archivos), y como mucho se
+adelantan `lookahead` archivos. Si quien consume guarda los bytes un tiempo
+(p. ej. mientras un proceso del pool los decodifica), puede pasar su propio
+búfer a prefetch_iter: entonces siguen contando en el límite hasta que los
+devuelve con release().
+
+Uso:
+    for item, data in prefetch_iter(items, path_of=lambda item: item.path):
+        ...  # data son los bytes del archivo, o None si no se leyó
+"""
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Límite por defecto de bytes leídos y aún no consumidos
+MAX_BYTES_POR_DEFECTO = 256 * 1024 * 1024
+# Hilos de lectura (lecturas de red simultáneas)
+HILOS_POR_DEFECTO = 4
+# Archivos que se adelantan como máximo
+ANTICIPACION_POR_DEFECTO = 16
+# Variable de entorno para desactivar la lectura anticipada (p. ej. en disco local)
+VARIABLE_DESACTIVAR = "LECTORCODE_PREFETCH"
+
+T = TypeVar("T")
+
+
+def is_enabled() -> bool:
+    """False si LECTORCODE_PREFETCH=0 desactiva la lectura anticipada."""
+    return os.environ.get(VARIABLE_DESACTIVAR, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def read_file(path: str) -> Optional[bytes]:
+    """Contenido completo de un archivo, o None si no se pudo leer."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        logger.debug("Lectura de '%s' fallida: %s", path, e)
+        return None
+
+
+class _Lectura:
+    """Lectura pendiente, en curso o terminada de un archivo."""
+
+    __slots__ = ("path", "future", "size")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.future: Optional[Future] = None
+        self.size = 0
+
+
+class ReadAheadBuffer:
+    """
+    Lee archivos en segundo plano, en orden de llegada y con memoria acotada.
+
+    prefetch() encola la lectura de un archivo y take() devuelve sus bytes,
+    esperando si aún se están leyendo. Las lecturas se inician en el mismo
+    orden en que se encolan, así que consumir en ese orden nunca se bloquea
+    por el límite de memoria.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES_POR_DEFECTO, workers: int = HILOS_POR_DEFECTO):
+        self.max_bytes = max_bytes
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="lectura-anticipada")
+        self._lock = threading.Lock()
+        self._esperando: Deque[_Lectura] = deque()
+        self._leyendo = 0
+        self._bytes = 0  # Leídos y aún no consumidos
+        self._cerrado = False
+
+    def __enter__(self) -> "ReadAheadBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def prefetch(self, path: str) -> _Lectura:
+        """Encola la lectura de un archivo y devuelve su identificador para take()."""
+        lectura = _Lectura(path)
+        with self._lock:
+            self._esperando.append(lectura)
+            self._start_reads()
+        return lectura
+
+    def take(self, lectura: _Lectura, hold: bool = False) -> Optional[bytes]:
+        """
+        Devuelve los bytes de un archivo encolado y libera su memoria del búfer.
+
+        Args:
+            lectura: Identificador devuelto por prefetch().
+            hold: Si es True, los bytes siguen contando en el límite hasta
+                que quien llama los devuelva con release(len(data)).
+
+        Returns:
+            El contenido, o None si no se pudo leer (quien llama debe abrir
+            el archivo por su cuenta para obtener el error real).
+        """
+        with self._lock:
+            if lectura.future is None:
+                # Aún no se inició (límite de memoria): leer aquí mismo
+                try:
+                    self._esperando.remove(lectura)
+                except ValueError:
+                    pass
+                futuro = None
+            else:
+                futuro = lectura.future
+        data = futuro.result() if futuro is not None else read_file(lectura.path)
+        with self._lock:
+            if not hold:
+                self._bytes -= lectura.size
+            elif futuro is None and data is not None:
+                self._bytes += len(data)  # Leído aquí: también cuenta hasta release()
+            lectura.size = 0
+            self._start_reads()
+        return data
+
+    def release(self, size: int) -> None:
+        """Devuelve al límite los bytes entregados con take(hold=True)."""
+        with self._lock:
+            self._bytes -= size
+            self._start_reads()
+
+    def close(self) -> None:
+        """Descarta las lecturas pendientes y detiene los hilos."""
+        with self._lock:
+            self._cerrado = True
+            self._esperando.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start_reads(self) -> None:
+        """Inicia lecturas mientras haya hilos libres y memoria (con el lock tomado)."""
+        while (self._esperando and not self._cerrado and self._leyendo < self.workers
+               and self._bytes < self.max_bytes):
+            lectura = self._esperando.popleft()
+            self._leyendo += 1
+            lectura.future = self._executor.submit(self._read_for_buffer, lectura)
+
+    def _read_for_buffer(self, lectura: _Lectura) -> Optional[bytes]:
+        data = read_file(lectura.path)
+        with self._lock:
+            self._leyendo -= 1
+            if data is not None:
+                lectura.size = len(data)
+                self._bytes += lectura.size
+            self._start_reads()
+        return data
+
+
+def prefetch_iter(items: Iterable[T], path_of: Callable[[T], Optional[str]],
+                  max_bytes: int = MAX_BYTES_POR_DEFECTO, workers: int = HILOS_POR_DEFECTO,
+                  lookahead: int = ANTICIPACION_POR_DEFECTO,
+                  buffer: Optional[ReadAheadBuffer] = None) -> Iterator[Tuple[T, Optional[bytes]]]:
+    """
+    Recorre `items` en orden entregando con cada uno los bytes de su archivo.
+
+    `items` se consume por delante, hasta `lookahead` elementos, en el hilo
+    que recorre este generador; `path_of` indica qué archivo leer para cada
+    elemento (None = ninguno, p. ej. porque su resultado ya está en caché).
+
+    Con `buffer` (creado y cerrado por quien llama; `max_bytes` y `workers`
+    se ignoran) los bytes entregados siguen contando en su límite hasta que
+    se devuelven con buffer.release(len(data)).
+
+    Yields:
+        Tuplas (elemento, bytes); bytes es None si no hubo que leer nada o
+        la lectura falló.
+    """
+    lookahead = max(1, lookahead)
+    propio = buffer is None
+    if propio:
+        buffer = ReadAheadBuffer(max_bytes, workers)
+    try:
+        cola: Deque[Tuple[T, Optional[_Lectura]]] = deque()
+        fuente = iter(items)
+        agotado = False
+        while True:
+            while not agotado and len(cola) < lookahead:
+                try:
+                    item = next(fuente)
+                except StopIteration:
+                    agotado = True
+                    break
+                path = path_of(item)
+                cola.append((item, buffer.prefetch(path) if path else None))
+            if not cola:
+                return
+            item, lectura = cola.popleft()
+            yield item, buffer.take(lectura, hold=not propio) if lectura else None
+    finally:
+        if propio:
+            buffer.close()
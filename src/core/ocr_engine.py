@@ -0,0 +1,194 @@
+# src/core/ocr_engine.py
+"""
+Motores de OCR intercambiables detrás de una misma interfaz.
+
+pytesseract lanza un proceso `tesseract` nuevo por imagen y recarga el
+modelo de idioma cada vez. Cuando tesserocr (binding de la API C de
+Tesseract) está instalado, se usa un motor persistente que carga el modelo
+una sola vez por hilo/proceso worker y lo reutiliza para todas las imágenes.
+Si tesserocr no está disponible o no logra inicializarse, se usa pytesseract
+como respaldo, con el mismo comportamiento de siempre.
+"""
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Binding en proceso de la API de Tesseract (opcional)
+    import tesserocr
+except ImportError:
+    tesserocr = None
+except ValueError as e:
+    # cysignals (dependencia de tesserocr) instala manejadores de señales al
+    # importarse, lo que solo se permite en el hilo principal
+    logger.warning("No se pudo importar tesserocr (%s); importa este módulo desde el "
+                   "hilo principal. Se usará pytesseract.", e)
+    tesserocr = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+
+class OcrEngine:
+    """Interfaz común de los motores de OCR."""
+
+    name = "base"
+    # True si el modelo queda cargado entre llamadas (cada llamada es barata)
+    persistent = False
+
+    def image_to_string(self, image, psm: Optional[int] = None,
+                        variables: Optional[Dict[str, str]] = None) -> str:
+        """
+        Reconoce el texto de una imagen.
+
+        Args:
+            image: Imagen PIL a reconocer.
+            psm: Modo de segmentación de página de Tesseract (None = por defecto).
+            variables: Variables de Tesseract solo para esta llamada,
+                p. ej. {'tessedit_char_whitelist': '0123456789'}.
+
+        Returns:
+            Texto reconocido.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libera los recursos del motor."""
+
+
+class TesserocrEngine(OcrEngine):
+    """Motor persistente: el modelo se carga una vez y se reutiliza."""
+
+    name = "tesserocr"
+    persistent = True
+
+    def __init__(self, lang: str, tessdata_dir: Optional[str] = None,
+                 init_variables: Optional[Dict[str, str]] = None):
+        """
+        Inicializa la API de Tesseract y carga el modelo de idioma.
+
+        Args:
+            lang: Idioma(s) de Tesseract, p. ej. 'spa'.
+            tessdata_dir: Carpeta tessdata; None para usar la del sistema.
+            init_variables: Variables que solo se leen al cargar el modelo
+                (p. ej. 'user_patterns_file').
+
+        Raises:
+            RuntimeError: Si Tesseract no puede cargar el idioma.
+        """
+        kwargs = {"lang": lang}
+        if tessdata_dir:
+            kwargs["path"] = tessdata_dir
+        if init_variables:
+            kwargs["variables"] = dict(init_variables)
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+        self._psm_default = self._api.GetPageSegMode()
+        self._valores_originales: Dict[str, str] = {}
+
+    def _apply_variables(self, variables: Dict[str, str]) -> None:
+        """Aplica las variables pedidas y restaura las de llamadas anteriores."""
+        for nombre in list(self._valores_originales):
+            if nombre not in variables:
+                self._api.SetVariable(nombre, self._valores_originales.pop(nombre))
+        for nombre, valor in variables.items():
+            if nombre not in self._valores_originales:
+                self._valores_originales[nombre] = self._api.GetVariableAsString(nombre) or ''
+            self._api.SetVariable(nombre, str(valor))
+
+    def image_to_string(self, image, psm: Optional[int] = None,
+                        variables: Optional[Dict[str, str]] = None) -> str:
+        self._apply_variables(variables or {})
+        self._api.SetPageSegMode(self._psm_default if psm is None else psm)
+        self._api.SetImage(image)
+        try:
+            return self._api.GetUTF8Text()
+        finally:
+            self._api.Clear()
+
+    def close(self) -> None:
+        self._api.End()
+
+
+class PytesseractEngine(OcrEngine):
+    """Motor de respaldo: un proceso `tesseract` por imagen vía pytesseract."""
+
+    name = "pytesseract"
+
+    def __init__(self, lang: str, config: str = '',
+                 init_variables: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            lang: Idioma(s) de Tesseract, p. ej. 'spa'.
+            config: Opciones extra para la línea de comandos de tesseract.
+            init_variables: Variables añadidas a cada llamada con '-c'.
+        """
+        self.lang = lang
+        self.config = config
+        for nombre, valor in (init_variables or {}).items():
+            self.config += f' -c {nombre}="{valor}"'
+
+    def image_to_string(self, image, psm: Optional[int] = None,
+                        variables: Optional[Dict[str, str]] = None) -> str:
+        config = self.config
+        if psm is not None:
+            config += f' --psm {psm}'
+        for nombre, valor in (variables or {}).items():
+            config += f' -c {nombre}={valor}'
+        # La ruta a tesseract.exe la toma de pytesseract.tesseract_cmd si fue establecida
+        return pytesseract.image_to_string(image, lang=self.lang, config=config)
+
+
+# Un motor por hilo: la API de Tesseract no es segura entre hilos. En el pool
+# de procesos cada worker tiene su propio módulo y, por tanto, su propio motor.
+_local = threading.local()
+
+
+def is_available() -> bool:
+    """Indica si hay algún motor de OCR utilizable."""
+    return tesserocr is not None or pytesseract is not None
+
+
+def get_engine(lang: str = 'spa', tessdata_dir: Optional[str] = None,
+               pytesseract_config: str = '',
+               init_variables: Optional[Dict[str, str]] = None) -> Optional[OcrEngine]:
+    """
+    Devuelve el motor de OCR del hilo actual, creándolo la primera vez.
+
+    Se prefiere tesserocr; si no está instalado o falla al cargar el modelo,
+    se usa pytesseract. Se mantiene un motor por combinación de idioma y
+    variables de inicialización.
+
+    Args:
+        lang: Idioma(s) de Tesseract.
+        tessdata_dir: Carpeta tessdata para tesserocr (None = del sistema).
+        pytesseract_config: Opciones de línea de comandos para pytesseract.
+        init_variables: Variables que Tesseract solo lee al cargar el modelo.
+
+    Returns:
+        Motor de OCR, o None si no hay ninguno disponible.
+    """
+    motores = getattr(_local, "engines", None)
+    if motores is None:
+        motores = _local.engines = {}
+    clave = (lang, tuple(sorted((init_variables or {}).items())))
+    if clave in motores:
+        return motores[clave]
+
+    engine = None
+    if tesserocr is not None:
+        try:
+            engine = TesserocrEngine(lang, tessdata_dir, init_variables)
+            logger.debug("Motor OCR persistente (tesserocr) inicializado con idioma '%s'.", lang)
+        except Exception as e:
+            logger.warning("No se pudo inicializar tesserocr (%s). Se usará pytesseract.", e)
+            engine = None
+
+    if engine is None and pytesseract is not None:
+        engine = PytesseractEngine(lang, pytesseract_config, init_variables)
+
+    motores[clave] = engine
+    return engine
@@ -1,9 +1,117 @@
 # src/core/processing_handler.py
+import logging
+import logging.handlers
+import multiprocessing
 import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, Optional, Tuple
 from . import image_processor  # Importar desde el mismo paquete core
+from . import directory_index
 from . import file_operations
+from . import io_prefetch
+from . import rename_journal
+from . import result_cache
 
-def process_single_file_auto(current_path: str) -> dict:
+logger = logging.getLogger(__name__)
+
+# Serializa la comprobación de destino y el renombrado cuando varios hilos
+# procesan archivos a la vez (p. ej. la carpeta vigilada): sin él, dos guías
+# iguales podrían pasar la comprobación y la segunda sobrescribiría la primera
+_rename_lock = threading.Lock()
+
+
+def _get_cache() -> Optional[result_cache.ResultCache]:
+    """Caché de resultados para la configuración actual del pipeline (o None)."""
+    return result_cache.get_default_cache(image_processor.pipeline_signature())
+
+
+def _cache_lookup(current_path: str, hash_fallback: bool = True) -> Optional[str]:
+    """Busca un número de guía en caché; los errores de caché nunca detienen el proceso."""
+    cache = _get_cache()
+    if not cache:
+        return None
+    try:
+        numero_guia = cache.lookup(current_path, hash_fallback)
+    except Exception as e:
+        logger.warning("Error consultando la caché: %s", e)
+        return None
+    if numero_guia:
+        logger.debug("Número de guía recuperado de la caché: %s", current_path)
+    return numero_guia
+
+
+def _cache_lookup_fingerprint(current_path: str, fingerprint: result_cache.Huella) -> Optional[str]:
+    """Busca un número de guía en caché por la huella ya calculada del archivo."""
+    cache = _get_cache()
+    if not cache:
+        return None
+    try:
+        numero_guia = cache.lookup_fingerprint(current_path, fingerprint)
+    except Exception as e:
+        logger.warning("Error consultando la caché: %s", e)
+        return None
+    if numero_guia:
+        logger.debug("Número de guía recuperado de la caché por contenido: %s", current_path)
+    return numero_guia
+
+
+def _cache_store(current_path: str, numero_guia: Optional[str],
+                 fingerprint: Optional[result_cache.Huella] = None) -> None:
+    """Guarda en caché un número de guía extraído con éxito."""
+    cache = _get_cache()
+    if not cache or not numero_guia:
+        return
+    try:
+        cache.store(current_path, numero_guia, fingerprint)
+    except Exception as e:
+        logger.warning("Error guardando en la caché: %s", e)
+
+
+def _cache_record_rename(old_path: str, new_path: str) -> None:
+    """Mantiene la búsqueda rápida de la caché tras un renombrado."""
+    cache = _get_cache()
+    if not cache:
+        return
+    try:
+        cache.record_rename(old_path, new_path)
+    except Exception as e:
+        logger.warning("Error actualizando la caché: %s", e)
+
+
+def _cached_details(numero_guia: str) -> dict:
+    """Detalle de extracción para un número recuperado de la caché (sin etapas)."""
+    return {"guide_number": numero_guia, "method": "cache",
+            "timings": {"decode": 0.0, "barcode": 0.0, "ocr": 0.0}}
+
+
+def _rename_with_details(current_path: str, detalle: dict, journal=None,
+                         index: Optional[directory_index.DirectoryIndex] = None) -> dict:
+    """
+    Renombra con el número extraído y añade al resultado los datos de la extracción.
+
+    Args:
+        current_path: Ruta completa actual del archivo.
+        detalle: Diccionario de image_processor.get_guide_number_detailed.
+        journal: RenameJournal opcional del lote.
+        index: DirectoryIndex opcional del lote.
+
+    Returns:
+        Resultado de _rename_to_guide_number con "guide_number", "method" y
+        "timings" (segundos de decode, barcode, ocr y rename).
+    """
+    inicio = time.perf_counter()
+    result = _rename_to_guide_number(current_path, detalle["guide_number"], journal, index)
+    tiempos = dict(detalle["timings"], rename=time.perf_counter() - inicio)
+    result.update(guide_number=detalle["guide_number"], method=detalle["method"], timings=tiempos)
+    return result
+
+
+def process_single_file_auto(current_path: str,
+                             should_cancel: Optional[Callable[[], bool]] = None,
+                             journal=None,
+                             index: Optional[directory_index.DirectoryIndex] = None) -> dict:
     """
     Orquesta el procesamiento automático de un solo archivo.
     1. Extrae el número de guía (Barcode/OCR).
@@ -13,6 +121,14 @@ def process_single_file_auto(current_path: str) -> dict:
 
     Args:
         current_path: La ruta completa actual del archivo a procesar.
+        should_cancel: Función opcional que devuelve True si el proceso fue
+            cancelado. Se consulta tras la extracción, de modo que un archivo
+            en curso nunca se renombra después de cancelar.
+        journal: RenameJournal opcional donde se anota el renombrado (antes
+            de aplicarlo), para poder deshacer el lote con rename_journal.undo.
+        index: DirectoryIndex opcional del lote; responde en memoria si el
+            archivo y el destino existen (solo el destino se vuelve a
+            comprobar en disco, justo antes de renombrar).
 
     Returns:
         Un diccionario indicando el estado y detalles, ej:
@@ -21,21 +137,76 @@ def process_single_file_auto(current_path: str) -> dict:
         {"status": "ocr_failed", "message": "...", "current_name": "..."}
         {"status": "rename_failed", "message": "...", "current_name": "..."}
         {"status": "target_exists", "message": "...", "current_name": "...", "target_name": "..."}
+        {"status": "cancelled", "current_name": "..."}
         {"status": "error", "message": "...", "current_name": "..."} # Errores generales
+        Cuando se llegó a intentar la extracción, el diccionario incluye
+        además "guide_number", "method" ("barcode", "ocr", "cache" o None) y
+        "timings" (segundos de las etapas decode, barcode, ocr y rename).
     """
     current_name = os.path.basename(current_path)
-    print(f"[Handler] Procesando automáticamente: {current_name}")
+    logger.debug("Procesando automáticamente: %s", current_path)
 
-    if not os.path.exists(current_path):
+    if not (index.exists(current_path) if index else os.path.exists(current_path)):
         return {"status": "error", "message": f"Archivo no encontrado en {current_path}", "current_name": current_name}
 
-    # 1. Extraer número de guía
-    numero_guia = None
-    try:
-        numero_guia = image_processor.get_guide_number(current_path)
-    except Exception as e:
-        print(f"[Handler] Error en image_processor: {e}")
-        return {"status": "ocr_failed", "message": f"Error durante OCR/BC: {e}", "current_name": current_name}
+    # 1. Extraer número de guía (primero en la caché de resultados). La
+    # búsqueda por contenido se hace con los mismos bytes que se decodifican,
+    # así que un archivo nuevo se lee una sola vez
+    numero_guia = _cache_lookup(current_path, hash_fallback=False)
+    if numero_guia:
+        return _rename_unless_cancelled(current_path, _cached_details(numero_guia), should_cancel,
+                                        journal, index)
+    return _extract_and_rename(current_path, None, should_cancel, journal, index)
+
+
+def _extract_and_rename(current_path: str, data: Optional[bytes],
+                        should_cancel: Optional[Callable[[], bool]] = None, journal=None,
+                        index: Optional[directory_index.DirectoryIndex] = None) -> dict:
+    """
+    Extrae el número de guía de un archivo sin resultado en la búsqueda rápida
+    de la caché y lo renombra.
+
+    `data` son los bytes del archivo si ya se leyeron (io_prefetch); con
+    None se leen aquí, una sola vez para el hash y la decodificación.
+    """
+    current_name = os.path.basename(current_path)
+    detalle, error, fingerprint = _extract_guide_number_worker(current_path, data)
+    if error:
+        logger.error("Error en image_processor con %s: %s", current_name, error)
+        return {"status": "ocr_failed", "message": f"Error durante OCR/BC: {error}", "current_name": current_name}
+    if detalle["method"] != "cache":
+        _cache_store(current_path, detalle["guide_number"], fingerprint)
+    return _rename_unless_cancelled(current_path, detalle, should_cancel, journal, index)
+
+
+def _rename_unless_cancelled(current_path: str, detalle: dict,
+                             should_cancel: Optional[Callable[[], bool]] = None, journal=None,
+                             index: Optional[directory_index.DirectoryIndex] = None) -> dict:
+    # Si el usuario canceló mientras se extraía el número, no tocar el archivo
+    if should_cancel and should_cancel():
+        logger.debug("Cancelado antes de renombrar: %s", os.path.basename(current_path))
+        return {"status": "cancelled", "current_name": os.path.basename(current_path)}
+    return _rename_with_details(current_path, detalle, journal, index)
+
+
+def _rename_to_guide_number(current_path: str, numero_guia: Optional[str], journal=None,
+                            index: Optional[directory_index.DirectoryIndex] = None) -> dict:
+    """
+    Renombra un archivo a partir del número de guía ya extraído.
+
+    Contiene los pasos 2 a 5 de process_single_file_auto para que el
+    procesamiento por lotes los aplique desde un único proceso coordinador.
+
+    Args:
+        current_path: Ruta completa actual del archivo.
+        numero_guia: Número extraído por image_processor (o None).
+        journal: RenameJournal opcional del lote.
+        index: DirectoryIndex opcional del lote.
+
+    Returns:
+        Diccionario de resultado igual al de process_single_file_auto.
+    """
+    current_name = os.path.basename(current_path)
 
     if not numero_guia:
         return {"status": "ocr_failed", "message": "No se pudo extraer número de guía.", "current_name": current_name}
@@ -54,27 +225,291 @@ def process_single_file_auto(current_path: str) -> dict:
 
     # 3. Verificar si se necesita renombrar
     if nuevo_nombre == current_name or nueva_ruta_norm == ruta_original_norm:
-         print(f"[Handler] El archivo '{current_name}' ya tiene el nombre correcto.")
+         logger.debug("El archivo '%s' ya tiene el nombre correcto.", current_name)
          # Devolver éxito pero indicando que no hubo cambio efectivo
          return {"status": "no_rename_needed", "current_name": current_name, "new_path": nueva_ruta}
 
-    # 4. Verificar si el destino ya existe
-    if os.path.exists(nueva_ruta_norm):
-        print(f"[Handler] Conflicto: El destino '{nuevo_nombre}' ya existe.")
-        return {"status": "target_exists", "message": f"El destino '{nuevo_nombre}' ya existe.", "current_name": current_name, "target_name": nuevo_nombre}
+    with _rename_lock:
+        # 4. Verificar si el destino ya existe: primero en el índice del lote
+        # (otro archivo del lote pudo tomar ya esta guía) y, justo antes de
+        # renombrar, en disco por si otro programa lo creó
+        if (index and index.exists(nueva_ruta_norm)) or os.path.exists(nueva_ruta_norm):
+            if index:
+                index.add(nueva_ruta_norm)
+            mensaje = f"El destino '{nuevo_nombre}' ya existe."
+            origen_lote = index.claimed_by(nueva_ruta_norm) if index else None
+            if origen_lote:
+                mensaje = (f"El destino '{nuevo_nombre}' ya existe: en este lote se asignó a "
+                           f"'{os.path.basename(origen_lote)}'.")
+            logger.info("Conflicto: El destino '%s' ya existe (origen '%s').", nuevo_nombre, current_name)
+            return {"status": "target_exists", "message": mensaje, "current_name": current_name, "target_name": nuevo_nombre}
 
-    # 5. Intentar renombrar
-    print(f"[Handler] Intentando renombrar: '{current_path}' -> '{nueva_ruta}'")
-    exito, mensaje_error = file_operations.rename_scan(current_path, nueva_ruta)
+        # 5. Intentar renombrar
+        logger.debug("Intentando renombrar: '%s' -> '%s'", current_path, nueva_ruta)
+        exito, mensaje_error = file_operations.rename_scan(current_path, nueva_ruta, journal)
+        if index:
+            if exito:
+                index.record_rename(current_path, nueva_ruta)
+            elif not os.path.exists(current_path):
+                index.discard(current_path)
 
     if exito:
-        print(f"[Handler] Renombrado con éxito a '{nuevo_nombre}'.")
+        logger.debug("Renombrado con éxito a '%s'.", nuevo_nombre)
+        _cache_record_rename(current_path, nueva_ruta)
         return {"status": "success", "new_name": nuevo_nombre, "new_path": nueva_ruta}
     else:
-        print(f"[Handler] Fallo al renombrar: {mensaje_error}")
+        logger.warning("Fallo al renombrar '%s': %s", current_name, mensaje_error)
         return {"status": "rename_failed", "message": f"Error al renombrar: {mensaje_error}", "current_name": current_name}
 
 
+class _ForwardToLogger(logging.Handler):
+    """Entrega los registros llegados de los workers al logger homónimo de este proceso."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        destino = logging.getLogger(record.name)
+        if destino.isEnabledFor(record.levelno):
+            destino.handle(record)
+        return True
+
+
+def _init_worker_process(log_queue, level: int) -> None:
+    """
+    Inicializa un proceso del pool: su log pasa por la cola del proceso principal.
+
+    Con un nivel superior a DEBUG, los mensajes por archivo se descartan en
+    el propio worker sin formatearse ni cruzar la cola.
+    """
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+    raiz.addHandler(logging.handlers.QueueHandler(log_queue))
+    raiz.setLevel(level)
+    # Con fork, la conexión SQLite del padre no puede usarse aquí
+    result_cache.reset_default_cache()
+
+
+def _extract_guide_number_worker(current_path: str, data: Optional[bytes] = None
+                                 ) -> Tuple[Optional[dict], Optional[str], Optional[result_cache.Huella]]:
+    """
+    Extrae el número de guía dentro de un proceso del pool (o en este mismo).
+
+    El archivo se lee una sola vez: con esos bytes se calcula la huella, se
+    busca en la caché por contenido (archivo copiado o renombrado) y, si no
+    está, se decodifica. Las excepciones se convierten en texto porque no
+    todas pueden serializarse de vuelta al proceso principal.
+
+    Args:
+        current_path: Ruta completa del archivo.
+        data: Contenido del archivo si el coordinador ya lo leyó
+            (io_prefetch); con None se lee aquí.
+
+    Returns:
+        Tuple: (detalle_extraccion, mensaje_error, huella_para_cache), donde
+        detalle_extraccion es el de image_processor.get_guide_number_detailed
+        (con method "cache" si el resultado salió de la caché).
+    """
+    if data is None:
+        # Si no se puede leer, image_processor abre la ruta y da el error real
+        data = io_prefetch.read_file(current_path)
+    fingerprint = None
+    if data is not None and _get_cache() is not None:
+        try:
+            fingerprint = result_cache.file_fingerprint(current_path, data)
+        except OSError:
+            pass
+    if fingerprint is not None:
+        numero_guia = _cache_lookup_fingerprint(current_path, fingerprint)
+        if numero_guia:
+            return _cached_details(numero_guia), None, fingerprint
+    try:
+        detalle = image_processor.get_guide_number_detailed(current_path, data)
+    except Exception as e:
+        return None, str(e), None
+    return detalle, None, fingerprint
+
+
+# Estado de clasificar() para un archivo que no existe
+_FALTA = object()
+
+
+def process_batch_auto(paths: Iterable[str],
+                       max_workers: Optional[int] = None,
+                       max_in_flight: Optional[int] = None,
+                       should_cancel: Optional[Callable[[], bool]] = None,
+                       journal=None) -> Iterator[Tuple[int, dict]]:
+    """
+    Procesa un lote de archivos repartiendo la extracción en varios procesos.
+
+    La extracción (Barcode/OCR) se ejecuta en un pool de procesos; los
+    renombrados se aplican de uno en uno en este proceso, en el orden en que
+    terminan los archivos, de modo que dos workers nunca compiten por el mismo
+    nombre de destino: el primero en terminar lo obtiene y el siguiente recibe
+    "target_exists". Solo hay como máximo `max_in_flight` archivos pendientes,
+    por lo que `paths` puede ser un iterador perezoso de cualquier tamaño.
+
+    Args:
+        paths: Rutas completas de los archivos a procesar.
+        max_workers: Número de procesos del pool (por defecto, núcleos de CPU).
+            Con 1 o menos se procesa en este mismo proceso.
+        max_in_flight: Máximo de archivos enviados al pool sin resultado
+            recogido (por defecto, el doble de `max_workers`).
+        should_cancel: Función opcional que devuelve True si el proceso fue
+            cancelado. Al cancelar no se envían más archivos y no se renombra
+            ninguno de los que sigan pendientes.
+        journal: RenameJournal opcional donde se anotan los renombrados del
+            lote, para poder deshacerlo entero con rename_journal.undo.
+
+    Las comprobaciones de existencia del lote usan un DirectoryIndex: cada
+    carpeta se lista una vez y el índice se actualiza con cada renombrado,
+    de modo que dos archivos con la misma guía se detectan en memoria y solo
+    el destino se vuelve a comprobar en disco antes de renombrar.
+
+    Mientras se extraen unos archivos, los siguientes que no estén en la
+    caché se leen por adelantado con io_prefetch (memoria acotada), de modo
+    que en una carpeta de red la lectura se solapa con el OCR. Se desactiva
+    con LECTORCODE_PREFETCH=0.
+
+    Yields:
+        Tuplas (índice, resultado) a medida que cada archivo termina, donde
+        `índice` es la posición del archivo en `paths` y `resultado` es un
+        diccionario igual al de process_single_file_auto.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if hasattr(paths, "__len__"):
+        # No compensa arrancar procesos para lotes de un solo archivo
+        max_workers = min(max_workers, len(paths))
+
+    indice = directory_index.DirectoryIndex()
+
+    def clasificar():
+        # (índice, ruta, estado): _FALTA, número de guía en caché o None si hay que extraer
+        for index, path in enumerate(paths):
+            if not indice.exists(path):
+                yield index, path, _FALTA
+            else:
+                # Solo la búsqueda rápida: la de contenido la hace el worker con los bytes ya leídos
+                yield index, path, _cache_lookup(path, hash_fallback=False)
+
+    candidatos = clasificar()
+    lectura = None
+    if io_prefetch.is_enabled():
+        # Solo se leen por adelantado los archivos que de verdad hay que extraer.
+        # Los bytes siguen contando en el límite de memoria hasta que el worker
+        # termina con ellos, no solo hasta que se envían al pool.
+        lectura = io_prefetch.ReadAheadBuffer()
+        con_datos = io_prefetch.prefetch_iter(candidatos, lambda c: c[1] if c[2] is None else None,
+                                              buffer=lectura)
+    else:
+        con_datos = ((c, None) for c in candidatos)
+
+    def liberar(tamano: int) -> None:
+        if lectura is not None and tamano:
+            lectura.release(tamano)
+
+    try:
+        yield from _process_candidates(con_datos, max_workers, max_in_flight, should_cancel, journal,
+                                       indice, liberar)
+    finally:
+        con_datos.close()
+        if lectura is not None:
+            lectura.close()
+
+
+def _missing_result(path: str) -> dict:
+    return {"status": "error", "message": f"Archivo no encontrado en {path}",
+            "current_name": os.path.basename(path)}
+
+
+def _process_candidates(con_datos, max_workers: int, max_in_flight: Optional[int],
+                        should_cancel: Optional[Callable[[], bool]], journal,
+                        indice: directory_index.DirectoryIndex,
+                        liberar: Callable[[int], None]) -> Iterator[Tuple[int, dict]]:
+    """
+    Cuerpo de process_batch_auto sobre los archivos ya clasificados y leídos.
+
+    `liberar` devuelve al límite de la lectura anticipada los bytes de un
+    archivo cuando su extracción termina.
+    """
+    if max_workers <= 1:
+        for (index, path, estado), data in con_datos:
+            if should_cancel and should_cancel():
+                return
+            if estado is _FALTA:
+                yield index, _missing_result(path)
+            elif estado:
+                yield index, _rename_unless_cancelled(path, _cached_details(estado), should_cancel,
+                                                      journal, indice)
+            else:
+                resultado = _extract_and_rename(path, data, should_cancel, journal, indice)
+                liberar(len(data) if data else 0)
+                yield index, resultado
+        return
+
+    if max_in_flight is None:
+        max_in_flight = max_workers * 2
+    max_in_flight = max(max_in_flight, max_workers)
+
+    logger.info("Procesando lote con %d procesos (máx. %d en curso).", max_workers, max_in_flight)
+    # Los workers envían sus registros de log a este proceso por una cola
+    cola_log = multiprocessing.Queue()
+    oyente_log = logging.handlers.QueueListener(cola_log, _ForwardToLogger())
+    oyente_log.start()
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker_process,
+                                   initargs=(cola_log, logger.getEffectiveLevel()))
+    pendientes = {}  # future -> (índice, ruta, tamaño de los bytes enviados)
+    agotado = False
+    try:
+        while pendientes or not agotado:
+            if should_cancel and should_cancel():
+                return
+
+            # Rellenar la ventana de trabajo acotada
+            while not agotado and len(pendientes) < max_in_flight:
+                try:
+                    (index, path, estado), data = next(con_datos)
+                except StopIteration:
+                    agotado = True
+                    break
+                if estado is _FALTA:
+                    yield index, _missing_result(path)
+                    continue
+                if estado:
+                    # Sin cambios desde la última vez: no hace falta el pool
+                    yield index, _rename_unless_cancelled(path, _cached_details(estado), should_cancel,
+                                                          journal, indice)
+                    continue
+                pendientes[executor.submit(_extract_guide_number_worker, path, data)] = (
+                    index, path, len(data) if data else 0)
+
+            if not pendientes:
+                continue
+
+            terminados, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for future in terminados:
+                index, path, tamano = pendientes.pop(future)
+                liberar(tamano)
+                if should_cancel and should_cancel():
+                    return
+                try:
+                    detalle, error, fingerprint = future.result()
+                except Exception as e:
+                    # El proceso del pool murió (p. ej. fallo nativo en zbar/Tesseract)
+                    detalle, error, fingerprint = None, str(e), None
+                if error:
+                    logger.error("Error en image_processor con %s: %s", os.path.basename(path), error)
+                    yield index, {"status": "ocr_failed", "message": f"Error durante OCR/BC: {error}",
+                                  "current_name": os.path.basename(path)}
+                    continue
+                if detalle["method"] != "cache":
+                    _cache_store(path, detalle["guide_number"], fingerprint)
+                # Renombrado coordinado: siempre desde este proceso, de uno en uno
+                yield index, _rename_with_details(path, detalle, journal, indice)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        oyente_log.stop()
+
+
 def rename_single_file_manual(current_path: str, current_name: str, new_base_name: str) -> dict:
     """
     Orquesta el renombrado manual de un solo archivo.
@@ -92,7 +527,7 @@ def rename_single_file_manual(current_path: str, current_name: str, new_base_nam
     Returns:
         Diccionario de resultado similar a process_single_file_auto.
     """
-    print(f"[Handler] Procesando manualmente: {current_name} -> {new_base_name}")
+    logger.debug("Procesando manualmente: %s -> %s", current_name, new_base_name)
 
     # 1. Validar nuevo nombre base (podría moverse a utils si se reutiliza)
     if not new_base_name:
@@ -122,12 +557,29 @@ def rename_single_file_manual(current_path: str, current_name: str, new_base_nam
         return {"status": "target_exists", "message": f"Ya existe un archivo llamado '{nuevo_nombre_completo}'.", "current_name": current_name, "target_name": nuevo_nombre_completo}
 
     # 5. Intentar renombrar
-    print(f"[Handler] Intentando renombrar manualmente: '{current_path}' -> '{nueva_ruta}'")
+    logger.debug("Intentando renombrar manualmente: '%s' -> '%s'", current_path, nueva_ruta)
     exito, mensaje_error = file_operations.rename_scan(current_path, nueva_ruta)
 
     if exito:
-        print(f"[Handler] Renombrado manual exitoso a '{nuevo_nombre_completo}'.")
+        logger.info("Renombrado manual de '%s' a '%s'.", current_name, nuevo_nombre_completo)
+        _cache_record_rename(current_path, nueva_ruta)
         return {"status": "success", "new_name": nuevo_nombre_completo, "new_path": nueva_ruta}
     else:
-        print(f"[Handler] Fallo en renombrado manual: {mensaje_error}")
-        return {"status": "rename_failed", "message": f"Error al renombrar: {mensaje_error}", "current_name": current_name}
\ No newline at end of file
+        logger.warning("Fallo en renombrado manual de '%s': %s", current_name, mensaje_error)
+        return {"status": "rename_failed", "message": f"Error al renombrar: {mensaje_error}", "current_name": current_name}
+
+
+def undo_batch(journal_path: str) -> dict:
+    """
+    Deshace los renombrados anotados en un diario de lote.
+
+    Args:
+        journal_path: Ruta del diario escrito por RenameJournal.
+
+    Returns:
+        Diccionario de rename_journal.undo ({"restored": [...], "skipped": [...]}).
+    """
+    resultado = rename_journal.undo(journal_path)
+    for renombrado in resultado["restored"]:
+        _cache_record_rename(renombrado["new"], renombrado["old"])
+    return resultado
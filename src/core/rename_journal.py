@@ -0,0 +1,260 @@
+# src/core/rename_journal.py
+"""
+Diario de renombrados de un lote, para poder deshacerlo.
+
+Antes de cada renombrado se escribe en el diario un registro de intención
+(ruta original y nueva) y, después, uno de confirmación o de fallo. Los
+registros se añaden al final de un archivo JSON Lines y se vacían al
+sistema operativo uno a uno, así que el diario refleja lo aplicado aunque
+el proceso muera a mitad del lote.
+
+undo() recorre el diario en orden inverso y devuelve cada archivo a su
+nombre original con os.rename (sin copiar datos). Si una intención no tiene
+confirmación (el proceso murió en medio), se decide mirando el disco. Cada
+archivo restaurado se anota en el diario, de modo que deshacer dos veces no
+mueve nada la segunda vez.
+
+Los diarios de la interfaz se conservan DIAS_CONSERVACION días (y como
+mucho MAX_DIARIOS): al empezar un lote se eliminan los más antiguos, de
+modo que un lote puede deshacerse durante ese tiempo.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from . import app_dirs
+
+logger = logging.getLogger(__name__)
+
+# Días que se conservan los diarios de la interfaz
+DIAS_CONSERVACION = 90
+# Máximo de diarios conservados aunque sean recientes
+MAX_DIARIOS = 1000
+
+
+class RenameJournal:
+    """
+    Escritor del diario de renombrados de un lote.
+
+    El archivo se crea con la primera intención: un lote sin renombrados no
+    deja diario. Es seguro usarlo desde varios hilos.
+    """
+
+    def __init__(self, path: str, sync: bool = False):
+        """
+        Args:
+            path: Ruta del archivo del diario (JSON Lines, en modo de añadido).
+            sync: Forzar cada registro a disco (os.fsync) y no solo al sistema
+                operativo; protege también ante un corte de luz, a costa de
+                una escritura síncrona por archivo.
+        """
+        self.path = path
+        self.sync = sync
+        self._file = None
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RenameJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def begin(self, old_path: str, new_path: str) -> int:
+        """
+        Anota la intención de renombrar; debe llamarse antes de hacerlo.
+
+        Returns:
+            Identificador del renombrado para commit() o abort().
+        """
+        with self._lock:
+            id_renombrado = self._next_id
+            self._next_id += 1
+            self._write({"type": "intent", "id": id_renombrado,
+                         "old": os.path.abspath(old_path), "new": os.path.abspath(new_path)})
+        return id_renombrado
+
+    def commit(self, rename_id: int) -> None:
+        """Anota que el renombrado se aplicó."""
+        with self._lock:
+            self._write({"type": "commit", "id": rename_id})
+
+    def abort(self, rename_id: int, error: str) -> None:
+        """Anota que el renombrado falló y el archivo conserva su nombre."""
+        with self._lock:
+            self._write({"type": "abort", "id": rename_id, "error": error})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file and not self._file.closed:
+                self._file.close()
+
+    def _write(self, registro: dict) -> None:
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._escribir_linea({"type": "batch", "created": datetime.now().isoformat(timespec="seconds"),
+                                  "pid": os.getpid()})
+        self._escribir_linea(registro)
+
+    def _escribir_linea(self, registro: dict) -> None:
+        self._file.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+
+def read_applied(path: str) -> List[Dict]:
+    """
+    Renombrados del diario que siguen aplicados, en el orden en que se hicieron.
+
+    Se omiten los fallidos y los ya deshechos. Una intención sin confirmación
+    cuenta como aplicada si el nombre nuevo existe y el original no.
+
+    Returns:
+        Lista de {"id", "old", "new"}.
+
+    Raises:
+        OSError: Si el diario no se puede leer.
+    """
+    intenciones: Dict[int, Dict] = {}
+    estados: Dict[int, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for numero_linea, linea in enumerate(f, start=1):
+            if not linea.strip():
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                # Última línea a medio escribir si el proceso murió escribiéndola
+                logger.warning("Línea %d del diario '%s' ilegible; se ignora.", numero_linea, path)
+                continue
+            tipo = registro.get("type")
+            if tipo == "intent":
+                intenciones[registro["id"]] = {"id": registro["id"], "old": registro["old"],
+                                               "new": registro["new"]}
+            elif tipo in ("commit", "abort", "undo"):
+                estados[registro["id"]] = tipo
+
+    aplicados = []
+    for id_renombrado, renombrado in sorted(intenciones.items()):
+        estado = estados.get(id_renombrado)
+        if estado is None:
+            estado = ("commit" if os.path.exists(renombrado["new"]) and not os.path.exists(renombrado["old"])
+                      else "abort")
+        if estado == "commit":
+            aplicados.append(renombrado)
+    return aplicados
+
+
+def undo(path: str) -> Dict[str, List[Dict]]:
+    """
+    Deshace los renombrados de un diario, del último al primero.
+
+    Un archivo no se restaura si ya no está en su ruta nueva o si otro
+    archivo ocupa su nombre original; nunca se sobrescribe nada.
+
+    Args:
+        path: Ruta del diario.
+
+    Returns:
+        {"restored": [...], "skipped": [...]}: renombrados devueltos a su nombre
+        original y los que no, cada uno con "old", "new" y, en los omitidos,
+        "message".
+
+    Raises:
+        OSError: Si el diario no se puede leer o escribir.
+    """
+    restaurados: List[Dict] = []
+    omitidos: List[Dict] = []
+    aplicados = read_applied(path)
+    with open(path, "a", encoding="utf-8") as diario:
+        for renombrado in reversed(aplicados):
+            antiguo, nuevo = renombrado["old"], renombrado["new"]
+            if not os.path.exists(nuevo):
+                omitidos.append(dict(renombrado, message=f"'{os.path.basename(nuevo)}' ya no existe."))
+                continue
+            if os.path.exists(antiguo):
+                omitidos.append(dict(renombrado, message=f"Ya existe un archivo llamado "
+                                                         f"'{os.path.basename(antiguo)}'."))
+                continue
+            try:
+                os.rename(nuevo, antiguo)
+            except OSError as e:
+                logger.warning("No se pudo restaurar '%s': %s", nuevo, e)
+                omitidos.append(dict(renombrado, message=str(e)))
+                continue
+            diario.write(json.dumps({"type": "undo", "id": renombrado["id"]}, ensure_ascii=False) + "\n")
+            diario.flush()
+            restaurados.append(renombrado)
+            logger.debug("Restaurado: '%s' -> '%s'", nuevo, antiguo)
+    logger.info("Diario '%s': %d renombrados deshechos, %d omitidos.", path, len(restaurados), len(omitidos))
+    return {"restored": restaurados, "skipped": omitidos}
+
+
+def latest_undoable(journal_dir: Optional[str] = None) -> Optional[Tuple[str, List[Dict]]]:
+    """
+    Diario más reciente que aún tiene renombrados aplicados.
+
+    Los diarios ya deshechos (o sin renombrados) se saltan, de modo que
+    deshacer repetidamente recorre los lotes del más nuevo al más antiguo.
+
+    Args:
+        journal_dir: Carpeta de diarios (por defecto, default_journal_dir()).
+
+    Returns:
+        Tupla (ruta del diario, renombrados aplicados) o None si no hay ninguno.
+    """
+    journal_dir = journal_dir or default_journal_dir()
+    try:
+        nombres = sorted((n for n in os.listdir(journal_dir) if n.endswith(".jsonl")), reverse=True)
+    except OSError:
+        return None
+    for nombre in nombres:
+        path = os.path.join(journal_dir, nombre)
+        try:
+            aplicados = read_applied(path)
+        except (OSError, KeyError) as e:
+            logger.warning("Diario '%s' ilegible: %s", path, e)
+            continue
+        if aplicados:
+            return path, aplicados
+    return None
+
+
+def default_journal_dir() -> str:
+    """Carpeta donde la interfaz guarda los diarios de cada lote."""
+    return os.path.join(app_dirs.default_cache_dir(), "diarios")
+
+
+def new_journal_path(journal_dir: Optional[str] = None) -> str:
+    """
+    Ruta para el diario de un lote nuevo, eliminando los caducados.
+
+    Se eliminan los diarios de más de DIAS_CONSERVACION días y, si aun así
+    quedan más de MAX_DIARIOS, los más antiguos.
+
+    Args:
+        journal_dir: Carpeta de diarios (por defecto, default_journal_dir()).
+
+    Returns:
+        Ruta de un archivo .jsonl con la fecha y hora del lote en el nombre.
+    """
+    journal_dir = journal_dir or default_journal_dir()
+    os.makedirs(journal_dir, exist_ok=True)
+    limite = time.time() - DIAS_CONSERVACION * 24 * 3600
+    try:
+        anteriores = sorted(n for n in os.listdir(journal_dir)
+                            if n.startswith("lote-") and n.endswith(".jsonl"))
+        for posicion, nombre in enumerate(anteriores):
+            path = os.path.join(journal_dir, nombre)
+            if posicion < len(anteriores) - MAX_DIARIOS + 1 or os.path.getmtime(path) < limite:
+                os.remove(path)
+    except OSError as e:
+        logger.warning("No se pudieron eliminar los diarios caducados: %s", e)
+    marca = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(journal_dir, f"lote-{marca}-{os.getpid()}.jsonl")
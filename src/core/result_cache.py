@@ -0,0 +1,315 @@
+# src/core/result_cache.py
+"""
+Caché persistente (SQLite) de números de guía ya extraídos.
+
+Volver a procesar una carpeta no debería repetir barcode/OCR sobre archivos
+que no han cambiado. Cada resultado se guarda por huella del contenido y
+versión del pipeline:
+
+1. Búsqueda rápida por (ruta, tamaño, mtime): una sola consulta, sin leer
+   el archivo.
+2. Si la ruta no coincide (archivo copiado, movido o renombrado), se calcula
+   el hash del contenido y se busca por él.
+
+La versión incluye la configuración del pipeline (patrón de guía, motores,
+OCR dirigido...), de modo que cambiar la expresión regular o el motor
+invalida los resultados anteriores. Solo se guardan extracciones con éxito:
+un fallo puede ser transitorio (red, Tesseract ausente) y debe reintentarse.
+El tamaño del archivo de base de datos está acotado: al superar el máximo se
+eliminan los resultados usados hace más tiempo.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from .app_dirs import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Tamaño máximo por defecto del archivo de caché
+MAX_BYTES_POR_DEFECTO = 64 * 1024 * 1024
+# Cada cuántas escrituras se comprueba el tamaño
+INTERVALO_COMPROBACION = 200
+# Fracción de entradas más antiguas eliminadas al superar el máximo
+FRACCION_DESALOJO = 0.25
+
+# (tamaño, mtime_ns, hash_contenido)
+Huella = Tuple[int, int, str]
+
+
+def content_hash(path: str, data: Optional[bytes] = None) -> str:
+    """Hash BLAKE2b del contenido completo de un archivo (o de `data`, si ya se leyó)."""
+    h = hashlib.blake2b(digest_size=20)
+    if data is not None:
+        h.update(data)
+        return h.hexdigest()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def file_fingerprint(path: str, data: Optional[bytes] = None) -> Huella:
+    """
+    Calcula la huella completa de un archivo.
+
+    Args:
+        path: Ruta del archivo.
+        data: Contenido ya leído del archivo; evita volver a leerlo.
+
+    Returns:
+        Tupla (tamaño, mtime_ns, hash_contenido).
+    """
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns, content_hash(path, data)
+
+
+class ResultCache:
+    """Caché SQLite de números de guía, segura entre hilos."""
+
+    def __init__(self, db_path: str, version: str, max_bytes: int = MAX_BYTES_POR_DEFECTO):
+        """
+        Abre (o crea) la base de datos de caché.
+
+        Args:
+            db_path: Ruta del archivo SQLite.
+            version: Firma del pipeline; los resultados de otras versiones se ignoran.
+            max_bytes: Tamaño máximo aproximado del archivo de caché.
+        """
+        self.db_path = db_path
+        self.version = version
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._escrituras = 0
+
+        carpeta = os.path.dirname(db_path)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS resultados (
+                content_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                guide TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (content_hash, version)
+            );
+            CREATE TABLE IF NOT EXISTS rutas (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_resultados_last_used ON resultados(last_used);
+        """)
+        self._conn.commit()
+
+    def lookup(self, path: str, hash_fallback: bool = True) -> Optional[str]:
+        """
+        Busca el número de guía de un archivo.
+
+        Args:
+            path: Ruta del archivo.
+            hash_fallback: Si la ruta no coincide, leer el archivo y buscar por
+                el hash de su contenido. Con False solo se hace la búsqueda
+                rápida (sin leer el archivo); quien vaya a leerlo de todos
+                modos puede buscar después con lookup_fingerprint().
+
+        Returns:
+            Número de guía guardado, o None si no hay resultado válido.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            # 1. Ruta + tamaño + mtime: sin leer el archivo
+            fila = self._conn.execute(
+                "SELECT r.guide, r.content_hash FROM rutas p "
+                "JOIN resultados r ON r.content_hash = p.content_hash AND r.version = ? "
+                "WHERE p.path = ? AND p.size = ? AND p.mtime_ns = ?",
+                (self.version, path, st.st_size, st.st_mtime_ns),
+            ).fetchone()
+            if fila:
+                self._touch(fila[1])
+                return fila[0]
+            if not hash_fallback:
+                return None
+
+            # ¿Hay algún resultado de esta versión? Si no, evitar leer el archivo
+            if not self._conn.execute(
+                "SELECT 1 FROM resultados WHERE version = ? LIMIT 1", (self.version,)
+            ).fetchone():
+                return None
+
+        # 2. Hash del contenido (fuera del lock: puede tardar en red)
+        try:
+            hash_contenido = content_hash(path)
+        except OSError:
+            return None
+        return self.lookup_fingerprint(path, (st.st_size, st.st_mtime_ns, hash_contenido))
+
+    def lookup_fingerprint(self, path: str, fingerprint: Huella) -> Optional[str]:
+        """
+        Busca el número de guía por el hash del contenido, ya calculado.
+
+        Si hay resultado, la ruta queda asociada a la huella para que la
+        próxima vez baste la búsqueda rápida.
+
+        Args:
+            path: Ruta del archivo.
+            fingerprint: Huella del archivo (file_fingerprint).
+
+        Returns:
+            Número de guía guardado, o None si no hay resultado válido.
+        """
+        size, mtime_ns, hash_contenido = fingerprint
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT guide FROM resultados WHERE content_hash = ? AND version = ?",
+                (hash_contenido, self.version),
+            ).fetchone()
+            if not fila:
+                return None
+            # Recordar la nueva ruta para que la próxima vez sea la búsqueda rápida
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rutas (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+                (path, size, mtime_ns, hash_contenido),
+            )
+            self._touch(hash_contenido)
+            return fila[0]
+
+    def store(self, path: str, guide: str, fingerprint: Optional[Huella] = None) -> None:
+        """
+        Guarda el número de guía extraído de un archivo.
+
+        Args:
+            path: Ruta del archivo (antes de renombrarlo).
+            guide: Número de guía extraído.
+            fingerprint: Huella ya calculada (p. ej. en un proceso worker);
+                si es None se calcula aquí.
+        """
+        if fingerprint is None:
+            try:
+                fingerprint = file_fingerprint(path)
+            except OSError:
+                return
+        size, mtime_ns, hash_contenido = fingerprint
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resultados (content_hash, version, guide, last_used) VALUES (?, ?, ?, ?)",
+                (hash_contenido, self.version, guide, time.time()),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rutas (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+                (path, size, mtime_ns, hash_contenido),
+            )
+            self._conn.commit()
+            self._escrituras += 1
+            if self._escrituras % INTERVALO_COMPROBACION == 0:
+                self._evict_if_needed()
+
+    def record_rename(self, old_path: str, new_path: str) -> None:
+        """Actualiza la ruta de un archivo renombrado (rename conserva tamaño y mtime)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE OR REPLACE rutas SET path = ? WHERE path = ?", (new_path, old_path)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._conn.close()
+
+    def _touch(self, hash_contenido: str) -> None:
+        """Marca un resultado como usado ahora (para el desalojo por antigüedad)."""
+        self._conn.execute(
+            "UPDATE resultados SET last_used = ? WHERE content_hash = ? AND version = ?",
+            (time.time(), hash_contenido, self.version),
+        )
+        self._conn.commit()
+
+    def _size_bytes(self) -> int:
+        """Tamaño ocupado por la base de datos."""
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return (page_count - freelist) * page_size
+
+    def _evict_if_needed(self) -> None:
+        """Elimina los resultados más antiguos si la caché supera su tamaño máximo."""
+        if self._size_bytes() <= self.max_bytes:
+            return
+        total = self._conn.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        a_borrar = max(1, int(total * FRACCION_DESALOJO))
+        logger.info("Tamaño máximo superado, eliminando %d resultados antiguos.", a_borrar)
+        self._conn.execute(
+            "DELETE FROM resultados WHERE rowid IN "
+            "(SELECT rowid FROM resultados ORDER BY last_used LIMIT ?)", (a_borrar,)
+        )
+        self._conn.execute(
+            "DELETE FROM rutas WHERE content_hash NOT IN (SELECT content_hash FROM resultados)"
+        )
+        self._conn.commit()
+        self._conn.execute("PRAGMA incremental_vacuum")
+        self._conn.commit()
+
+
+_cache_por_defecto: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+_cache_deshabilitada = False
+# Cachés heredadas del proceso padre; se conservan para no cerrarlas al recolectarlas
+_caches_heredadas = []
+
+
+def reset_default_cache() -> None:
+    """
+    Olvida la caché compartida heredada al crear un proceso con fork.
+
+    Una conexión SQLite no puede usarse desde otro proceso: el hijo abrirá
+    la suya la próxima vez que llame a get_default_cache(). La heredada no
+    se cierra, solo deja de usarse.
+    """
+    global _cache_por_defecto
+    with _cache_lock:
+        if _cache_por_defecto is not None:
+            _caches_heredadas.append(_cache_por_defecto)
+        _cache_por_defecto = None
+
+
+def get_default_cache(version: str) -> Optional[ResultCache]:
+    """
+    Devuelve la caché compartida de la aplicación, abriéndola la primera vez.
+
+    Se desactiva con la variable de entorno LECTORCODE_CACHE=0. Si la base de
+    datos no puede abrirse, el procesamiento continúa sin caché.
+
+    Args:
+        version: Firma del pipeline actual.
+
+    Returns:
+        Caché o None si está desactivada o no disponible.
+    """
+    global _cache_por_defecto, _cache_deshabilitada
+    if _cache_deshabilitada or os.environ.get("LECTORCODE_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache_por_defecto is None:
+            ruta = os.path.join(default_cache_dir(), "resultados.sqlite3")
+            try:
+                _cache_por_defecto = ResultCache(ruta, version)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("No se pudo abrir la caché de resultados '%s': %s", ruta, e)
+                _cache_deshabilitada = True
+                return None
+        return _cache_por_defecto
@@ -0,0 +1,145 @@
+# src/core/result_log.py
+"""
+Registro en disco del resultado de cada archivo procesado.
+
+Cada archivo produce un registro con la ruta, el estado, el número de guía,
+el método que lo obtuvo (barcode, OCR o caché) y los segundos de cada etapa
+(decodificación, barcode, OCR y renombrado). Los registros se añaden al
+final del archivo y se vacían al sistema operativo uno a uno: si el proceso
+muere a mitad de un lote de 100.000 archivos, todo lo terminado ya está en
+disco y el análisis de rendimiento puede hacerse después, sin la aplicación.
+
+Formatos: JSON Lines (por defecto) o CSV (si la ruta termina en .csv).
+"""
+import csv
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+from . import app_dirs
+
+logger = logging.getLogger(__name__)
+
+# Columnas de cada registro, en orden
+CAMPOS = (
+    "timestamp", "path", "status", "guide_number", "method",
+    "decode_s", "barcode_s", "ocr_s", "rename_s", "new_path", "message",
+)
+# Etapas medidas por processing_handler -> columna
+_ETAPAS = (("decode", "decode_s"), ("barcode", "barcode_s"), ("ocr", "ocr_s"), ("rename", "rename_s"))
+# Registros de lotes de la interfaz que se conservan
+MAX_REGISTROS = 50
+
+
+def build_record(path: str, result: dict) -> dict:
+    """
+    Registro plano de un archivo a partir del resultado de processing_handler.
+
+    Args:
+        path: Ruta del archivo procesado (antes de renombrar).
+        result: Diccionario de resultado de process_single_file_auto.
+
+    Returns:
+        Diccionario con las claves de CAMPOS (None si no aplica).
+    """
+    tiempos = result.get("timings") or {}
+    registro = {
+        "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+        "path": path,
+        "status": result.get("status", "error"),
+        "guide_number": result.get("guide_number"),
+        "method": result.get("method"),
+    }
+    for etapa, campo in _ETAPAS:
+        segundos = tiempos.get(etapa)
+        registro[campo] = round(segundos, 6) if segundos is not None else None
+    registro["new_path"] = result.get("new_path") if result.get("status") == "success" else None
+    registro["message"] = result.get("message")
+    return registro
+
+
+class ResultLogWriter:
+    """
+    Escritor incremental de registros de resultados.
+
+    Uso:
+        with ResultLogWriter("lote.jsonl") as log:
+            for path, result in ...:
+                log.write(path, result)
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        """
+        Abre (o crea) el archivo de registro en modo de añadido.
+
+        Args:
+            path: Ruta del archivo de registro.
+            fmt: "jsonl" o "csv"; por defecto se deduce de la extensión.
+        """
+        if fmt is None:
+            fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Formato de registro no soportado: '{fmt}'")
+        self.path = path
+        self.format = fmt
+        carpeta = os.path.dirname(os.path.abspath(path))
+        os.makedirs(carpeta, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", newline="")
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=CAMPOS)
+            if self._file.tell() == 0:
+                self._csv.writeheader()
+                self._file.flush()
+
+    def __enter__(self) -> "ResultLogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, path: str, result: dict) -> None:
+        """Añade el registro de un archivo y lo vacía al sistema operativo."""
+        registro = build_record(path, result)
+        if self._csv:
+            self._csv.writerow(registro)
+        else:
+            self._file.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+def default_log_dir() -> str:
+    """Carpeta donde la interfaz guarda los registros de cada lote."""
+    return os.path.join(app_dirs.default_cache_dir(), "registros")
+
+
+def new_batch_log_path(log_dir: Optional[str] = None) -> str:
+    """
+    Ruta para el registro de un lote nuevo, eliminando los más antiguos.
+
+    Solo se conservan los MAX_REGISTROS registros más recientes de la carpeta.
+
+    Args:
+        log_dir: Carpeta de registros (por defecto, default_log_dir()).
+
+    Returns:
+        Ruta de un archivo .jsonl con la fecha y hora del lote en el nombre.
+    """
+    log_dir = log_dir or default_log_dir()
+    os.makedirs(log_dir, exist_ok=True)
+    try:
+        anteriores = sorted(n for n in os.listdir(log_dir)
+                            if n.startswith("lote-") and n.endswith(".jsonl"))
+        for nombre in anteriores[:max(0, len(anteriores) - MAX_REGISTROS + 1)]:
+            os.remove(os.path.join(log_dir, nombre))
+    except OSError as e:
+        logger.warning("No se pudieron limpiar los registros antiguos: %s", e)
+    marca = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(log_dir, f"lote-{marca}-{os.getpid()}.jsonl")
@@ -0,0 +1,104 @@
+# src/core/text_locator.py
+"""
+Detección rápida de líneas de texto candidatas para el OCR dirigido.
+
+El número de guía impreso suele estar justo debajo (o encima) del código de
+barras, o en una línea corta de dígitos. En lugar de pasar la página completa
+por Tesseract, se buscan esas zonas sobre una copia reducida de la página:
+primero las bandas contiguas a los códigos de barras detectados y después los
+grupos de texto lo bastante anchos para contener un número de guía.
+"""
+from typing import List, Sequence
+
+from .barcode_locator import ANCHO_ANALISIS, Caja, np, true_runs, uniform_filter_1d
+
+# Número máximo de regiones devueltas para OCR dirigido
+MAX_LINEAS = 8
+# Relación ancho/alto mínima de un grupo que pueda contener un número de guía
+RELACION_MINIMA = 5.0
+
+
+def regions_near_barcodes(barcode_boxes: Sequence[Caja], page_size) -> List[Caja]:
+    """
+    Bandas justo debajo y encima de cada código de barras.
+
+    Args:
+        barcode_boxes: Cajas devueltas por barcode_locator.locate_barcode_regions.
+        page_size: Tamaño (ancho, alto) de la página.
+
+    Returns:
+        Lista de cajas, primero las de debajo de cada código.
+    """
+    ancho, alto = page_size
+    cajas = []
+    for x0, y0, x1, y1 in barcode_boxes:
+        alto_banda = max((y1 - y0) * 2 // 3, 16)
+        debajo = (x0, y1, x1, min(alto, y1 + alto_banda))
+        encima = (x0, max(0, y0 - alto_banda), x1, y0)
+        for caja in (debajo, encima):
+            if caja[3] - caja[1] > 4 and caja[2] - caja[0] > 4:
+                cajas.append(caja)
+    return cajas
+
+
+def locate_text_lines(gray, near: Sequence[Caja] = (), max_lines: int = MAX_LINEAS) -> List[Caja]:
+    """
+    Localiza grupos de texto en una sola línea que podrían ser un número de guía.
+
+    Args:
+        gray: Página en escala de grises (modo 'L') a resolución completa.
+        near: Cajas de referencia (p. ej. códigos de barras); los grupos más
+            cercanos a ellas se devuelven primero. Sin referencias se ordenan
+            de arriba abajo.
+        max_lines: Número máximo de regiones a devolver.
+
+    Returns:
+        Lista de cajas (izquierda, arriba, derecha, abajo) en coordenadas de
+        la imagen original. Vacía si numpy no está disponible.
+    """
+    if np is None:
+        return []
+
+    ancho, alto = gray.size
+    factor = max(1, ancho // ANCHO_ANALISIS)
+    reducida = gray.reduce(factor) if factor > 1 else gray
+    a = np.asarray(reducida, dtype=np.float32)
+    alto_r, ancho_r = a.shape
+    if alto_r < 8 or ancho_r < 8:
+        return []
+
+    # Tinta: píxeles claramente más oscuros que el papel
+    umbral = min(160.0, float(a.mean() - a.std()))
+    tinta = (a < umbral).astype(np.float32)
+
+    # Unir caracteres contiguos de una misma línea en bloques
+    unida = uniform_filter_1d(tinta, max(3, ancho_r // 60), axis=1) > 0.01
+
+    alto_min = max(2, alto_r // 400)
+    alto_max = max(alto_min + 1, alto_r // 25)
+    densidad_filas = unida.mean(axis=1)
+
+    candidatas = []
+    for fila_ini, fila_fin in true_runs(densidad_filas > 0.002):
+        alto_linea = fila_fin - fila_ini
+        if not alto_min <= alto_linea <= alto_max:
+            continue
+        for col_ini, col_fin in true_runs(unida[fila_ini:fila_fin].any(axis=0)):
+            if col_fin - col_ini < RELACION_MINIMA * alto_linea:
+                continue
+            margen = max(alto_linea // 2, 2)
+            candidatas.append((
+                max(0, (col_ini - margen) * factor),
+                max(0, (fila_ini - margen) * factor),
+                min(ancho, (col_fin + margen) * factor),
+                min(alto, (fila_fin + margen) * factor),
+            ))
+
+    if near:
+        def distancia(caja: Caja) -> float:
+            cx, cy = (caja[0] + caja[2]) / 2, (caja[1] + caja[3]) / 2
+            return min(abs(cx - (r[0] + r[2]) / 2) + abs(cy - (r[1] + r[3]) / 2) for r in near)
+        candidatas.sort(key=distancia)
+    else:
+        candidatas.sort(key=lambda caja: (caja[1], caja[0]))
+    return candidatas[:max_lines]
@@ -1,12 +1,20 @@
 """
 Componente para previsualización de imágenes.
 """
-import os
+import logging
 from typing import Optional
-from PyQt5.QtWidgets import QLabel, QListWidgetItem
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPixmap
 
+from src.ui.components.preview_loader import PreviewLoader, PreviewKey
+
+logger = logging.getLogger(__name__)
+
+# Espera tras el último cambio de tamaño antes de volver a decodificar (ms)
+RETARDO_REDIMENSION_MS = 150
+
+
 class ImagePreviewComponent:
     """Gestiona la previsualización de imágenes."""
     
@@ -20,29 +28,45 @@ class ImagePreviewComponent:
         """
         self.preview_label = preview_label
         self.filename_label = filename_label
+        
+        # Decodificación en segundo plano con caché LRU por (ruta, tamaño)
+        self.loader = PreviewLoader(preview_label)
+        self.loader.preview_ready.connect(self._on_preview_ready)
+        self.loader.preview_failed.connect(self._on_preview_failed)
+        
+        self._current_path: Optional[str] = None
+        self._current_name: str = ""
+        self._current_key: Optional[PreviewKey] = None
+        
+        self._resize_timer = QTimer(preview_label)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RETARDO_REDIMENSION_MS)
+        self._resize_timer.timeout.connect(self._reload_current)
     
-    def show_preview(self, item: Optional[QListWidgetItem]) -> None:
+    def show_preview(self, file_path: Optional[str], name: Optional[str] = None) -> None:
         """
-        Muestra la previsualización de la imagen del item dado.
+        Muestra la previsualización de un archivo de la lista.
         
         Args:
-            item: Item de la lista a previsualizar
+            file_path: Ruta del archivo a previsualizar
+            name: Nombre a mostrar; None si no hay ningún archivo seleccionado
         """
-        if not item:
+        if name is None:
             self.show_empty_preview()
             return
         
-        file_path = item.data(Qt.UserRole)
-        self.update_filename(item.text())
+        self.update_filename(name)
         
-        if not file_path or not os.path.exists(file_path):
-            self.show_error_preview(item.text(), file_path)
+        if not file_path:
+            self.show_error_preview(name, file_path)
             return
             
-        self.load_image_preview(file_path, item.text())
+        # La existencia del archivo se comprueba en segundo plano al decodificar
+        self.load_image_preview(file_path, name)
     
     def show_empty_preview(self) -> None:
         """Muestra un estado vacío en la previsualización."""
+        self._forget_current()
         if self.preview_label:
             self.preview_label.clear()
             self.preview_label.setText("Selecciona un archivo")
@@ -69,6 +93,7 @@ class ImagePreviewComponent:
             name: Nombre del archivo
             path: Ruta del archivo (o None si no hay ruta)
         """
+        self._forget_current()
         if not self.preview_label:
             return
             
@@ -81,7 +106,10 @@ class ImagePreviewComponent:
     
     def load_image_preview(self, path: str, name: str) -> None:
         """
-        Carga y muestra una imagen en la previsualización.
+        Muestra una imagen en la previsualización.
+        
+        Si ya está en caché al tamaño actual se muestra al instante; si no,
+        se decodifica en segundo plano directamente a ese tamaño.
         
         Args:
             path: Ruta de la imagen a cargar
@@ -89,22 +117,75 @@ class ImagePreviewComponent:
         """
         if not self.preview_label:
             return
-            
-        try:
-            pixmap = QPixmap(path)
-            if pixmap.isNull():
-                self.preview_label.setText(f"Error al cargar:\n{name}")
-                self.preview_label.setAlignment(Qt.AlignCenter)
-            else:
-                self._display_image(pixmap)
-        except Exception as e:
-            print(f"Excepción al cargar QPixmap para '{path}': {e}")
-            self.preview_label.setText(f"Error al mostrar:\n{name}")
-            self.preview_label.setAlignment(Qt.AlignCenter)
+        
+        self._current_path = path
+        self._current_name = name
+        self._current_key = PreviewLoader.make_key(path, self.preview_label.size())
+        
+        pixmap = self.loader.get_cached(self._current_key)
+        if pixmap is not None:
+            self._display_image(pixmap)
+            return
+        
+        self.preview_label.setText(f"Cargando...\n{name}")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.loader.request(self._current_key)
+    
+    def refresh(self) -> None:
+        """
+        Ajusta la previsualización actual al nuevo tamaño del label.
+        
+        Escala al instante la imagen visible (calidad rápida) y, cuando el
+        tamaño deja de cambiar, la vuelve a decodificar al tamaño exacto.
+        """
+        if not self.preview_label or not self._current_path:
+            return
+        actual = self.preview_label.pixmap()
+        if actual is not None and not actual.isNull():
+            self.preview_label.setPixmap(actual.scaled(
+                self.preview_label.size(), Qt.KeepAspectRatio, Qt.FastTransformation
+            ))
+        self._resize_timer.start()
+    
+    def cancel_pending(self) -> None:
+        """Descarta las decodificaciones en cola (la selección cambió)."""
+        self.loader.cancel_pending()
+    
+    def clear_cache(self) -> None:
+        """Descarta las previsualizaciones en caché (p. ej. al cargar otra lista)."""
+        self.loader.cache.clear()
+    
+    def _reload_current(self) -> None:
+        """Vuelve a cargar la imagen actual al tamaño actual del label."""
+        if self._current_path:
+            self.load_image_preview(self._current_path, self._current_name)
+    
+    def _forget_current(self) -> None:
+        """Olvida la imagen actual para ignorar resultados pendientes."""
+        self._current_path = None
+        self._current_key = None
+        self._resize_timer.stop()
+    
+    def _on_preview_ready(self, key: PreviewKey, pixmap: QPixmap) -> None:
+        """Muestra una previsualización decodificada si sigue siendo la actual."""
+        if key == self._current_key:
+            self._display_image(pixmap)
+    
+    def _on_preview_failed(self, key: PreviewKey, error: str) -> None:
+        """Muestra el error de carga si corresponde a la imagen actual."""
+        if key != self._current_key or not self.preview_label:
+            return
+        name, path = self._current_name, self._current_path
+        if error == "missing":
+            self.show_error_preview(name, path)
+            return
+        logger.warning("Error al cargar la previsualización de '%s': %s", path, error)
+        self.preview_label.setText(f"Error al cargar:\n{name}")
+        self.preview_label.setAlignment(Qt.AlignCenter)
     
     def _display_image(self, pixmap: QPixmap) -> None:
         """
-        Escala y muestra un QPixmap en el QLabel de previsualización.
+        Muestra un QPixmap ya decodificado al tamaño del QLabel de previsualización.
         
         Args:
             pixmap: Imagen a mostrar
@@ -112,10 +193,5 @@ class ImagePreviewComponent:
         if not self.preview_label:
             return
             
-        scaled_pixmap = pixmap.scaled(
-            self.preview_label.size(), 
-            Qt.KeepAspectRatio, 
-            Qt.SmoothTransformation
-        )
-        self.preview_label.setPixmap(scaled_pixmap)
-        self.preview_label.setAlignment(Qt.AlignCenter)
\ No newline at end of file
+        self.preview_label.setPixmap(pixmap)
+        self.preview_label.setAlignment(Qt.AlignCenter)
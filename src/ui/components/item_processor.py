@@ -1,106 +1,135 @@
 """
 Componente para procesar items en la lista.
+
+processing_handler (y con él Pillow, pyzbar y Tesseract) se importa en el
+primer uso, no al abrir la ventana.
 """
-from typing import Dict, Optional
-from PyQt5.QtWidgets import QListWidgetItem
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
-from src.core import processing_handler
-from src.utils.ui_helpers import mark_item_error, mark_item_status
+import os
+from typing import Dict, List, Optional
+from src.ui.models.image_list_model import (
+    ImageListModel, STATUS_PENDIENTE, STATUS_RENOMBRADO, STATUS_YA_CORRECTO,
+    STATUS_NO_RECONOCIDO, STATUS_DESTINO_EXISTE, STATUS_ERROR_RENOMBRADO,
+    STATUS_ERROR, STATUS_ERROR_RUTA, STATUS_RENOMBRADO_MANUAL,
+)
 
 class ItemProcessor:
-    """Procesa items individuales usando processing_handler."""
+    """Procesa filas individuales de la lista usando processing_handler."""
     
     @staticmethod
-    def process_item(item: QListWidgetItem) -> Dict:
+    def prepare_item(model: ImageListModel, row: int) -> Optional[str]:
         """
-        Procesa un item individual utilizando el handler automático.
+        Restaura la apariencia de la fila y devuelve su ruta asociada.
         
         Args:
-            item: Item a procesar
-            
+            model: Modelo de la lista
+            row: Fila a preparar
+        
+        Returns:
+            Ruta completa del archivo o None si no tiene ruta asociada
+        """
+        model.set_status(row, STATUS_PENDIENTE)
+        return model.path(row)
+    
+    @staticmethod
+    def mark_missing_path(model: ImageListModel, row: int) -> Dict:
+        """
+        Marca una fila que no tiene ruta asociada.
+        
+        Args:
+            model: Modelo de la lista
+            row: Fila sin ruta
+        
         Returns:
             Diccionario con el resultado del procesamiento
         """
-        # Restaurar apariencia
-        item.setBackground(QColor('white'))
-        item.setForeground(QColor('black'))
+        current_name = model.name(row)
+        message = f"{current_name}: Error interno - Ruta no asociada."
+        model.set_status(row, STATUS_ERROR_RUTA)
+        return {"tipo": "no_encontrado", "mensaje": message}
+    
+    @staticmethod
+    def apply_result(model: ImageListModel, row: int, result: Dict) -> Dict:
+        """
+        Refleja en la fila el resultado devuelto por processing_handler.
         
-        # Obtener datos del item
-        path = item.data(Qt.UserRole)
-        current_name = item.text()
+        Debe llamarse desde el hilo de la GUI.
         
-        # Verificar existencia de la ruta
-        if not path:
-            message = f"{current_name}: Error interno - Ruta no asociada."
-            mark_item_error(item, f"{current_name} [Error Ruta]", QColor(255, 0, 0))
-            return {"tipo": "no_encontrado", "mensaje": message}
+        Args:
+            model: Modelo de la lista
+            row: Fila procesada
+            result: Diccionario de resultado de process_single_file_auto
         
-        # Usar processing_handler para el procesamiento automático
-        result = processing_handler.process_single_file_auto(path)
+        Returns:
+            Diccionario con el resultado del procesamiento
+        """
+        current_name = model.name(row)
         status = result["status"]
         
         # Manejar diferentes estados de resultado
         if status == "success":
             # Éxito en el renombrado
-            new_name = result["new_name"]
-            new_path = result["new_path"]
-            mark_item_status(item, new_name, QColor(204, 255, 204))
-            item.setCheckState(Qt.Unchecked)
-            item.setData(Qt.UserRole, new_path)
+            model.set_path(row, result["new_path"])
+            model.set_status(row, STATUS_RENOMBRADO)
+            model.set_checked(row, False)
             return {"tipo": "exito", "mensaje": ""}
-            
+        
         elif status == "no_rename_needed":
             # El archivo ya tiene el nombre correcto
-            mark_item_status(item, f"{current_name} [Ya correcto]", QColor(220, 220, 220))
-            item.setCheckState(Qt.Unchecked)
+            model.set_status(row, STATUS_YA_CORRECTO)
+            model.set_checked(row, False)
             return {"tipo": "exito", "mensaje": ""}
-            
+        
+        elif status == "cancelled":
+            # Cancelado antes de renombrar: el archivo no se tocó
+            return {"tipo": "cancelado", "mensaje": ""}
+        
         elif status == "ocr_failed":
             # Fallo en extracción OCR/Barcode
             message = f"{current_name}: {result['message']}"
-            mark_item_error(item, f"{current_name} [No reconocido]", QColor(255, 230, 204))
+            model.set_status(row, STATUS_NO_RECONOCIDO)
             return {"tipo": "extraccion", "mensaje": message}
-            
+        
         elif status == "target_exists":
             # El archivo destino ya existe
             message = f"{current_name}: {result['message']}"
-            mark_item_error(item, f"{current_name} [Destino existe]", QColor(255, 255, 204))
+            model.set_status(row, STATUS_DESTINO_EXISTE)
             return {"tipo": "ya_existe", "mensaje": message}
-            
+        
         elif status == "rename_failed":
             # Fallo al renombrar
             message = f"{current_name}: {result['message']}"
-            mark_item_error(item, f"{current_name} [Error al renombrar]", QColor(255, 153, 153))
+            model.set_status(row, STATUS_ERROR_RENOMBRADO)
             return {"tipo": "renombrado", "mensaje": message}
-            
+        
         else:  # "error" u otros estados no manejados
             message = f"{current_name}: {result.get('message', 'Error desconocido')}"
-            mark_item_error(item, f"{current_name} [Error]", QColor(255, 153, 153))
+            model.set_status(row, STATUS_ERROR)
             return {"tipo": "error", "mensaje": message}
     
     @staticmethod
-    def rename_item_manual(item: QListWidgetItem, new_base_name: str) -> Dict:
+    def rename_item_manual(model: ImageListModel, row: int, new_base_name: str) -> Dict:
         """
-        Renombra un item manualmente.
+        Renombra una fila manualmente.
         
         Args:
-            item: Item a renombrar
+            model: Modelo de la lista
+            row: Fila a renombrar
             new_base_name: Nuevo nombre base sin extensión
-            
+        
         Returns:
             Diccionario con el resultado: {"success": bool, "message": str, ...}
         """
-        path = item.data(Qt.UserRole)
-        current_name = item.text()
+        path = model.path(row)
+        current_name = model.name(row)
         
         if not path:
             return {
-                "success": False, 
+                "success": False,
                 "message": f"El archivo original '{current_name}' no tiene una ruta válida asociada."
             }
-            
+        
         # Usar processing_handler para el renombrado manual
+        from src.core import processing_handler
         result = processing_handler.rename_single_file_manual(
             path, current_name, new_base_name
         )
@@ -108,16 +137,37 @@ class ItemProcessor:
         return result
     
     @staticmethod
-    def update_renamed_item(item: QListWidgetItem, new_name: str, new_path: str) -> None:
+    def update_renamed_item(model: ImageListModel, row: int, new_path: str) -> None:
         """
-        Actualiza un item después de un renombrado exitoso.
+        Actualiza una fila después de un renombrado manual exitoso.
         
         Args:
-            item: Item renombrado
-            new_name: Nuevo nombre del archivo
+            model: Modelo de la lista
+            row: Fila renombrada
             new_path: Nueva ruta del archivo
         """
-        item.setText(new_name)
-        item.setData(Qt.UserRole, new_path)
-        item.setBackground(QColor(220, 255, 220))  # Verde muy pálido para indicar éxito
-        item.setForeground(QColor('black'))
\ No newline at end of file
+        model.set_path(row, new_path)
+        # Verde muy pálido para indicar éxito
+        model.set_status(row, STATUS_RENOMBRADO_MANUAL)
+    
+    @staticmethod
+    def apply_undo(model: ImageListModel, restored: List[Dict]) -> int:
+        """
+        Devuelve a su nombre original las filas de un lote deshecho.
+        
+        Args:
+            model: Modelo de la lista
+            restored: Renombrados deshechos ({"old", "new"}), de rename_journal.undo
+        
+        Returns:
+            Número de filas actualizadas
+        """
+        originales = {os.path.normcase(os.path.abspath(r["new"])): r["old"] for r in restored}
+        actualizadas = 0
+        for row in range(model.rowCount()):
+            old_path = originales.get(os.path.normcase(os.path.abspath(model.path(row))))
+            if old_path:
+                model.set_path(row, old_path)
+                model.set_status(row, STATUS_PENDIENTE)
+                actualizadas += 1
+        return actualizadas
@@ -0,0 +1,180 @@
+"""
+Carga asíncrona de previsualizaciones con caché LRU acotada en memoria.
+"""
+import os
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from PyQt5.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+# Clave de caché: (ruta, ancho, alto) del tamaño de destino
+PreviewKey = Tuple[str, int, int]
+
+# Error con el que terminan las tareas descartadas antes de decodificar
+CANCELADA = "cancelled"
+
+# Memoria máxima por defecto para las previsualizaciones en caché
+MAX_BYTES_CACHE = 128 * 1024 * 1024
+
+# Prioridades en el pool: la imagen visible siempre se decodifica antes que
+# las precargadas
+PRIORIDAD_VISIBLE = 10
+PRIORIDAD_PRECARGA = 0
+
+
+class PreviewCache:
+    """Caché LRU de QPixmap acotada por memoria (ancho x alto x 4 bytes)."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES_CACHE):
+        """
+        Args:
+            max_bytes: Memoria máxima aproximada ocupada por las imágenes
+        """
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[PreviewKey, QPixmap]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * 4
+
+    def get(self, key: PreviewKey) -> Optional[QPixmap]:
+        """Devuelve la previsualización y la marca como usada recientemente."""
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key)
+        return pixmap
+
+    def put(self, key: PreviewKey, pixmap: QPixmap) -> None:
+        """Guarda una previsualización, desalojando las menos usadas si hace falta."""
+        if key in self._items:
+            self._bytes -= self._cost(self._items.pop(key))
+        self._items[key] = pixmap
+        self._bytes += self._cost(pixmap)
+        while self._bytes > self.max_bytes and len(self._items) > 1:
+            _, antigua = self._items.popitem(last=False)
+            self._bytes -= self._cost(antigua)
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        self._items.clear()
+        self._bytes = 0
+
+
+class PreviewTaskSignals(QObject):
+    """Señales de una tarea de decodificación (creadas en el hilo de la GUI)."""
+    # (clave, imagen decodificada o QImage nula, mensaje de error o "")
+    finished = pyqtSignal(object, QImage, str)
+
+
+class PreviewTask(QRunnable):
+    """Decodifica una imagen directamente al tamaño de destino en un hilo del pool."""
+
+    def __init__(self, key: PreviewKey, signals: PreviewTaskSignals,
+                 generation: int, current_generation: Callable[[], int]):
+        super().__init__()
+        self.key = key
+        self.signals = signals
+        self.generation = generation
+        self.current_generation = current_generation
+
+    def run(self) -> None:
+        # Pedida antes de la última cancelación: no decodificar
+        if self.generation != self.current_generation():
+            self.signals.finished.emit(self.key, QImage(), CANCELADA)
+            return
+
+        path, ancho, alto = self.key
+        if not os.path.exists(path):
+            self.signals.finished.emit(self.key, QImage(), "missing")
+            return
+
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        tamano = reader.size()
+        if tamano.isValid():
+            # Decodificar ya reducida: la imagen completa nunca se materializa
+            # en los formatos que lo soportan (p. ej. JPEG)
+            reader.setScaledSize(tamano.scaled(QSize(ancho, alto), Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            self.signals.finished.emit(self.key, QImage(), reader.errorString())
+            return
+        if not tamano.isValid():
+            image = image.scaled(ancho, alto, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.signals.finished.emit(self.key, image, "")
+
+
+class PreviewLoader(QObject):
+    """
+    Carga previsualizaciones en segundo plano y las guarda en caché.
+
+    Emite `preview_ready` en el hilo de la GUI cuando una imagen pedida está
+    lista, o `preview_failed` si no pudo cargarse.
+    """
+    preview_ready = pyqtSignal(object, QPixmap)
+    preview_failed = pyqtSignal(object, str)
+
+    def __init__(self, parent: Optional[QObject] = None, max_bytes: int = MAX_BYTES_CACHE):
+        """
+        Args:
+            parent: QObject padre
+            max_bytes: Memoria máxima de la caché de previsualizaciones
+        """
+        super().__init__(parent)
+        self.cache = PreviewCache(max_bytes)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(2)
+        self._signals = PreviewTaskSignals(self)
+        self._signals.finished.connect(self._on_task_finished)
+        self._pendientes = set()
+        # Se incrementa en cada cancelación; las tareas de generaciones
+        # anteriores que aún no empezaron terminan sin decodificar
+        self._generacion = 0
+
+    @staticmethod
+    def make_key(path: str, size: QSize) -> PreviewKey:
+        """Construye la clave de caché para una ruta y un tamaño de destino."""
+        return (path, max(1, size.width()), max(1, size.height()))
+
+    def get_cached(self, key: PreviewKey) -> Optional[QPixmap]:
+        """Devuelve la previsualización si ya está en caché."""
+        return self.cache.get(key)
+
+    def request(self, key: PreviewKey, priority: int = PRIORIDAD_VISIBLE) -> None:
+        """
+        Pide la decodificación de una previsualización si no está en caché ni en curso.
+
+        Args:
+            key: Clave (ruta, ancho, alto)
+            priority: Prioridad en el pool (mayor = antes)
+        """
+        if key in self._pendientes or self.cache.get(key) is not None:
+            return
+        self._pendientes.add(key)
+        task = PreviewTask(key, self._signals, self._generacion, self._current_generation)
+        self.thread_pool.start(task, priority)
+
+    def cancel_pending(self) -> None:
+        """
+        Descarta las decodificaciones pedidas que aún no han empezado.
+
+        Las que ya están en curso terminan y su resultado se guarda en caché.
+        """
+        self._generacion += 1
+        self._pendientes.clear()
+
+    def _current_generation(self) -> int:
+        return self._generacion
+
+    def _on_task_finished(self, key: PreviewKey, image: QImage, error: str) -> None:
+        """Convierte a QPixmap en el hilo de la GUI, guarda en caché y notifica."""
+        if error == CANCELADA:
+            return
+        self._pendientes.discard(key)
+        if image.isNull():
+            self.preview_failed.emit(key, error)
+            return
+        pixmap = QPixmap.fromImage(image)
+        self.cache.put(key, pixmap)
+        self.preview_ready.emit(key, pixmap)
@@ -0,0 +1,95 @@
+"""
+Precarga predictiva de las previsualizaciones vecinas durante la navegación.
+"""
+import time
+from typing import Callable, Optional
+from PyQt5.QtCore import QSize
+
+from src.ui.components.preview_loader import PRIORIDAD_PRECARGA, PreviewLoader
+
+# Número de imágenes precargadas en la dirección de avance (mínimo y máximo)
+VENTANA_MINIMA = 2
+VENTANA_MAXIMA = 8
+# Imágenes precargadas en la dirección contraria
+VENTANA_ATRAS = 1
+# Segundos de navegación que debe cubrir la ventana de precarga
+HORIZONTE_S = 1.5
+# Peso del último intervalo en la media móvil del ritmo de navegación
+SUAVIZADO = 0.4
+# Intervalos más largos que esto no cuentan como navegación continua
+PAUSA_S = 5.0
+
+
+class PreviewPrefetcher:
+    """
+    Decodifica en segundo plano las imágenes próximas a la actual.
+
+    Mientras el operador revisa la fila N se precargan N+1..N+k y N-1 al
+    tamaño de la previsualización. k se ajusta al ritmo de navegación: cuanto
+    más rápido se avanza, más imágenes por delante. Si el operador retrocede,
+    la ventana se invierte.
+    """
+
+    def __init__(self, loader: PreviewLoader,
+                 path_at: Callable[[int], Optional[str]],
+                 count: Callable[[], int]):
+        """
+        Args:
+            loader: Cargador compartido con la previsualización visible
+            path_at: Devuelve la ruta de una fila (o None)
+            count: Devuelve el número de filas de la lista
+        """
+        self.loader = loader
+        self.path_at = path_at
+        self.count = count
+        self._ultima_fila = -1
+        self._ultimo_instante = 0.0
+        self._intervalo_medio: Optional[float] = None
+        self._direccion = 1
+
+    def window_size(self) -> int:
+        """Número de imágenes a precargar en la dirección de avance."""
+        if not self._intervalo_medio:
+            return VENTANA_MINIMA
+        k = int(HORIZONTE_S / self._intervalo_medio) + 1
+        return max(VENTANA_MINIMA, min(VENTANA_MAXIMA, k))
+
+    def on_current_changed(self, row: int, size: QSize) -> None:
+        """
+        Registra la navegación a una fila y precarga sus vecinas.
+
+        Args:
+            row: Fila actual
+            size: Tamaño de destino de la previsualización
+        """
+        if row < 0:
+            return
+        self._update_pace(row)
+
+        total = self.count()
+        adelante = [row + self._direccion * i for i in range(1, self.window_size() + 1)]
+        atras = [row - self._direccion * i for i in range(1, VENTANA_ATRAS + 1)]
+        # Primero la siguiente y la anterior, después el resto de la ventana
+        orden = adelante[:1] + atras + adelante[1:]
+        for fila in orden:
+            if not 0 <= fila < total:
+                continue
+            path = self.path_at(fila)
+            if path:
+                self.loader.request(PreviewLoader.make_key(path, size), PRIORIDAD_PRECARGA)
+
+    def _update_pace(self, row: int) -> None:
+        """Actualiza la dirección y el ritmo medio de navegación."""
+        ahora = time.monotonic()
+        paso = row - self._ultima_fila
+        if self._ultima_fila >= 0 and abs(paso) == 1:
+            self._direccion = paso
+            intervalo = ahora - self._ultimo_instante
+            if intervalo > PAUSA_S:
+                self._intervalo_medio = None
+            elif self._intervalo_medio is None:
+                self._intervalo_medio = intervalo
+            else:
+                self._intervalo_medio += SUAVIZADO * (intervalo - self._intervalo_medio)
+        self._ultima_fila = row
+        self._ultimo_instante = ahora
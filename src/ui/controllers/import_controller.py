@@ -0,0 +1,148 @@
+"""
+Controlador para la importación de carpetas en segundo plano.
+"""
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.core import file_scanner
+from src.ui.controllers.item_list_controller import ItemListController
+
+logger = logging.getLogger(__name__)
+
+# Tamaño del primer bloque: pequeño para que la lista se llene de inmediato
+BLOQUE_INICIAL = 64
+# Tamaño máximo de bloque; cada bloque dobla al anterior hasta llegar aquí
+BLOQUE_MAXIMO = 4096
+# Tiempo máximo sin entregar archivos encontrados (s)
+INTERVALO_ENTREGA = 0.1
+
+class FolderImportSignals(QObject):
+    """Señales del worker de importación."""
+    # Bloque de rutas encontradas (lista de str)
+    chunk_found = pyqtSignal(list)
+    # Recorrido terminado (también tras cancelar)
+    finished = pyqtSignal()
+
+class FolderImportWorker(QRunnable):
+    """Recorre carpetas con os.scandir y entrega las imágenes por bloques."""
+
+    def __init__(self, paths: List[str], recursive: bool = True):
+        """
+        Args:
+            paths: Carpetas y/o archivos a importar
+            recursive: Recorrer también las subcarpetas
+        """
+        super().__init__()
+        self.paths = list(paths)
+        self.recursive = recursive
+        self.signals = FolderImportSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Detiene el recorrido en la próxima carpeta."""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """Indica si se pidió detener el recorrido."""
+        return self._cancel_event.is_set()
+
+    def run(self) -> None:
+        bloque: List[str] = []
+        tamano_bloque = BLOQUE_INICIAL
+        ultima_entrega = time.monotonic()
+        try:
+            for path in file_scanner.iter_image_paths(self.paths, self.recursive, self.is_cancelled):
+                bloque.append(path)
+                ahora = time.monotonic()
+                if len(bloque) >= tamano_bloque or ahora - ultima_entrega >= INTERVALO_ENTREGA:
+                    self.signals.chunk_found.emit(bloque)
+                    bloque = []
+                    tamano_bloque = min(tamano_bloque * 2, BLOQUE_MAXIMO)
+                    ultima_entrega = ahora
+            if bloque:
+                self.signals.chunk_found.emit(bloque)
+        except Exception as e:
+            logger.exception("Error inesperado al importar carpetas: %s", e)
+        finally:
+            self.signals.finished.emit()
+
+class ImportController:
+    """Gestiona la importación de carpetas en la lista sin bloquear la GUI."""
+
+    def __init__(self, item_list_controller: ItemListController):
+        """
+        Inicializa el controlador.
+
+        Args:
+            item_list_controller: Controlador de la lista donde se añaden los archivos
+        """
+        self.item_list_controller = item_list_controller
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+
+        self._worker: Optional[FolderImportWorker] = None
+        self._imported_count = 0
+        self._finished_callback: Optional[Callable[[int], None]] = None
+
+    def is_importing(self) -> bool:
+        """
+        Indica si hay una importación en curso.
+
+        Returns:
+            True si se están recorriendo carpetas
+        """
+        return self._worker is not None
+
+    def import_paths(self, paths: List[str], recursive: bool = True,
+                     finished_callback: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Empieza a importar carpetas y/o archivos; retorna de inmediato.
+
+        Los archivos se añaden al final de la lista a medida que se
+        encuentran. Si la lista estaba vacía, se selecciona el primero en
+        cuanto aparece.
+
+        Args:
+            paths: Carpetas y/o archivos a importar
+            recursive: Recorrer también las subcarpetas
+            finished_callback: Función que recibe el número de archivos
+                importados al terminar
+        """
+        self.cancel()
+        self._imported_count = 0
+        self._finished_callback = finished_callback
+
+        worker = FolderImportWorker(paths, recursive)
+        worker.signals.chunk_found.connect(lambda chunk, w=worker: self._on_chunk_found(w, chunk))
+        worker.signals.finished.connect(lambda w=worker: self._on_worker_finished(w))
+        self._worker = worker
+        self.thread_pool.start(worker)
+
+    def cancel(self) -> None:
+        """Detiene la importación en curso; lo ya añadido permanece en la lista."""
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+            self._finished_callback = None
+
+    def _on_chunk_found(self, worker: FolderImportWorker, chunk: List[str]) -> None:
+        """Añade un bloque de archivos a la lista."""
+        if worker is not self._worker:
+            return  # Bloque tardío de una importación cancelada
+        lista_vacia = self.item_list_controller.get_item_count() == 0
+        # Las rutas vienen del recorrido: no hace falta volver a comprobarlas
+        self._imported_count += self.item_list_controller.load_files(chunk, check_exists=False)
+        if lista_vacia:
+            self.item_list_controller.select_first_item()
+
+    def _on_worker_finished(self, worker: FolderImportWorker) -> None:
+        """Cierra la importación y notifica el total."""
+        if worker is not self._worker:
+            return
+        self._worker = None
+        callback, self._finished_callback = self._finished_callback, None
+        if callback:
+            callback(self._imported_count)
@@ -3,20 +3,25 @@ Controlador para la lista de items.
 """
 import os
 from typing import List, Optional, Callable
-from PyQt5.QtWidgets import QListWidget, QListWidgetItem
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QListView
+
+from src.ui.models.image_list_model import ImageListModel
 
 class ItemListController:
-    """Gestiona la lista de items de imágenes."""
+    """Gestiona la lista de imágenes (vista + modelo) por número de fila."""
     
-    def __init__(self, list_widget: QListWidget):
+    def __init__(self, list_view: QListView):
         """
         Inicializa el controlador.
         
         Args:
-            list_widget: Widget de lista a controlar
+            list_view: Vista de lista a controlar
         """
-        self.list_widget = list_widget
+        self.list_view = list_view
+        self.model = ImageListModel(list_view)
+        self.list_view.setModel(self.model)
+        # Todas las filas miden lo mismo: la vista no mide cada una al hacer scroll
+        self.list_view.setUniformItemSizes(True)
     
     def add_file(self, file_path: str) -> None:
         """
@@ -25,98 +30,79 @@ class ItemListController:
         Args:
             file_path: Ruta del archivo a añadir
         """
-        filename = os.path.basename(file_path)
-        item = QListWidgetItem(filename)
-        item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable)
-        item.setCheckState(Qt.Unchecked)
-        item.setData(Qt.UserRole, file_path)
-        self.list_widget.addItem(item)
+        self.model.append_paths([file_path])
     
-    def load_files(self, file_paths: List[str]) -> int:
+    def load_files(self, file_paths: List[str], check_exists: bool = True) -> int:
         """
         Carga múltiples archivos en la lista.
         
         Args:
             file_paths: Lista de rutas de archivos
-            
+            check_exists: Comprobar que cada ruta existe. Se puede omitir para
+                rutas que acaban de devolver el diálogo o el recorrido de
+                carpetas (evita un stat por archivo en recursos de red)
+        
         Returns:
             Número de archivos cargados exitosamente
         """
-        loaded_count = 0
+        if not check_exists:
+            return self.model.append_paths(file_paths)
         
+        validos = []
         for path in file_paths:
-            if os.path.exists(path) and os.path.isfile(path):
-                self.add_file(path)
-                loaded_count += 1
+            if os.path.isfile(path):
+                validos.append(path)
             else:
                 print(f"Advertencia: Archivo no encontrado '{path}', omitido.")
-                
-        return loaded_count
+        
+        return self.model.append_paths(validos)
     
     def clear_list(self) -> None:
         """Limpia todos los items de la lista."""
-        self.list_widget.clear()
+        self.model.clear()
+    
+    def get_checked_rows(self) -> List[int]:
+        """
+        Obtiene las filas marcadas con checkmark.
+        
+        Returns:
+            Lista de índices de fila marcados
+        """
+        return self.model.checked_rows()
     
-    def get_checked_items(self) -> List[QListWidgetItem]:
+    def get_checked_count(self) -> int:
         """
-        Obtiene los items marcados con checkmark.
+        Obtiene el número de filas marcadas.
         
         Returns:
-            Lista de items marcados
+            Número de filas marcadas
         """
-        checked_items = []
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item and item.checkState() == Qt.Checked:
-                checked_items.append(item)
-                
-        return checked_items
+        return self.model.checked_count()
     
     def select_all(self) -> None:
         """Marca todos los items de la lista."""
-        self._change_all_selection(Qt.Checked)
+        self.model.set_all_checked(True)
     
     def deselect_all(self) -> None:
         """Desmarca todos los items de la lista."""
-        self._change_all_selection(Qt.Unchecked)
-    
-    def _change_all_selection(self, state: Qt.CheckState) -> None:
-        """
-        Cambia el estado de selección de todos los items.
-        
-        Args:
-            state: Estado de checkmark a aplicar
-        """
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item and (item.flags() & Qt.ItemIsEnabled):
-                item.setCheckState(state)
+        self.model.set_all_checked(False)
     
     def select_first_item(self) -> None:
         """Selecciona el primer item de la lista si existe."""
-        if self.list_widget.count() > 0:
-            self.list_widget.setCurrentRow(0)
+        if self.model.rowCount() > 0:
+            self._set_current_row(0)
     
     def navigate_previous(self) -> None:
         """Navega al item anterior en la lista."""
-        current_row = self.list_widget.currentRow()
+        current_row = self.get_current_row()
         if current_row > 0:
-            self.list_widget.setCurrentRow(current_row - 1)
+            self._set_current_row(current_row - 1)
     
     def navigate_next(self) -> None:
         """Navega al item siguiente en la lista."""
-        current_row = self.list_widget.currentRow()
-        if current_row < self.list_widget.count() - 1:
-            self.list_widget.setCurrentRow(current_row + 1)
-    
-    def get_current_item(self) -> Optional[QListWidgetItem]:
-        """
-        Obtiene el item actualmente seleccionado.
-        
-        Returns:
-            El item seleccionado o None si no hay selección
-        """
-        return self.list_widget.currentItem()
+        current_row = self.get_current_row()
+        if current_row < self.model.rowCount() - 1:
+            self._set_current_row(current_row + 1)
     
     def get_current_row(self) -> int:
         """
@@ -125,7 +111,8 @@ class ItemListController:
         Returns:
             Índice de fila o -1 si no hay selección
         """
-        return self.list_widget.currentRow()
+        index = self.list_view.currentIndex()
+        return index.row() if index.isValid() else -1
     
     def get_item_count(self) -> int:
         """
@@ -134,31 +121,72 @@ class ItemListController:
         Returns:
             Número de items
         """
-        return self.list_widget.count()
+        return self.model.rowCount()
+    
+    def get_path_at(self, row: int) -> Optional[str]:
+        """
+        Obtiene la ruta del archivo de una fila.
+        
+        Args:
+            row: Índice de fila
+        
+        Returns:
+            Ruta del archivo o None si la fila no existe
+        """
+        return self.model.path(row)
+    
+    def get_name_at(self, row: int) -> str:
+        """
+        Obtiene el nombre del archivo de una fila.
+        
+        Args:
+            row: Índice de fila
+        
+        Returns:
+            Nombre del archivo (sin el sufijo de estado)
+        """
+        return self.model.name(row)
     
     def connect_item_changed(self, callback: Callable) -> None:
         """
-        Conecta un callback al evento de cambio de item.
+        Conecta un callback al evento de cambio de datos de la lista.
         
         Args:
-            callback: Función a llamar cuando cambia un item
+            callback: Función a llamar cuando cambia algún item
         """
-        self.list_widget.itemChanged.connect(callback)
+        self.model.dataChanged.connect(callback)
     
-    def connect_item_clicked(self, callback: Callable) -> None:
+    def connect_checked_count_changed(self, callback: Callable[[int], None]) -> None:
+        """
+        Conecta un callback al cambio del número de items marcados.
+        
+        Args:
+            callback: Función que recibe el nuevo número de items marcados
+        """
+        self.model.checkedCountChanged.connect(callback)
+    
+    def connect_item_clicked(self, callback: Callable[[int], None]) -> None:
         """
         Conecta un callback al evento de clic en item.
         
         Args:
-            callback: Función a llamar cuando se hace clic en un item
+            callback: Función que recibe la fila en la que se hizo clic
         """
-        self.list_widget.itemClicked.connect(callback)
+        self.list_view.clicked.connect(lambda index: callback(index.row()))
     
-    def connect_current_item_changed(self, callback: Callable) -> None:
+    def connect_current_item_changed(self, callback: Callable[[int], None]) -> None:
         """
         Conecta un callback al evento de cambio de item actual.
         
         Args:
-            callback: Función a llamar cuando cambia el item actual
+            callback: Función que recibe la fila actual (-1 si no hay ninguna)
         """
-        self.list_widget.currentItemChanged.connect(callback)
\ No newline at end of file
+        self.list_view.selectionModel().currentRowChanged.connect(
+            lambda current, previous: callback(current.row() if current.isValid() else -1)
+        )
+    
+    def _set_current_row(self, row: int) -> None:
+        """Hace actual una fila y la desplaza a la vista."""
+        index = self.model.index(row)
+        self.list_view.setCurrentIndex(index)
+        self.list_view.scrollTo(index)
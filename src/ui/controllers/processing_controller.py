@@ -1,12 +1,17 @@
 """
 Controlador para el procesamiento de archivos.
 """
-from typing import Dict, List, Callable
-from PyQt5.QtWidgets import QWidget, QProgressDialog, QApplication
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QListWidgetItem
+import logging
+from typing import Dict, List, Callable, Optional
+from PyQt5.QtWidgets import QWidget, QProgressDialog
+from PyQt5.QtCore import Qt, QThreadPool
 
+from src.core import rename_journal, result_log
 from src.ui.components.item_processor import ItemProcessor
+from src.ui.models.image_list_model import ImageListModel
+from src.ui.controllers.processing_worker import ProcessingWorker, UndoWorker
+
+logger = logging.getLogger(__name__)
 
 class ProcessingController:
     """Gestiona el procesamiento en lote de archivos."""
@@ -19,38 +24,185 @@ class ProcessingController:
             parent_widget: Widget padre para diálogos
         """
         self.parent = parent_widget
+        
+        # Pool propio de un solo hilo: los lotes se ejecutan uno tras otro y
+        # un lote cancelado termina su archivo en curso antes del siguiente.
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        
+        self._worker: Optional[ProcessingWorker] = None
+        self._undo_worker: Optional[UndoWorker] = None
+        self._model: Optional[ImageListModel] = None
+        self._rows: List[int] = []
+        self._results: Dict = {}
+        self._progress_dialog: Optional[QProgressDialog] = None
+        self._processed_count = 0
+        self._ui_update_callback: Optional[Callable] = None
+        self._finished_callback: Optional[Callable] = None
     
-    def process_items(self, items: List[QListWidgetItem], 
-                      ui_update_callback: Callable) -> Dict:
+    def is_processing(self) -> bool:
         """
-        Procesa una lista de items mostrando progreso.
+        Indica si hay un lote (o un deshacer) en curso.
+        
+        Returns:
+            True si se está procesando o deshaciendo un lote
+        """
+        return self._worker is not None or self._undo_worker is not None
+    
+    def process_items(self, model: ImageListModel, rows: List[int], 
+                      ui_update_callback: Callable,
+                      finished_callback: Callable[[Dict], None]) -> None:
+        """
+        Inicia el procesamiento de una lista de filas en segundo plano.
+        
+        El método retorna de inmediato; la GUI sigue respondiendo mientras
+        el worker procesa los archivos y las filas se actualizan a medida
+        que llegan los resultados.
         
         Args:
-            items: Lista de items a procesar
+            model: Modelo de la lista de imágenes
+            rows: Filas a procesar
             ui_update_callback: Función para habilitar/deshabilitar UI
-            
-        Returns:
-            Diccionario con resultados del proceso
+            finished_callback: Función que recibe el diccionario de resultados
+                al terminar o cancelar el proceso
         """
-        if not items:
-            return {}
+        if not rows or self.is_processing():
+            return
             
-        total_items = len(items)
-        results = self._initialize_results()
+        self._model = model
+        self._rows = list(rows)
+        self._results = self._initialize_results()
+        self._processed_count = 0
+        self._ui_update_callback = ui_update_callback
+        self._finished_callback = finished_callback
+        
+        # Preparar filas en el hilo de la GUI y reunir las rutas a procesar
+        tasks = []
+        for index, row in enumerate(self._rows):
+            path = ItemProcessor.prepare_item(model, row)
+            if not path:
+                self._processed_count += 1
+                self._update_result_counters(ItemProcessor.mark_missing_path(model, row), self._results)
+                continue
+            tasks.append((index, path))
         
         ui_update_callback(False)  # Deshabilitar UI durante el proceso
-        progress_dialog = self._create_progress_dialog(total_items)
+        self._progress_dialog = self._create_progress_dialog(len(self._rows))
+        self._progress_dialog.setValue(self._processed_count)
+        self._progress_dialog.canceled.connect(self.cancel)
         
-        try:
-            self._process_items_with_progress(items, progress_dialog, results)
-        except Exception as e:
-            print(f"Error inesperado durante el procesamiento: {e}")
-            results["errores_detalle"].append(f"Error inesperado general: {str(e)}")
-        finally:
-            progress_dialog.close()
-            ui_update_callback(True)  # Rehabilitar UI
-            
-        return results
+        worker = ProcessingWorker(tasks, log_path=self._new_log_path(),
+                                  journal_path=self._new_journal_path())
+        worker.signals.batch_failed.connect(
+            lambda message, w=worker: self._on_batch_failed(w, message))
+        # El modelo, las filas y las rutas se capturan para aplicar los
+        # renombrados que lleguen después de cancelar el lote
+        paths = dict(tasks)
+        worker.signals.item_processed.connect(
+            lambda index, result, w=worker, m=model, r=self._rows, p=paths:
+                self._on_item_processed(w, index, result, m, r[index], p[index]))
+        worker.signals.finished.connect(lambda w=worker: self._on_worker_finished(w))
+        self._worker = worker
+        self.thread_pool.start(worker)
+    
+    def undo_batch(self, journal_path: str, ui_update_callback: Callable,
+                   finished_callback: Callable[[Dict], None],
+                   failed_callback: Callable[[str], None]) -> None:
+        """
+        Deshace un lote en segundo plano.
+        
+        Usa el mismo pool de un hilo que los lotes, así que nunca se solapa
+        con los renombrados de un lote recién cancelado.
+        
+        Args:
+            journal_path: Diario del lote a deshacer
+            ui_update_callback: Función para habilitar/deshabilitar UI
+            finished_callback: Función que recibe el diccionario de undo_batch
+            failed_callback: Función que recibe el mensaje si no se pudo deshacer
+        """
+        if self.is_processing():
+            return
+        worker = UndoWorker(journal_path)
+        
+        def terminar(callback: Callable, valor) -> None:
+            if worker is not self._undo_worker:
+                return  # La aplicación se está cerrando
+            self._undo_worker = None
+            ui_update_callback(True)
+            callback(valor)
+        
+        worker.signals.finished.connect(lambda resultado: terminar(finished_callback, resultado))
+        worker.signals.failed.connect(lambda message: terminar(failed_callback, message))
+        ui_update_callback(False)
+        self._undo_worker = worker
+        self.thread_pool.start(worker)
+    
+    def cancel(self) -> None:
+        """
+        Cancela el lote en curso sin esperar a que termine el archivo actual.
+        
+        El archivo en curso no se renombra: el worker consulta la cancelación
+        antes de renombrar. Si un renombrado ya estaba hecho, su resultado
+        tardío se sigue aplicando a la fila para no dejarla con la ruta vieja.
+        """
+        if not self._worker:
+            return
+        self._worker.cancel()
+        self._results["errores_detalle"].insert(0, "Proceso cancelado por el usuario.")
+        self._finish()
+    
+    def shutdown(self) -> None:
+        """Cancela el lote en curso sin entregar resultados (cierre de la aplicación)."""
+        self._finished_callback = None
+        self._undo_worker = None  # El deshacer en curso termina, pero sin avisar
+        self.cancel()
+    
+    def _on_batch_failed(self, worker: ProcessingWorker, message: str) -> None:
+        """Registra un error que interrumpió el lote."""
+        if worker is self._worker:
+            self._results["errores_detalle"].append(f"Error inesperado general: {message}")
+    
+    def _on_item_processed(self, worker: ProcessingWorker, index: int, result: Dict,
+                           model: ImageListModel, row: int, path: str) -> None:
+        """Aplica el resultado de un archivo a la fila correspondiente."""
+        if worker is not self._worker:
+            # Resultado tardío de un lote ya cancelado: solo importan los
+            # renombrados hechos en disco, y solo si la fila no ha cambiado
+            if (result.get("status") == "success" and row < model.rowCount()
+                    and model.path(row) == path):
+                ItemProcessor.apply_result(model, row, result)
+            return
+        nombre = model.name(row)
+        item_result = ItemProcessor.apply_result(model, row, result)
+        self._update_result_counters(item_result, self._results)
+        self._processed_count += 1
+        if self._progress_dialog:
+            # Con varios procesos los archivos terminan en cualquier orden
+            self._progress_dialog.setLabelText(
+                f"Procesados {self._processed_count}/{len(self._rows)}: {nombre}"
+            )
+            self._progress_dialog.setValue(self._processed_count)
+    
+    def _on_worker_finished(self, worker: ProcessingWorker) -> None:
+        """Cierra el proceso cuando el worker termina normalmente."""
+        if worker is self._worker:
+            self._finish()
+    
+    def _finish(self) -> None:
+        """Cierra el diálogo, rehabilita la UI y entrega los resultados."""
+        self._worker = None
+        if self._progress_dialog:
+            self._progress_dialog.canceled.disconnect(self.cancel)
+            self._progress_dialog.close()
+            self._progress_dialog = None
+        
+        results = self._results
+        self._model = None
+        self._rows = []
+        if self._ui_update_callback:
+            self._ui_update_callback(True)  # Rehabilitar UI
+        if self._finished_callback:
+            self._finished_callback(results)
     
     def _initialize_results(self) -> Dict:
         """
@@ -65,9 +217,41 @@ class ProcessingController:
             "fallo_renombrado": 0, 
             "ya_existe": 0, 
             "archivo_no_encontrado": 0, 
-            "errores_detalle": []
+            "errores_detalle": [],
+            "registro": None,
+            "diario": None
         }
     
+    def _new_log_path(self) -> Optional[str]:
+        """
+        Elige el archivo de registro del lote y lo anota en los resultados.
+        
+        Returns:
+            Ruta del registro, o None si la carpeta de registros no está disponible
+        """
+        try:
+            path = result_log.new_batch_log_path()
+        except OSError as e:
+            logger.warning("No se pudo preparar el registro del lote: %s", e)
+            return None
+        self._results["registro"] = path
+        return path
+    
+    def _new_journal_path(self) -> Optional[str]:
+        """
+        Elige el diario de renombrados del lote y lo anota en los resultados.
+        
+        Returns:
+            Ruta del diario, o None si la carpeta de diarios no está disponible
+        """
+        try:
+            path = rename_journal.new_journal_path()
+        except OSError as e:
+            logger.warning("No se pudo preparar el diario de renombrados: %s", e)
+            return None
+        self._results["diario"] = path
+        return path
+    
     def _create_progress_dialog(self, total_items: int) -> QProgressDialog:
         """
         Crea y configura el diálogo de progreso.
@@ -85,31 +269,6 @@ class ProcessingController:
         progress_dialog.setValue(0)
         return progress_dialog
     
-    def _process_items_with_progress(self, items: List[QListWidgetItem], 
-                                   progress_dialog: QProgressDialog, 
-                                   results: Dict) -> None:
-        """
-        Procesa los items mostrando progreso.
-        
-        Args:
-            items: Lista de items a procesar
-            progress_dialog: Diálogo de progreso
-            results: Diccionario para almacenar resultados
-        """
-        progress = 0
-        for item in items[:]:
-            progress += 1
-            progress_dialog.setValue(progress)
-            progress_dialog.setLabelText(f"Procesando {progress}/{len(items)}: {item.text()}")
-            QApplication.processEvents()
-            
-            if progress_dialog.wasCanceled():
-                results["errores_detalle"].insert(0, "Proceso cancelado por el usuario.")
-                break
-                
-            item_result = ItemProcessor.process_item(item)
-            self._update_result_counters(item_result, results)
-    
     def _update_result_counters(self, item_result: Dict, results: Dict) -> None:
         """
         Actualiza los contadores de resultados según el tipo de resultado.
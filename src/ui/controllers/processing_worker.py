@@ -0,0 +1,139 @@
+"""
+Motor de procesamiento en segundo plano basado en QThreadPool.
+"""
+import logging
+import threading
+from typing import List, Optional, Tuple
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.core import rename_journal, result_log
+
+logger = logging.getLogger(__name__)
+
+
+def import_main_thread_engines() -> None:
+    """
+    Importa en el hilo principal la parte de los motores que lo exige.
+
+    tesserocr (a través de cysignals) instala manejadores de señales al
+    importarse, y Python solo lo permite en el hilo principal. El resto de
+    processing_handler puede importarse después desde cualquier hilo.
+    """
+    from src.core import ocr_engine  # noqa: F401
+
+
+class ProcessingWorkerSignals(QObject):
+    """
+    Señales emitidas por el worker de procesamiento.
+
+    Las señales se crean en el hilo de la GUI, por lo que las conexiones
+    a slots de la interfaz se entregan en cola al bucle de eventos principal.
+    """
+    # (índice del item, diccionario de resultado de processing_handler)
+    item_processed = pyqtSignal(int, object)
+    # Mensaje de error si el lote se interrumpe por una excepción
+    batch_failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class ProcessingWorker(QRunnable):
+    """Procesa una lista de archivos fuera del hilo de la GUI."""
+
+    def __init__(self, tasks: List[Tuple[int, str]], max_workers: Optional[int] = None,
+                 log_path: Optional[str] = None, journal_path: Optional[str] = None):
+        """
+        Inicializa el worker.
+
+        Args:
+            tasks: Lista de tuplas (índice, ruta) a procesar
+            max_workers: Procesos usados para la extracción (por defecto, núcleos de CPU)
+            log_path: Archivo donde registrar el resultado de cada archivo (opcional)
+            journal_path: Diario de renombrados del lote, para poder deshacerlo (opcional)
+        """
+        super().__init__()
+        import_main_thread_engines()
+        self.tasks = tasks
+        self.max_workers = max_workers
+        self.log_path = log_path
+        self.journal_path = journal_path
+        self.signals = ProcessingWorkerSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Solicita la cancelación. Es seguro llamarlo desde cualquier hilo."""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """Indica si se ha solicitado la cancelación."""
+        return self._cancel_event.is_set()
+
+    def run(self) -> None:
+        """Procesa los archivos en el pool de procesos y emite cada resultado al hilo de la GUI."""
+        paths = [path for _, path in self.tasks]
+        log = None
+        journal = rename_journal.RenameJournal(self.journal_path) if self.journal_path else None
+        try:
+            # Import diferido: los motores se cargan fuera del hilo de la GUI
+            # (ocr_engine ya se importó en el hilo principal al crear el worker)
+            from src.core import processing_handler
+            if self.log_path:
+                try:
+                    log = result_log.ResultLogWriter(self.log_path)
+                except OSError as e:
+                    logger.warning("No se pudo abrir el registro '%s': %s", self.log_path, e)
+            resultados = processing_handler.process_batch_auto(
+                paths, max_workers=self.max_workers, should_cancel=self.is_cancelled,
+                journal=journal
+            )
+            for position, result in resultados:
+                index, path = self.tasks[position]
+                if log:
+                    # Se escribe aquí, fuera del hilo de la GUI
+                    log.write(path, result)
+                self.signals.item_processed.emit(index, result)
+        except Exception as e:
+            # Nunca dejar que una excepción mate el hilo del pool
+            logger.exception("Error inesperado durante el lote: %s", e)
+            self.signals.batch_failed.emit(str(e))
+        finally:
+            if log:
+                log.close()
+            if journal:
+                journal.close()
+            self.signals.finished.emit()
+
+
+class UndoWorkerSignals(QObject):
+    """Señales emitidas por el worker que deshace un lote."""
+    # Diccionario de processing_handler.undo_batch ({"restored", "skipped"})
+    finished = pyqtSignal(object)
+    # Mensaje de error si no se pudo leer el diario
+    failed = pyqtSignal(str)
+
+
+class UndoWorker(QRunnable):
+    """Deshace un lote fuera del hilo de la GUI."""
+
+    def __init__(self, journal_path: str):
+        """
+        Inicializa el worker.
+
+        Args:
+            journal_path: Diario del lote a deshacer
+        """
+        super().__init__()
+        import_main_thread_engines()
+        self.journal_path = journal_path
+        self.signals = UndoWorkerSignals()
+
+    def run(self) -> None:
+        """Devuelve los archivos a su nombre original y emite el resultado al hilo de la GUI."""
+        try:
+            from src.core import processing_handler
+            resultado = processing_handler.undo_batch(self.journal_path)
+        except Exception as e:
+            # OSError al leer el diario, o cualquier fallo inesperado: nunca matar el hilo del pool
+            logger.warning("No se pudo deshacer el lote '%s': %s", self.journal_path, e)
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(resultado)
@@ -0,0 +1,42 @@
+"""
+Registro bajo demanda de los iconos de la interfaz (prefijo ':/icons').
+
+Se registra el archivo binario assets/iconos.rcc, que Qt mapea en memoria
+sin pasar por Python. Si no existe (por ejemplo, en una copia sin los
+archivos generados) se importa resources_rc.py, que contiene los mismos
+iconos compilados como módulo.
+"""
+import logging
+import os
+
+from PyQt5.QtCore import QResource
+
+logger = logging.getLogger(__name__)
+
+RCC_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'iconos.rcc')
+
+_registrados = False
+
+
+def ensure_icons_registered() -> bool:
+    """
+    Registra los iconos la primera vez que se llama.
+
+    Returns:
+        True si los iconos quedaron disponibles.
+    """
+    global _registrados
+    if _registrados:
+        return True
+    if os.path.exists(RCC_PATH) and QResource.registerResource(RCC_PATH):
+        _registrados = True
+        return True
+    try:
+        from . import resources_rc  # noqa: F401  (se registra al importarse)
+    except ImportError:
+        logger.warning("No se encontraron 'iconos.rcc' ni 'resources_rc.py'. "
+                       "Asegúrate de haber compilado 'iconos.qrc'. "
+                       "Los iconos definidos en el .ui pueden no cargarse.")
+        return False
+    _registrados = True
+    return True
@@ -1,45 +1,43 @@
 """
 Ventana principal para procesar y renombrar imágenes escaneadas de guías de envío.
 """
+import logging
 import os
 import sys
+import threading
+import zlib
 from typing import Dict, List, Optional
 
 # PyQt imports
-from PyQt5 import QtCore, QtGui, QtWidgets, uic
-from PyQt5.QtWidgets import QMainWindow, QListWidgetItem, QMessageBox, QLabel, QLineEdit, QPushButton
-from PyQt5.QtCore import Qt, QEvent
+from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5.QtWidgets import QMainWindow, QMessageBox, QLabel, QLineEdit, QPushButton
+from PyQt5.QtCore import Qt, QEvent, QTimer
 from PyQt5.QtGui import QPixmap
 
-# Core imports
-try:
-    from src.core import processing_handler
-except ImportError as e:
-    error_msg = f"Error Crítico: No se pudieron importar los módulos core: {e}"
-    print(error_msg)
-    sys.exit(error_msg)
-
-# Local imports
-try:
-    from . import resources_rc
-    print("Archivo de recursos 'resources_rc.py' importado correctamente.")
-except ImportError:
-    print("ADVERTENCIA: No se encontró 'resources_rc.py'. "
-          "Asegúrate de haber compilado 'iconos.qrc'. "
-          "Los iconos definidos en el .ui pueden no cargarse.")
-
 # Imports de componentes y utilidades
+from src.ui.icon_resources import ensure_icons_registered
 from src.ui.components.image_preview import ImagePreviewComponent
+from src.ui.components.preview_prefetcher import PreviewPrefetcher
 from src.ui.components.item_processor import ItemProcessor
 from src.ui.controllers.item_list_controller import ItemListController 
 from src.ui.controllers.processing_controller import ProcessingController
+from src.ui.controllers.processing_worker import import_main_thread_engines
+from src.ui.controllers.import_controller import ImportController
+from src.utils import startup_profiler
 from src.utils.ui_helpers import configure_tooltips, set_widgets_enabled, clear_preview_widgets
-from src.utils.message_helpers import show_error_message, show_warning_message, show_info_message, confirm_action, create_processing_summary
-from src.utils.file_helpers import get_image_files_dialog, is_valid_filename
+from src.utils.message_helpers import show_error_message, show_warning_message, show_info_message, confirm_action, create_processing_summary, create_undo_summary
+from src.utils.file_helpers import get_image_files_dialog, get_image_folder_dialog, is_valid_filename
+
+logger = logging.getLogger(__name__)
 
 # UI path
 UI_PATH = os.path.join(os.path.dirname(__file__), 'ui_files', 'Main_Window.ui')
 
+# Espera tras el último cambio de selección antes de mostrar la imagen (ms)
+RETARDO_SELECCION_MS = 80
+# Espera tras mostrar la ventana antes de precargar los motores de extracción (ms)
+RETARDO_PRECARGA_MS = 300
+
 
 class MainWindow(QMainWindow):
     """
@@ -53,25 +51,41 @@ class MainWindow(QMainWindow):
 
         # Configurar la interfaz de usuario
         self._cargar_ui()
+        startup_profiler.mark("MainWindow: UI cargada")
 
         # Salir si la carga de UI falló
-        if not hasattr(self, 'centralwidget'):
+        if self.centralWidget() is None:
             print("Error fatal post-carga: La UI no parece haberse cargado correctamente. Saliendo.")
             sys.exit(1)
 
         # Inicializar controladores y componentes
         self._inicializar_componentes()
+        startup_profiler.mark("MainWindow: componentes")
         self._conectar_eventos()
         self._inicializar_estado_ui()
+        self._motores_precargados = False
+        startup_profiler.mark("MainWindow: eventos y estado inicial")
 
     # =====================================
     # ===== INICIALIZACIÓN Y CONFIGURACIÓN =====
     # =====================================
 
     def _cargar_ui(self) -> None:
-        """Carga la interfaz de usuario desde el archivo .ui."""
+        """
+        Construye la interfaz con la clase generada desde el archivo .ui.
+
+        Si el módulo generado no existe o no corresponde al .ui actual (se
+        editó el .ui sin regenerarlo), se interpreta el .ui con uic.loadUi.
+        """
+        ensure_icons_registered()
         try:
-            uic.loadUi(UI_PATH, self)
+            ui_generada = self._clase_ui_generada()
+            if ui_generada:
+                self.ui = ui_generada()
+                self.ui.setupUi(self)
+            else:
+                from PyQt5 import uic
+                uic.loadUi(UI_PATH, self)
             self._buscar_widgets_principales()
         except FileNotFoundError:
             mensaje = f"No se pudo encontrar el archivo UI en {UI_PATH}"
@@ -84,6 +98,24 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(None, "Error de Inicialización", mensaje)
             sys.exit(1)
 
+    @staticmethod
+    def _clase_ui_generada():
+        """Devuelve Ui_MainWindow de ui_main_window.py si está al día con el .ui, o None."""
+        try:
+            from src.ui.ui_main_window import Ui_MainWindow, UI_CRC32
+        except ImportError:
+            return None
+        try:
+            with open(UI_PATH, 'rb') as f:
+                actual = zlib.crc32(f.read())
+        except OSError:
+            return Ui_MainWindow  # Sin el .ui (ejecutable empaquetado): vale la clase generada
+        if actual != UI_CRC32:
+            logger.warning("'ui_main_window.py' no corresponde a 'Main_Window.ui'; se carga el .ui. "
+                           "Regenera con 'python lectorcode-pyinstaller/scripts/build_helpers.py'.")
+            return None
+        return Ui_MainWindow
+
     def _buscar_widgets_principales(self) -> None:
         """Busca y guarda referencias a los widgets principales de la UI."""
         # Widgets de visualización
@@ -91,7 +123,7 @@ class MainWindow(QMainWindow):
         self.label_nombre_archivo = self.findChild(QLabel, "label_nombre_archivo")
         
         # Widgets de interacción
-        self.lista_imagenes = self.findChild(QtWidgets.QListWidget, "lista_imagenes")
+        self.lista_imagenes = self.findChild(QtWidgets.QListView, "lista_imagenes")
         self.linea_edicion_texto = self.findChild(QLineEdit, "linea_edicion_texto")
         self.boton_guardar = self.findChild(QPushButton, "boton_guardar")
         
@@ -104,9 +136,11 @@ class MainWindow(QMainWindow):
         self.boton_volver_imagen = self.findChild(QPushButton, "boton_volver_imagen")
         self.boton_siguiente_imagen = self.findChild(QPushButton, "boton_siguiente_imagen")
         self.boton_cargar = self.findChild(QPushButton, "boton_cargar")
+        self.boton_cargar_carpeta = self.findChild(QPushButton, "boton_cargar_carpeta")
         self.boton_procesar = self.findChild(QPushButton, "boton_procesar")
         self.boton_seleccionar_todo = self.findChild(QPushButton, "boton_seleccionar_todo") 
         self.boton_deseleccionar = self.findChild(QPushButton, "boton_deseleccionar")
+        self.boton_deshacer_lote = self.findChild(QPushButton, "boton_deshacer_lote")
 
         # Verificar widgets críticos
         self._verificar_widgets_criticos()
@@ -131,13 +165,30 @@ class MainWindow(QMainWindow):
         # Controladores
         self.item_list_controller = ItemListController(self.lista_imagenes)
         self.processing_controller = ProcessingController(self)
+        self.import_controller = ImportController(self.item_list_controller)
         
         # Componentes
         self.image_preview = ImagePreviewComponent(self.label_preview, self.label_nombre_archivo)
+        self.preview_prefetcher = PreviewPrefetcher(
+            self.image_preview.loader,
+            self.item_list_controller.get_path_at,
+            self.item_list_controller.get_item_count,
+        )
+        
+        # Los cambios de selección se agrupan: solo se muestra la última fila
+        self._temporizador_seleccion = QTimer(self)
+        self._temporizador_seleccion.setSingleShot(True)
+        self._temporizador_seleccion.setInterval(RETARDO_SELECCION_MS)
+        self._temporizador_seleccion.timeout.connect(self._aplicar_seleccion)
         
         # Instalar filtro de eventos en la lista
         if hasattr(self, 'lista_imagenes'):
             self.lista_imagenes.installEventFilter(self)
+        # Aceptar carpetas y archivos arrastrados sobre la ventana
+        self.setAcceptDrops(True)
+        # Re-escalar la previsualización al cambiar el tamaño del label
+        if hasattr(self, 'label_preview'):
+            self.label_preview.installEventFilter(self)
 
     def _conectar_eventos(self) -> None:
         """Conecta las señales de los widgets a los métodos correspondientes."""
@@ -149,19 +200,25 @@ class MainWindow(QMainWindow):
         """Conecta los botones principales de la interfaz."""
         if hasattr(self, 'boton_cargar'): 
             self.boton_cargar.clicked.connect(self.cargar_imagenes)
+        if self.boton_cargar_carpeta:
+            self.boton_cargar_carpeta.clicked.connect(self.cargar_carpeta)
         if hasattr(self, 'boton_procesar'): 
             self.boton_procesar.clicked.connect(self.procesar_seleccionados)
         if hasattr(self, 'boton_seleccionar_todo'): 
             self.boton_seleccionar_todo.clicked.connect(self.seleccionar_todo)
         if hasattr(self, 'boton_deseleccionar'): 
             self.boton_deseleccionar.clicked.connect(self.deseleccionar_todo)
+        if self.boton_deshacer_lote:
+            self.boton_deshacer_lote.clicked.connect(self.deshacer_ultimo_lote)
 
     def _conectar_lista_imagenes(self) -> None:
         """Conecta eventos de la lista de imágenes."""
         if hasattr(self, 'item_list_controller'):
-            self.item_list_controller.connect_item_clicked(self._item_seleccionado_cambiado)
+            # Un clic también cambia la fila actual: basta con una sola señal
             self.item_list_controller.connect_current_item_changed(self._item_seleccionado_cambiado)
-            self.item_list_controller.connect_item_changed(self.actualizar_estado_ui)
+            # Solo el contador de marcados afecta a los botones: no recalcular en cada cambio
+            self.item_list_controller.connect_checked_count_changed(
+                self._actualizar_estado_botones_procesamiento)
         else:
             print("Error Crítico: No se pudo inicializar el controlador de lista de imágenes.")
 
@@ -174,7 +231,7 @@ class MainWindow(QMainWindow):
         if self.boton_siguiente_imagen:
             self.boton_siguiente_imagen.clicked.connect(self._navegar_siguiente_imagen)
         if self.linea_edicion_texto:
-            self.linea_edicion_texto.textChanged.connect(self.actualizar_estado_ui)
+            self.linea_edicion_texto.textChanged.connect(self._actualizar_estado_boton_guardar)
 
     def _inicializar_estado_ui(self) -> None:
         """Configura el estado inicial de los widgets de la interfaz."""
@@ -198,9 +255,13 @@ class MainWindow(QMainWindow):
         """Configura los tooltips (textos de ayuda) para los widgets."""
         tooltips = {
             'boton_cargar': "Cargar archivos de imagen escaneados",
+            'boton_cargar_carpeta': "Cargar todas las imágenes de una carpeta y sus subcarpetas "
+                                    "(también se pueden arrastrar carpetas a la ventana)",
             'boton_procesar': "Procesar los archivos seleccionados (OCR/Barcode y renombrar)",
             'linea_edicion_texto': "Editar nombre base manualmente si falla el automático",
             'boton_guardar': "Guardar el nombre editado manualmente para el archivo seleccionado",
+            'boton_deshacer_lote': "Devolver a su nombre original los archivos del último lote "
+                                   "procesado (se puede repetir con los lotes anteriores)",
             'boton_volver_imagen': "Ver guía anterior",
             'boton_siguiente_imagen': "Ver guía siguiente"
         }
@@ -215,14 +276,12 @@ class MainWindow(QMainWindow):
         if not hasattr(self, 'lista_imagenes'): 
             return
 
-        items_chequeados = self.item_list_controller.get_checked_items()
-        item_actual = self.item_list_controller.get_current_item()
-        num_chequeados = len(items_chequeados)
+        num_chequeados = self.item_list_controller.get_checked_count()
         num_total_items = self.item_list_controller.get_item_count()
         fila_actual = self.item_list_controller.get_current_row()
 
         self._actualizar_estado_botones_procesamiento(num_chequeados)
-        self._actualizar_estado_edicion_manual(item_actual)
+        self._actualizar_estado_edicion_manual(fila_actual)
         self._actualizar_estado_navegacion(fila_actual, num_total_items)
 
     def _actualizar_estado_botones_procesamiento(self, num_chequeados: int) -> None:
@@ -230,17 +289,22 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'boton_procesar'):
             self.boton_procesar.setEnabled(num_chequeados > 0)
 
-    def _actualizar_estado_edicion_manual(self, item_actual: Optional[QListWidgetItem]) -> None:
+    def _actualizar_estado_edicion_manual(self, fila_actual: int) -> None:
         """Actualiza el estado de los controles de edición manual."""
-        habilitar_edicion = (item_actual is not None)
+        habilitar_edicion = (fila_actual >= 0)
         
         if self.linea_edicion_texto:
             self.linea_edicion_texto.setEnabled(habilitar_edicion)
             if not habilitar_edicion:
                 self.linea_edicion_texto.clear()
 
+        self._actualizar_estado_boton_guardar()
+
+    def _actualizar_estado_boton_guardar(self, *args) -> None:
+        """Habilita el botón guardar si hay una fila actual y un nombre escrito."""
         if self.boton_guardar:
-            puede_guardar = habilitar_edicion and bool(self.linea_edicion_texto.text().strip())
+            puede_guardar = (self.item_list_controller.get_current_row() >= 0
+                             and bool(self.linea_edicion_texto.text().strip()))
             self.boton_guardar.setEnabled(puede_guardar)
 
     def _actualizar_estado_navegacion(self, fila_actual: int, num_total_items: int) -> None:
@@ -256,9 +320,9 @@ class MainWindow(QMainWindow):
     def _set_controles_habilitados(self, habilitado: bool) -> None:
         """Habilita/deshabilita controles durante operaciones largas."""
         widgets_a_controlar = [
-            'boton_cargar', 'boton_seleccionar_todo', 'boton_deseleccionar',
+            'boton_cargar', 'boton_cargar_carpeta', 'boton_seleccionar_todo', 'boton_deseleccionar',
             'lista_imagenes', 'boton_procesar', 'linea_edicion_texto',
-            'boton_guardar', 'boton_volver_imagen', 'boton_siguiente_imagen'
+            'boton_guardar', 'boton_volver_imagen', 'boton_siguiente_imagen', 'boton_deshacer_lote'
         ]
         set_widgets_enabled(self, widgets_a_controlar, habilitado)
 
@@ -280,10 +344,11 @@ class MainWindow(QMainWindow):
         if not archivos: 
             return
 
-        # Limpiar y cargar nuevos archivos
+        # Limpiar y cargar nuevos archivos (el diálogo solo devuelve archivos existentes)
+        self.import_controller.cancel()
         self.item_list_controller.clear_list()
         self._limpiar_widgets_visualizacion()
-        archivos_cargados_count = self.item_list_controller.load_files(archivos)
+        archivos_cargados_count = self.item_list_controller.load_files(archivos, check_exists=False)
         
         print(f"Se cargaron {archivos_cargados_count} archivos.")
         
@@ -291,26 +356,65 @@ class MainWindow(QMainWindow):
         self.item_list_controller.select_first_item()
         self.actualizar_estado_ui()
 
-    def _item_seleccionado_cambiado(self, item_actual, item_previo=None) -> None:
-        """Actualiza UI cuando el item actual cambia (clic o teclado)."""
-        item_a_mostrar = None
-        if isinstance(item_actual, QListWidgetItem):
-            item_a_mostrar = item_actual
+    def cargar_carpeta(self) -> None:
+        """Abre un diálogo para elegir una carpeta e importa sus imágenes recursivamente."""
+        carpeta = get_image_folder_dialog(self)
+        if not carpeta:
+            return
+
+        self.item_list_controller.clear_list()
+        self._limpiar_widgets_visualizacion()
+        self._importar_rutas([carpeta])
+
+    def _importar_rutas(self, rutas: List[str]) -> None:
+        """Importa carpetas y/o archivos en segundo plano, añadiéndolos a la lista."""
+        logger.info("Importando: %s", ", ".join(rutas))
+        self.import_controller.import_paths(rutas, finished_callback=self._importacion_terminada)
+
+    def _importacion_terminada(self, archivos_importados: int) -> None:
+        """Se llama cuando termina el recorrido de carpetas."""
+        logger.info("Se importaron %d archivos.", archivos_importados)
+        self.actualizar_estado_ui()
 
-        print(f"Item seleccionado cambiado a: {item_a_mostrar.text() if item_a_mostrar else 'None'}")
+    def _item_seleccionado_cambiado(self, fila: int) -> None:
+        """
+        Registra un cambio de fila actual (clic o teclado).
+        
+        La previsualización y el panel de edición se actualizan al dejar de
+        cambiar la selección, de modo que al recorrer la lista rápidamente
+        solo se decodifica la imagen en la que se detiene el operador.
+        """
+        self.image_preview.cancel_pending()
+        self._temporizador_seleccion.start()
+
+    def _aplicar_seleccion_pendiente(self) -> None:
+        """Aplica de inmediato un cambio de selección que aún esté en espera."""
+        if self._temporizador_seleccion.isActive():
+            self._temporizador_seleccion.stop()
+            self._aplicar_seleccion()
+
+    def _aplicar_seleccion(self) -> None:
+        """Actualiza la UI con la fila actual (la última seleccionada)."""
+        fila = self.item_list_controller.get_current_row()
+        nombre = self.item_list_controller.get_name_at(fila) if fila >= 0 else None
+
+        print(f"Item seleccionado cambiado a: {nombre}")
 
         # Actualizar previsualización y edición
-        self.image_preview.show_preview(item_a_mostrar)
-        self.preparar_edicion_manual(item_a_mostrar)
+        self.image_preview.show_preview(self.item_list_controller.get_path_at(fila), nombre)
+        if nombre is not None:
+            # Decodificar de antemano las imágenes vecinas
+            self.preview_prefetcher.on_current_changed(fila, self.label_preview.size())
+        self.preparar_edicion_manual(fila)
         self.actualizar_estado_ui()
 
-    def preparar_edicion_manual(self, item: Optional[QListWidgetItem]) -> None:
-        """Prepara el QLineEdit para edición manual basado en el item seleccionado."""
+    def preparar_edicion_manual(self, fila: int) -> None:
+        """Prepara el QLineEdit para edición manual basado en la fila seleccionada."""
         if not self.linea_edicion_texto: 
             return
 
-        if item:
-            nombre_actual = item.text()
+        if fila >= 0:
+            nombre_actual = self.item_list_controller.get_name_at(fila)
             nombre_base, _ = os.path.splitext(nombre_actual)
             self.linea_edicion_texto.setText(nombre_base)
         else:
@@ -318,8 +422,9 @@ class MainWindow(QMainWindow):
 
     def guardar_nombre_manual(self) -> None:
         """Guarda el nombre editado manualmente para el item actualmente seleccionado."""
-        item_actual = self.item_list_controller.get_current_item()
-        if not item_actual:
+        self._aplicar_seleccion_pendiente()
+        fila_actual = self.item_list_controller.get_current_row()
+        if fila_actual < 0:
             show_warning_message(self, "Guardar Manual", 
                                "Por favor, selecciona un archivo de la lista para renombrar.")
             return
@@ -333,10 +438,11 @@ class MainWindow(QMainWindow):
             return
             
         # Procesar el renombrado
-        resultado = ItemProcessor.rename_item_manual(item_actual, nuevo_nombre_base)
-        self._procesar_resultado_renombrado(item_actual, resultado)
+        modelo = self.item_list_controller.model
+        resultado = ItemProcessor.rename_item_manual(modelo, fila_actual, nuevo_nombre_base)
+        self._procesar_resultado_renombrado(fila_actual, resultado)
 
-    def _procesar_resultado_renombrado(self, item: QListWidgetItem, resultado: dict) -> None:
+    def _procesar_resultado_renombrado(self, fila: int, resultado: dict) -> None:
         """Procesa el resultado de un intento de renombrado manual."""
         status = resultado.get("status", "")
         
@@ -344,13 +450,14 @@ class MainWindow(QMainWindow):
             # Renombrado exitoso - Pedir confirmación
             nuevo_nombre = resultado["new_name"]
             nueva_ruta = resultado["new_path"]
+            nombre_actual = self.item_list_controller.get_name_at(fila)
             
             # Usar QMessageBox.No como botón por defecto en lugar de QMessageBox.Cancel
             if confirm_action(self, 'Confirmar Renombrado Manual',
-                             f"¿Renombrar '{item.text()}' a '{nuevo_nombre}'?",
+                             f"¿Renombrar '{nombre_actual}' a '{nuevo_nombre}'?",
                              QMessageBox.No):
-                # Actualizar item
-                ItemProcessor.update_renamed_item(item, nuevo_nombre, nueva_ruta)
+                # Actualizar fila
+                ItemProcessor.update_renamed_item(self.item_list_controller.model, fila, nueva_ruta)
                 show_info_message(self, "Éxito", f"Archivo renombrado a:\n'{nuevo_nombre}'")
                 
         elif status == "no_rename_needed":
@@ -391,42 +498,137 @@ class MainWindow(QMainWindow):
 
     def procesar_seleccionados(self) -> None:
         """Procesa todos los items seleccionados con checkmark."""
-        items_a_procesar = self.item_list_controller.get_checked_items()
+        filas_a_procesar = self.item_list_controller.get_checked_rows()
         
-        if not items_a_procesar:
+        if not filas_a_procesar:
             show_warning_message(self, "Sin Selección", 
                                "Por favor, selecciona (marca) al menos un archivo para procesar.")
             return
 
-        # Procesar los items
-        resultados = self.processing_controller.process_items(
-            items_a_procesar, 
-            self._set_controles_habilitados
+        # Procesar los items en segundo plano; el resumen se muestra al terminar
+        total_seleccionados = len(filas_a_procesar)
+        self.processing_controller.process_items(
+            self.item_list_controller.model,
+            filas_a_procesar, 
+            self._set_controles_habilitados,
+            lambda resultados: self._mostrar_resumen_procesamiento(resultados, total_seleccionados)
         )
-        
-        # Mostrar resumen
-        create_processing_summary(self, resultados, len(items_a_procesar))
+
+    def _mostrar_resumen_procesamiento(self, resultados: dict, total_seleccionados: int) -> None:
+        """Muestra el resumen de un lote terminado o cancelado."""
+        create_processing_summary(self, resultados, total_seleccionados)
+
+    def deshacer_ultimo_lote(self) -> None:
+        """Deshace, tras confirmarlo, el lote más reciente que aún tenga renombrados aplicados."""
+        if self.processing_controller.is_processing():
+            return
+        from src.core import rename_journal
+        ultimo = rename_journal.latest_undoable()
+        if not ultimo:
+            show_info_message(self, "Deshacer Lote", "No hay ningún lote con renombrados que deshacer.")
+            return
+        diario, aplicados = ultimo
+        if not confirm_action(self, "Confirmar Deshacer Lote",
+                              f"¿Devolver {len(aplicados)} archivos a su nombre original?\n\n"
+                              f"Diario: {diario}", QMessageBox.No):
+            return
+
+        # Los renombrados se deshacen en segundo plano (en una carpeta de red
+        # pueden ser miles); la lista se actualiza al llegar el resultado
+        QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
+        self.processing_controller.undo_batch(
+            diario,
+            self._set_controles_habilitados,
+            self._lote_deshecho,
+            lambda mensaje: self._deshacer_fallido(diario, mensaje),
+        )
+
+    def _lote_deshecho(self, resultado: Dict) -> None:
+        """Refleja en la lista los archivos devueltos a su nombre y muestra el resumen."""
+        QtWidgets.QApplication.restoreOverrideCursor()
+        ItemProcessor.apply_undo(self.item_list_controller.model, resultado["restored"])
+        self._aplicar_seleccion()
+        create_undo_summary(self, resultado)
+
+    def _deshacer_fallido(self, diario: str, mensaje: str) -> None:
+        """Informa de que no se pudo leer el diario del lote."""
+        QtWidgets.QApplication.restoreOverrideCursor()
+        show_error_message(self, "Deshacer Lote", f"No se pudo leer el diario '{diario}':\n{mensaje}")
 
     # ==================================
     # ===== EVENTOS DE LA VENTANA =====
     # ==================================
 
     def eventFilter(self, source, event) -> bool:
-        """Filtro de eventos para manejo de teclas en la lista."""
+        """Filtro de eventos para manejo de teclas en la lista y redimensionado de la previsualización."""
+        if hasattr(self, 'label_preview') and source is self.label_preview:
+            if event.type() == QEvent.Resize:
+                self.image_preview.refresh()
+                
         if hasattr(self, 'lista_imagenes') and source is self.lista_imagenes:
             if event.type() == QEvent.KeyPress:
-                # El QListWidget maneja las teclas de navegación internamente
+                # La QListView maneja las teclas de navegación internamente
                 pass
                 
         # Comportamiento normal para eventos no manejados
         return super(MainWindow, self).eventFilter(source, event)
 
+    def dragEnterEvent(self, event: QtGui.QDragEnterEvent) -> None:
+        """Acepta archivos y carpetas locales arrastrados sobre la ventana."""
+        if (event.mimeData().hasUrls() and not self.processing_controller.is_processing()
+                and any(url.isLocalFile() for url in event.mimeData().urls())):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dropEvent(self, event: QtGui.QDropEvent) -> None:
+        """Añade a la lista las imágenes de los archivos y carpetas soltados."""
+        rutas = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if not rutas or self.processing_controller.is_processing():
+            event.ignore()
+            return
+        event.acceptProposedAction()
+        self._importar_rutas(rutas)
+
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        """Tras mostrar la ventana por primera vez, precarga los motores en segundo plano."""
+        super(MainWindow, self).showEvent(event)
+        if not self._motores_precargados:
+            self._motores_precargados = True
+            QTimer.singleShot(RETARDO_PRECARGA_MS, self._precargar_motores)
+
+    def _precargar_motores(self) -> None:
+        """
+        Importa processing_handler en un hilo aparte.
+
+        Pillow, pyzbar (con la librería ZBar), pytesseract y la búsqueda de
+        Tesseract/tessdata del ejecutable ya no retrasan la aparición de la
+        ventana; si el usuario procesa antes de que termine, el import se
+        completa en ese momento.
+        """
+        def precargar():
+            try:
+                from src.core import processing_handler  # noqa: F401
+            except (Exception, SystemExit) as e:
+                logger.warning("No se pudieron precargar los motores de extracción: %s", e)
+            # Última fase del perfil de arranque: motores listos para el primer lote
+            startup_profiler.mark("motores precargados (segundo plano)")
+            startup_profiler.finish()
+
+        startup_profiler.mark("precarga de motores iniciada")
+        import_main_thread_engines()  # Unos pocos ms; el resto, en el hilo
+        startup_profiler.mark("ocr_engine importado (hilo principal)")
+        threading.Thread(target=precargar, name="precarga-motores", daemon=True).start()
+
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         """Intercepta el evento de cierre para pedir confirmación."""
         if confirm_action(self, 'Confirmar Salida', 
                          "¿Estás seguro de que quieres salir?", 
                          QMessageBox.No):
             print("Cerrando la aplicación...")
+            # Detener el lote en curso; el archivo actual no se renombrará
+            self.processing_controller.shutdown()
+            self.import_controller.cancel()
             event.accept()
         else:
             print("Cierre cancelado.")
@@ -0,0 +1,231 @@
+"""
+Modelo de la lista de imágenes escaneadas.
+
+En lugar de un QListWidgetItem por archivo, los datos se guardan por
+columnas compactas: los directorios se internan (cada carpeta se guarda una
+sola vez y cada fila solo apunta a ella) y el estado y la marca de cada fila
+viven en arrays de bytes. El texto, los colores y la ruta completa se
+calculan al vuelo solo para las filas visibles.
+
+Los contadores de filas marcadas y por estado se mantienen de forma
+incremental, de modo que consultar el estado de la interfaz cuesta lo mismo
+con 50 que con 50.000 archivos.
+"""
+import os
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
+
+# Rol con la ruta completa del archivo (mismo que usaba la lista anterior)
+PathRole = Qt.UserRole
+
+# Estados de una fila
+STATUS_PENDIENTE = 0
+STATUS_RENOMBRADO = 1
+STATUS_YA_CORRECTO = 2
+STATUS_NO_RECONOCIDO = 3
+STATUS_DESTINO_EXISTE = 4
+STATUS_ERROR_RENOMBRADO = 5
+STATUS_ERROR = 6
+STATUS_ERROR_RUTA = 7
+STATUS_RENOMBRADO_MANUAL = 8
+
+# Estado -> (sufijo mostrado tras el nombre, color de fondo, color de texto)
+_ESTILOS: Dict[int, Tuple[str, QColor, QColor]] = {
+    STATUS_PENDIENTE: ("", QColor('white'), QColor('black')),
+    STATUS_RENOMBRADO: ("", QColor(204, 255, 204), QColor('black')),
+    STATUS_YA_CORRECTO: (" [Ya correcto]", QColor(220, 220, 220), QColor('black')),
+    STATUS_NO_RECONOCIDO: (" [No reconocido]", QColor(255, 230, 204), QColor('black')),
+    STATUS_DESTINO_EXISTE: (" [Destino existe]", QColor(255, 255, 204), QColor('black')),
+    STATUS_ERROR_RENOMBRADO: (" [Error al renombrar]", QColor(255, 153, 153), QColor('black')),
+    STATUS_ERROR: (" [Error]", QColor(255, 153, 153), QColor('black')),
+    STATUS_ERROR_RUTA: (" [Error Ruta]", QColor(255, 0, 0), QColor('white')),
+    STATUS_RENOMBRADO_MANUAL: ("", QColor(220, 255, 220), QColor('black')),
+}
+_SUFIJOS = {estado: sufijo for estado, (sufijo, _, _) in _ESTILOS.items()}
+_FONDOS = {estado: QBrush(fondo) for estado, (_, fondo, _) in _ESTILOS.items()}
+_TEXTOS = {estado: QBrush(texto) for estado, (_, _, texto) in _ESTILOS.items()}
+
+_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+
+class ImageListModel(QAbstractListModel):
+    """Modelo de lista con almacenamiento por columnas para decenas de miles de archivos."""
+
+    # Nuevo número de filas marcadas (solo se emite cuando cambia)
+    checkedCountChanged = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._dirs: List[str] = []
+        self._dir_ids: Dict[str, int] = {}
+        self._row_dir = array('I')
+        self._names: List[str] = []
+        self._status = bytearray()
+        self._checked = bytearray()
+        self._checked_count = 0
+        self._status_counts = [0] * len(_ESTILOS)
+
+    # ----- API de Qt -----
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names)
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        return _FLAGS if index.isValid() else Qt.NoItemFlags
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self._names[row] + _SUFIJOS[self._status[row]]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        if role == Qt.BackgroundRole:
+            return _FONDOS[self._status[row]]
+        if role == Qt.ForegroundRole:
+            return _TEXTOS[self._status[row]]
+        if role == PathRole or role == Qt.ToolTipRole:
+            return self.path(row)
+        return None
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        self.set_checked(index.row(), value == Qt.Checked)
+        return True
+
+    # ----- Carga -----
+
+    def append_paths(self, paths: Iterable[str]) -> int:
+        """
+        Añade archivos al final de la lista con una sola notificación a la vista.
+
+        Args:
+            paths: Rutas completas de los archivos
+
+        Returns:
+            Número de filas añadidas
+        """
+        paths = list(paths)
+        if not paths:
+            return 0
+        inicio = len(self._names)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(paths) - 1)
+        for path in paths:
+            carpeta, nombre = os.path.split(path)
+            self._row_dir.append(self._intern_dir(carpeta))
+            self._names.append(nombre)
+        self._status.extend(bytes(len(paths)))
+        self._checked.extend(bytes(len(paths)))
+        self._status_counts[STATUS_PENDIENTE] += len(paths)
+        self.endInsertRows()
+        return len(paths)
+
+    def clear(self) -> None:
+        """Elimina todas las filas."""
+        self.beginResetModel()
+        self._dirs.clear()
+        self._dir_ids.clear()
+        self._row_dir = array('I')
+        self._names.clear()
+        self._status.clear()
+        self._checked.clear()
+        self._status_counts = [0] * len(_ESTILOS)
+        self.endResetModel()
+        self._set_checked_count(0)
+
+    # ----- Consulta -----
+
+    def path(self, row: int) -> Optional[str]:
+        """Ruta completa del archivo de una fila, o None si la fila no existe."""
+        if not 0 <= row < len(self._names):
+            return None
+        return os.path.join(self._dirs[self._row_dir[row]], self._names[row])
+
+    def name(self, row: int) -> str:
+        """Nombre del archivo de una fila (sin el sufijo de estado)."""
+        return self._names[row]
+
+    def status(self, row: int) -> int:
+        """Estado de una fila."""
+        return self._status[row]
+
+    def is_checked(self, row: int) -> bool:
+        """Indica si una fila está marcada."""
+        return bool(self._checked[row])
+
+    def checked_rows(self) -> List[int]:
+        """Filas marcadas, en orden."""
+        filas = []
+        fila = self._checked.find(1)
+        while fila != -1:
+            filas.append(fila)
+            fila = self._checked.find(1, fila + 1)
+        return filas
+
+    def checked_count(self) -> int:
+        """Número de filas marcadas."""
+        return self._checked_count
+
+    def status_count(self, status: int) -> int:
+        """Número de filas en un estado."""
+        return self._status_counts[status]
+
+    # ----- Modificación -----
+
+    def set_checked(self, row: int, checked: bool) -> None:
+        """Marca o desmarca una fila."""
+        valor = 1 if checked else 0
+        if self._checked[row] != valor:
+            self._checked[row] = valor
+            self._emit_row_changed(row, [Qt.CheckStateRole])
+            self._set_checked_count(self._checked_count + (1 if valor else -1))
+
+    def set_all_checked(self, checked: bool) -> None:
+        """Marca o desmarca todas las filas con una sola notificación."""
+        if not self._names:
+            return
+        self._checked[:] = (b'\x01' if checked else b'\x00') * len(self._checked)
+        self.dataChanged.emit(
+            self.index(0), self.index(len(self._names) - 1), [Qt.CheckStateRole]
+        )
+        self._set_checked_count(len(self._checked) if checked else 0)
+
+    def set_status(self, row: int, status: int) -> None:
+        """Cambia el estado (y con él el sufijo y los colores) de una fila."""
+        anterior = self._status[row]
+        if anterior != status:
+            self._status[row] = status
+            self._status_counts[anterior] -= 1
+            self._status_counts[status] += 1
+            self._emit_row_changed(row, [Qt.DisplayRole, Qt.BackgroundRole, Qt.ForegroundRole])
+
+    def set_path(self, row: int, path: str) -> None:
+        """Actualiza la ruta de una fila (p. ej. tras renombrar el archivo)."""
+        carpeta, nombre = os.path.split(path)
+        self._row_dir[row] = self._intern_dir(carpeta)
+        self._names[row] = nombre
+        self._emit_row_changed(row, [Qt.DisplayRole, PathRole, Qt.ToolTipRole])
+
+    # ----- Internos -----
+
+    def _intern_dir(self, carpeta: str) -> int:
+        """Devuelve el identificador de una carpeta, registrándola la primera vez."""
+        ident = self._dir_ids.get(carpeta)
+        if ident is None:
+            ident = self._dir_ids[carpeta] = len(self._dirs)
+            self._dirs.append(carpeta)
+        return ident
+
+    def _set_checked_count(self, count: int) -> None:
+        """Actualiza el contador de filas marcadas y avisa si cambió."""
+        if count != self._checked_count:
+            self._checked_count = count
+            self.checkedCountChanged.emit(count)
+
+    def _emit_row_changed(self, row: int, roles: List[int]) -> None:
+        index = self.index(row)
+        self.dataChanged.emit(index, index, roles)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'src/ui/ui_files/Main_Window.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1061, 797)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.frame = QtWidgets.QFrame(self.centralwidget)
+        self.frame.setStyleSheet("background-color: rgb(40, 75, 99);")
+        self.frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame.setObjectName("frame")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.frame)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.groupBox = QtWidgets.QGroupBox(self.frame)
+        self.groupBox.setStyleSheet("background-color: rgb(48, 92, 121);")
+        self.groupBox.setTitle("")
+        self.groupBox.setObjectName("groupBox")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.groupBox)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.frame_bar = QtWidgets.QFrame(self.groupBox)
+        self.frame_bar.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_bar.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_bar.setObjectName("frame_bar")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.frame_bar)
+        self.horizontalLayout_2.setContentsMargins(0, 0, 0, -1)
+        self.horizontalLayout_2.setSpacing(0)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.boton_cargar = QtWidgets.QPushButton(self.frame_bar)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.boton_cargar.sizePolicy().hasHeightForWidth())
+        self.boton_cargar.setSizePolicy(sizePolicy)
+        self.boton_cargar.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.boton_cargar.setObjectName("boton_cargar")
+        self.horizontalLayout_2.addWidget(self.boton_cargar)
+        self.boton_cargar_carpeta = QtWidgets.QPushButton(self.frame_bar)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.boton_cargar_carpeta.sizePolicy().hasHeightForWidth())
+        self.boton_cargar_carpeta.setSizePolicy(sizePolicy)
+        self.boton_cargar_carpeta.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.boton_cargar_carpeta.setObjectName("boton_cargar_carpeta")
+        self.horizontalLayout_2.addWidget(self.boton_cargar_carpeta)
+        self.verticalLayout_3.addWidget(self.frame_bar)
+        self.boton_deseleccionar = QtWidgets.QPushButton(self.groupBox)
+        self.boton_deseleccionar.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.boton_deseleccionar.setObjectName("boton_deseleccionar")
+        self.verticalLayout_3.addWidget(self.boton_deseleccionar)
+        self.boton_seleccionar_todo = QtWidgets.QPushButton(self.groupBox)
+        self.boton_seleccionar_todo.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.boton_seleccionar_todo.setObjectName("boton_seleccionar_todo")
+        self.verticalLayout_3.addWidget(self.boton_seleccionar_todo)
+        self.lista_imagenes = QtWidgets.QListView(self.groupBox)
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        self.lista_imagenes.setFont(font)
+        self.lista_imagenes.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.lista_imagenes.setUniformItemSizes(True)
+        self.lista_imagenes.setObjectName("lista_imagenes")
+        self.verticalLayout_3.addWidget(self.lista_imagenes)
+        self.verticalLayout_3.setStretch(0, 1)
+        self.verticalLayout_3.setStretch(3, 10)
+        self.horizontalLayout.addWidget(self.groupBox)
+        self.frame_3 = QtWidgets.QFrame(self.frame)
+        self.frame_3.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_3.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_3.setObjectName("frame_3")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.frame_3)
+        self.verticalLayout_2.setSpacing(20)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.frame_2 = QtWidgets.QFrame(self.frame_3)
+        self.frame_2.setStyleSheet("background-color: rgb(224, 225, 221);\n"
+"border-radius: 10px;")
+        self.frame_2.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_2.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_2.setObjectName("frame_2")
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout(self.frame_2)
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        self.label_nombre_archivo = QtWidgets.QLabel(self.frame_2)
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI")
+        font.setPointSize(16)
+        self.label_nombre_archivo.setFont(font)
+        self.label_nombre_archivo.setObjectName("label_nombre_archivo")
+        self.horizontalLayout_4.addWidget(self.label_nombre_archivo)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_4.addItem(spacerItem)
+        self.label_logo = QtWidgets.QLabel(self.frame_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_logo.sizePolicy().hasHeightForWidth())
+        self.label_logo.setSizePolicy(sizePolicy)
+        self.label_logo.setMinimumSize(QtCore.QSize(100, 50))
+        self.label_logo.setMaximumSize(QtCore.QSize(150, 75))
+        self.label_logo.setText("")
+        self.label_logo.setPixmap(QtGui.QPixmap(":/icons/logo_madre1.png"))
+        self.label_logo.setScaledContents(True)
+        self.label_logo.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_logo.setObjectName("label_logo")
+        self.horizontalLayout_4.addWidget(self.label_logo)
+        self.verticalLayout_2.addWidget(self.frame_2)
+        self.frame_4 = QtWidgets.QFrame(self.frame_3)
+        self.frame_4.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.frame_4.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_4.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_4.setObjectName("frame_4")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.frame_4)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.frame_5 = QtWidgets.QFrame(self.frame_4)
+        self.frame_5.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_5.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_5.setObjectName("frame_5")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.frame_5)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.frame_7 = QtWidgets.QFrame(self.frame_5)
+        self.frame_7.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_7.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_7.setObjectName("frame_7")
+        self.horizontalLayout_5 = QtWidgets.QHBoxLayout(self.frame_7)
+        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
+        self.boton_volver_imagen = QtWidgets.QPushButton(self.frame_7)
+        self.boton_volver_imagen.setText("")
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(":/icons/chevron_right.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.boton_volver_imagen.setIcon(icon)
+        self.boton_volver_imagen.setObjectName("boton_volver_imagen")
+        self.horizontalLayout_5.addWidget(self.boton_volver_imagen)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_5.addItem(spacerItem1)
+        self.boton_siguiente_imagen = QtWidgets.QPushButton(self.frame_7)
+        self.boton_siguiente_imagen.setText("")
+        icon1 = QtGui.QIcon()
+        icon1.addPixmap(QtGui.QPixmap(":/icons/forward.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.boton_siguiente_imagen.setIcon(icon1)
+        self.boton_siguiente_imagen.setObjectName("boton_siguiente_imagen")
+        self.horizontalLayout_5.addWidget(self.boton_siguiente_imagen)
+        self.verticalLayout_4.addWidget(self.frame_7)
+        self.label_preview = QtWidgets.QLabel(self.frame_5)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Ignored)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_preview.sizePolicy().hasHeightForWidth())
+        self.label_preview.setSizePolicy(sizePolicy)
+        self.label_preview.setMinimumSize(QtCore.QSize(200, 200))
+        self.label_preview.setStyleSheet("background-color: rgb(200, 200, 200); border: 1px solid gray;")
+        self.label_preview.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_preview.setScaledContents(False)
+        self.label_preview.setObjectName("label_preview")
+        self.verticalLayout_4.addWidget(self.label_preview)
+        self.verticalLayout_4.setStretch(1, 1)
+        self.verticalLayout_5.addWidget(self.frame_5)
+        self.frame_6 = QtWidgets.QFrame(self.frame_4)
+        self.frame_6.setStyleSheet("background-color: rgb(48, 92, 121);")
+        self.frame_6.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_6.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_6.setObjectName("frame_6")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout(self.frame_6)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.linea_edicion_texto = QtWidgets.QLineEdit(self.frame_6)
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI")
+        font.setPointSize(14)
+        font.setBold(False)
+        font.setWeight(50)
+        self.linea_edicion_texto.setFont(font)
+        self.linea_edicion_texto.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.linea_edicion_texto.setObjectName("linea_edicion_texto")
+        self.horizontalLayout_3.addWidget(self.linea_edicion_texto)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem2)
+        self.boton_procesar = QtWidgets.QPushButton(self.frame_6)
+        self.boton_procesar.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.boton_procesar.setObjectName("boton_procesar")
+        self.horizontalLayout_3.addWidget(self.boton_procesar)
+        self.boton_guardar = QtWidgets.QPushButton(self.frame_6)
+        self.boton_guardar.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.boton_guardar.setObjectName("boton_guardar")
+        self.horizontalLayout_3.addWidget(self.boton_guardar)
+        self.boton_deshacer_lote = QtWidgets.QPushButton(self.frame_6)
+        self.boton_deshacer_lote.setStyleSheet("background-color: rgb(224, 225, 221);")
+        self.boton_deshacer_lote.setObjectName("boton_deshacer_lote")
+        self.horizontalLayout_3.addWidget(self.boton_deshacer_lote)
+        self.verticalLayout_5.addWidget(self.frame_6)
+        self.verticalLayout_5.setStretch(0, 5)
+        self.verticalLayout_5.setStretch(1, 1)
+        self.verticalLayout_2.addWidget(self.frame_4)
+        self.verticalLayout_2.setStretch(0, 1)
+        self.verticalLayout_2.setStretch(1, 5)
+        self.horizontalLayout.addWidget(self.frame_3)
+        self.horizontalLayout.setStretch(0, 2)
+        self.horizontalLayout.setStretch(1, 5)
+        self.verticalLayout.addWidget(self.frame)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Lector de Guías"))
+        self.boton_cargar.setText(_translate("MainWindow", "Cargar archivos"))
+        self.boton_cargar_carpeta.setText(_translate("MainWindow", "Cargar carpeta"))
+        self.boton_deseleccionar.setText(_translate("MainWindow", "Deseleccionar todo"))
+        self.boton_seleccionar_todo.setText(_translate("MainWindow", "Seleccionar Todo"))
+        self.label_nombre_archivo.setText(_translate("MainWindow", "Selecciona un archivo"))
+        self.boton_volver_imagen.setToolTip(_translate("MainWindow", "Imagen Anterior"))
+        self.boton_siguiente_imagen.setToolTip(_translate("MainWindow", "Siguiente Imagen"))
+        self.label_preview.setText(_translate("MainWindow", "Previsualización"))
+        self.linea_edicion_texto.setPlaceholderText(_translate("MainWindow", "Nuevo nombre (si falla el automático)"))
+        self.boton_procesar.setText(_translate("MainWindow", "Procesar"))
+        self.boton_guardar.setText(_translate("MainWindow", "Guardar Manual"))
+        self.boton_guardar.setToolTip(_translate("MainWindow", "Guarda el nombre editado para el archivo seleccionado"))
+        self.boton_deshacer_lote.setText(_translate("MainWindow", "Deshacer último lote"))
+
+
+# CRC-32 de Main_Window.ui al generar este módulo
+UI_CRC32 = 0x2c722a7c
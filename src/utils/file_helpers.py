@@ -2,7 +2,7 @@
 Funciones auxiliares para manejo de archivos en la UI.
 """
 import os
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from PyQt5.QtWidgets import QFileDialog, QWidget
 from PyQt5.QtCore import QDir
 
@@ -23,6 +23,21 @@ def get_image_files_dialog(parent: QWidget) -> List[str]:
     )
     return files
 
+def get_image_folder_dialog(parent: QWidget) -> Optional[str]:
+    """
+    Muestra un diálogo para seleccionar una carpeta de imágenes.
+    
+    Args:
+        parent: Widget padre para el diálogo
+        
+    Returns:
+        Ruta de la carpeta seleccionada o None si se canceló
+    """
+    folder = QFileDialog.getExistingDirectory(
+        parent, "Abrir carpeta de guías escaneadas", QDir.homePath()
+    )
+    return folder or None
+
 def is_valid_filename(filename: str) -> Tuple[bool, str]:
     """
     Valida si un nombre de archivo es válido.
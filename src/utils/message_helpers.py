@@ -1,6 +1,7 @@
 """
 Funciones auxiliares para mostrar mensajes y diálogos.
 """
+import os
 from typing import List, Optional
 from PyQt5.QtWidgets import QMessageBox, QTextEdit, QWidget
 
@@ -104,6 +105,13 @@ def create_processing_summary(parent: QWidget, results: dict, total_selected: in
     mensaje += f"  - Fallo al renombrar (Error OS): {results['fallo_renombrado']}\n"
     mensaje += f"  - Omitidos (Destino ya existe): {results['ya_existe']}\n"
     mensaje += f"  - Omitidos (Archivo no encontrado): {results['archivo_no_encontrado']}\n"
+    if results.get("registro"):
+        mensaje += f"\nRegistro detallado: {results['registro']}\n"
+    if results.get("diario") and os.path.exists(results["diario"]):
+        # El diario solo existe si hubo renombrados
+        from src.core.rename_journal import DIAS_CONSERVACION
+        mensaje += ("Para devolver los archivos a su nombre original, usa \"Deshacer último lote\" "
+                    f"(el lote puede deshacerse durante {DIAS_CONSERVACION} días).\n")
     
     failures = (total_selected - results['exito'])
     
@@ -117,4 +125,25 @@ def create_processing_summary(parent: QWidget, results: dict, total_selected: in
     if results["errores_detalle"]:
         add_details_to_message_box(msg_box, results["errores_detalle"])
         
-    msg_box.exec_()
\ No newline at end of file
+    msg_box.exec_()
+
+def create_undo_summary(parent: QWidget, result: dict) -> None:
+    """
+    Muestra el resultado de deshacer un lote.
+    
+    Args:
+        parent: Widget padre
+        result: Diccionario de processing_handler.undo_batch
+    """
+    omitidos = result["skipped"]
+    mensaje = f"Archivos devueltos a su nombre original: {len(result['restored'])}\n"
+    mensaje += f"Omitidos: {len(omitidos)}\n"
+    
+    msg_box = QMessageBox(parent)
+    msg_box.setWindowTitle("Lote Deshecho")
+    msg_box.setText(mensaje)
+    msg_box.setIcon(QMessageBox.Warning if omitidos else QMessageBox.Information)
+    if omitidos:
+        add_details_to_message_box(
+            msg_box, [f"{os.path.basename(o['new'])}: {o['message']}" for o in omitidos])
+    msg_box.exec_()
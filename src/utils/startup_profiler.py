@@ -0,0 +1,222 @@
+"""
+Perfilado opcional del arranque de la aplicación.
+
+Se activa con la variable de entorno LECTORCODE_STARTUP_PROFILE:
+- "1" (o "true"): al terminar el arranque se escribe un resumen en stderr.
+- Una ruta de archivo: se escribe allí el informe completo en JSON (útil en
+  el ejecutable sin consola y para benchmarks/startup_benchmark.py).
+
+El informe contiene la marca de tiempo de cada fase (main.main() y
+MainWindow.__init__ llaman a mark()) y el tiempo de importación de cada
+módulo cargado mientras el perfilador estuvo activo, propio y acumulado,
+como `python -X importtime`. Sin la variable, mark() y finish() no hacen
+nada y no se instala ningún hook de importación.
+
+Este módulo debe importarse antes que el resto (PyQt5, src.ui) para que
+el desglose de importaciones los incluya.
+"""
+import atexit
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+VARIABLE_ENTORNO = "LECTORCODE_STARTUP_PROFILE"
+# Módulos que se muestran en el resumen de texto
+MAX_MODULOS_RESUMEN = 15
+
+_inicio = time.perf_counter()
+_fases: List[Dict] = []
+_importaciones: List[Dict] = []
+_lock = threading.Lock()
+_destino: Optional[str] = None
+_cronometro = None
+_terminado = False
+
+
+class _TimedLoader:
+    """
+    Envoltorio del loader de un módulo que mide create_module + exec_module.
+
+    En las extensiones en C (PyQt5, numpy) casi todo el trabajo ocurre en
+    create_module. Antes de ejecutar el módulo se restaura el loader
+    original en el spec y en __loader__, de modo que el módulo importado
+    queda igual que sin perfilador.
+    """
+
+    def __init__(self, loader, spec, cronometro: "_ImportTimer"):
+        self._loader = loader
+        self._spec = spec
+        self._cronometro = cronometro
+        self._inicio = None
+
+    def __getattr__(self, nombre):
+        return getattr(self._loader, nombre)
+
+    def _start(self) -> None:
+        if self._inicio is None:
+            self._cronometro.enter()
+            self._inicio = time.perf_counter()
+
+    def create_module(self, spec):
+        crear = getattr(self._loader, "create_module", None)
+        if crear is None:
+            return None
+        self._start()
+        try:
+            return crear(spec)
+        except BaseException:
+            self._cronometro.exit(None, 0.0)
+            raise
+
+    def exec_module(self, module):
+        self._spec.loader = self._loader
+        try:
+            module.__loader__ = self._loader
+        except AttributeError:
+            pass
+        self._start()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._cronometro.exit(self._spec.name, time.perf_counter() - self._inicio)
+
+
+class _ImportTimer:
+    """Finder de sys.meta_path que delega en los demás y cronometra la carga."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            buscar = getattr(finder, "find_spec", None)
+            if buscar is None:
+                continue
+            spec = buscar(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, spec, self)
+        return spec
+
+    def enter(self) -> None:
+        # Pila por hilo del tiempo de los submódulos importados por cada módulo
+        pila = getattr(self._local, "pila", None)
+        if pila is None:
+            pila = self._local.pila = []
+        pila.append(0.0)
+
+    def exit(self, nombre: Optional[str], acumulado: float) -> None:
+        pila = self._local.pila
+        hijos = pila.pop()
+        if pila:
+            pila[-1] += acumulado
+        if nombre is None:  # La carga falló antes de ejecutar el módulo
+            return
+        with _lock:
+            _importaciones.append({
+                "module": nombre,
+                "self_s": round(acumulado - hijos, 6),
+                "cumulative_s": round(acumulado, 6),
+                "phase": _fases[-1]["name"] if _fases else None,
+                "thread": threading.current_thread().name,
+            })
+
+
+def is_enabled() -> bool:
+    """True si el perfilado de arranque está activo."""
+    return _destino is not None and not _terminado
+
+
+def mark(phase: str) -> None:
+    """Registra el final de una fase del arranque (sin efecto si está desactivado)."""
+    if not is_enabled():
+        return
+    ahora = time.perf_counter() - _inicio
+    with _lock:
+        anterior = _fases[-1]["t_s"] if _fases else 0.0
+        _fases.append({
+            "name": phase,
+            "t_s": round(ahora, 6),
+            "delta_s": round(ahora - anterior, 6),
+            "thread": threading.current_thread().name,
+        })
+
+
+def report() -> Dict:
+    """Informe del arranque: entorno, fases e importaciones."""
+    with _lock:
+        fases = list(_fases)
+        importaciones = list(_importaciones)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "frozen": bool(getattr(sys, "frozen", False)),
+        "executable": sys.executable,
+        "total_s": fases[-1]["t_s"] if fases else 0.0,
+        "phases": fases,
+        "imports": importaciones,
+    }
+
+
+def _summary(informe: Dict) -> str:
+    lineas = [f"Arranque de LectorCode: {informe['total_s'] * 1000:.1f} ms"]
+    for fase in informe["phases"]:
+        lineas.append(f"  {fase['t_s'] * 1000:9.1f} ms  (+{fase['delta_s'] * 1000:7.1f})  "
+                      f"{fase['name']}")
+    mas_lentos = sorted(informe["imports"], key=lambda m: m["self_s"], reverse=True)
+    lineas.append(f"Importaciones más lentas (de {len(informe['imports'])}; propio / acumulado):")
+    for modulo in mas_lentos[:MAX_MODULOS_RESUMEN]:
+        lineas.append(f"  {modulo['self_s'] * 1000:8.1f} / {modulo['cumulative_s'] * 1000:8.1f} ms  "
+                      f"{modulo['module']}")
+    return "\n".join(lineas)
+
+
+def finish() -> None:
+    """
+    Cierra el perfilado: retira el hook de importación y escribe el informe.
+
+    Solo actúa la primera vez; se llama también al salir del proceso si el
+    arranque no llegó a completarse.
+    """
+    global _terminado
+    with _lock:
+        if _destino is None or _terminado:
+            return
+        _terminado = True
+    if _cronometro in sys.meta_path:
+        sys.meta_path.remove(_cronometro)
+    informe = report()
+    try:
+        if _destino == "-":
+            if sys.stderr is not None:
+                print(_summary(informe), file=sys.stderr)
+        else:
+            with open(_destino, "w", encoding="utf-8") as f:
+                json.dump(informe, f, indent=2)
+    except OSError as e:
+        logging.getLogger(__name__).warning("No se pudo escribir el perfil de arranque en '%s': %s",
+                                            _destino, e)
+
+
+def _activar() -> None:
+    global _destino, _cronometro
+    valor = os.environ.get(VARIABLE_ENTORNO, "").strip()
+    if not valor or valor.lower() in ("0", "false", "no", "off"):
+        return
+    _destino = "-" if valor.lower() in ("1", "true", "yes", "on") else valor
+    _cronometro = _ImportTimer()
+    sys.meta_path.insert(0, _cronometro)
+    atexit.register(finish)
+
+
+_activar()